@@ -0,0 +1,42 @@
+import os
+import pickle
+import tempfile
+from typing import Any
+
+
+def cache_dir() -> str:
+    """Uygulamanın önbellek dosyalarını tuttuğu klasörü döndürür (yoksa oluşturur)"""
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    path = os.path.join(base, 'DosyaAramaUygulamasi')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(name: str) -> str:
+    """Önbellek klasöründeki bir dosyanın tam yolunu döndürür"""
+    return os.path.join(cache_dir(), name)
+
+
+def load_pickle(path: str, default: Any = None) -> Any:
+    """Pickle dosyasını okur; dosya yoksa veya bozuksa varsayılanı döndürür"""
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return default
+
+
+def save_pickle(path: str, data: Any) -> None:
+    """Veriyi önce geçici dosyaya yazıp ardından atomik olarak yerine taşır"""
+    folder = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,102 @@
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+PARTIAL_BLOCK = 64 * 1024
+READ_BLOCK = 1024 * 1024
+
+
+def partial_hash(file_path: str, size: int) -> Optional[str]:
+    """
+    Dosyanın ilk ve son bloğundan ucuz bir parmak izi üretir.
+
+    Dosya iki bloktan küçükse tüm içerik okunduğu için sonuç tam özetle
+    aynı güvenilirliktedir.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(str(size).encode())
+    try:
+        with open(file_path, 'rb') as f:
+            h.update(f.read(PARTIAL_BLOCK))
+            if size > 2 * PARTIAL_BLOCK:
+                f.seek(-PARTIAL_BLOCK, 2)
+                h.update(f.read(PARTIAL_BLOCK))
+            elif size > PARTIAL_BLOCK:
+                h.update(f.read())
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def full_hash(file_path: str) -> Optional[str]:
+    """Dosyanın tüm içeriğinin özetini hesaplar"""
+    h = hashlib.blake2b(digest_size=16)
+    try:
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(READ_BLOCK), b''):
+                h.update(block)
+    except OSError:
+        return None
+    return h.hexdigest()
+
+
+def group_duplicates(entries: Iterable, max_workers: int = 4,
+                     should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, List[str]]:
+    """
+    Aynı içeriğe sahip dosyaları gruplar.
+
+    Önce boyuta göre ayrılır; aynı boyuttaki dosyalar için kısmi özet,
+    kısmi özeti çakışanlar için tam özet hesaplanır. Böylece benzersiz
+    boyuttaki dosyalar hiç okunmaz.
+
+    Args:
+        entries: FileEntry nesneleri (path ve size alanları kullanılır)
+        max_workers: Özet hesaplayan iş parçacığı sayısı
+        should_stop: True döndürdüğünde gruplamayı kesen fonksiyon
+
+    Returns:
+        Temsilci dosya yolu -> aynı içerikli diğer yollar sözlüğü.
+        Kopyası olmayan dosyalar da boş listeyle yer alır.
+    """
+    should_stop = should_stop or (lambda: False)
+    by_size = defaultdict(list)
+    for entry in entries:
+        by_size[entry.size].append(entry.path)
+
+    groups = {}
+    candidates = []
+    for size, paths in by_size.items():
+        if len(paths) == 1 or size == 0:
+            # Boş dosyalar çıkarılacak metin içermez; ayrıca gruplamaya gerek yok
+            for path in paths:
+                groups[path] = []
+        else:
+            candidates.append((size, paths))
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        for size, paths in candidates:
+            if should_stop():
+                break
+            partials = defaultdict(list)
+            for path, digest in zip(paths, executor.map(lambda p: partial_hash(p, size), paths)):
+                partials[digest].append(path)
+            for digest, same_partial in partials.items():
+                if digest is None or len(same_partial) == 1:
+                    for path in same_partial:
+                        groups[path] = []
+                    continue
+                if size <= 2 * PARTIAL_BLOCK:
+                    # Kısmi özet zaten tüm içeriği kapsıyor
+                    groups[same_partial[0]] = same_partial[1:]
+                    continue
+                fulls = defaultdict(list)
+                for path, full in zip(same_partial, executor.map(full_hash, same_partial)):
+                    fulls[full].append(path)
+                for full, same_full in fulls.items():
+                    if full is None:
+                        for path in same_full:
+                            groups[path] = []
+                    else:
+                        groups[same_full[0]] = same_full[1:]
+    return groups
@@ -0,0 +1,127 @@
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from app_cache import cache_path, load_pickle, save_pickle
+
+# 2: dosyaların stat bilgileri saklanmaz
+# 3: dosyaya giden sembolik bağlantılar da listelenir
+SNAPSHOT_VERSION = 3
+
+# (ad, klasör mü, st_dev, st_ino); st_dev/st_ino yalnızca klasörler için doludur
+SnapshotEntry = Tuple[str, bool, int, int]
+
+# Arayüzde klasör önbelleğinin varsayılan durumu: Windows'ta DirEntry stat
+# bilgisini listelemeyle birlikte verdiğinden görüntü kazanç sağlamaz
+SNAPSHOT_DEFAULT = os.name != 'nt'
+
+
+class DirectorySnapshot:
+    """
+    Klasör listelerinin diske kaydedilen anlık görüntüsü.
+
+    Her klasör için mtime ve alt girdilerin adları saklanır. Bir sonraki
+    taramada mtime değişmemişse klasör yeniden listelenmez, girdiler
+    görüntüden okunur.
+
+    Klasör mtime'ı yalnızca girdi eklenip silindiğinde değişir; yerinde
+    düzenlenen dosyalar fark edilmez. Bu yüzden görüntü yalnızca adları
+    verir, dosyaların boyut/mtime bilgisi tarayıcıda yeniden stat edilir.
+    Görüntü böylece yalnızca klasör listeleme maliyetini kaldırır: stat
+    bilgisinin ayrı bir çağrı olduğu sistemlerde (Linux/macOS, SMB/NFS
+    bağlamaları) kazançlıdır; Windows'ta ise scandir stat bilgisini
+    listelemeyle birlikte bedava verdiğinden görüntü isabeti listelemeden
+    yavaştır (SNAPSHOT_DEFAULT).
+    """
+
+    def __init__(self, path: Optional[str] = None, follow_symlinks: bool = False):
+        self.path = path
+        self.follow_symlinks = follow_symlinks
+        self._dirs: Dict[str, Tuple[int, List[SnapshotEntry]]] = {}
+        self._seen = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def load(cls, path: Optional[str] = None, follow_symlinks: bool = False) -> 'DirectorySnapshot':
+        """
+        Görüntüyü diskten yükler.
+
+        Args:
+            path: Görüntü dosyası (None ise uygulama önbellek klasörü kullanılır)
+            follow_symlinks: Taramanın sembolik bağlantıları izleyip izlemediği
+
+        Returns:
+            DirectorySnapshot nesnesi (dosya yoksa boş)
+        """
+        path = path or cache_path('dizin_goruntusu.pkl')
+        snapshot = cls(path, follow_symlinks)
+        data = load_pickle(path, {})
+        if data.get('version') == SNAPSHOT_VERSION and data.get('follow_symlinks') == follow_symlinks:
+            snapshot._dirs = data.get('dirs', {})
+        return snapshot
+
+    def save(self) -> None:
+        """Görüntüyü diske yazar"""
+        if not self.path:
+            return
+        with self._lock:
+            data = {
+                'version': SNAPSHOT_VERSION,
+                'follow_symlinks': self.follow_symlinks,
+                'dirs': dict(self._dirs),
+            }
+        try:
+            save_pickle(self.path, data)
+        except Exception as e:
+            print(f"Dizin görüntüsü kaydedilemedi {self.path}: {str(e)}")
+
+    def list_directory(self, path: str) -> List[SnapshotEntry]:
+        """
+        Klasörün girdilerini döndürür; mtime değişmemişse görüntüden okur.
+
+        Args:
+            path: Listelenecek klasör
+
+        Returns:
+            SnapshotEntry listesi
+        """
+        mtime_ns = os.stat(path).st_mtime_ns
+        with self._lock:
+            self._seen.add(path)
+            cached = self._dirs.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                self.hits += 1
+                return cached[1]
+        entries = self._scan(path)
+        with self._lock:
+            self._dirs[path] = (mtime_ns, entries)
+            self.misses += 1
+        return entries
+
+    def _scan(self, path: str) -> List[SnapshotEntry]:
+        """Klasörü diskten okur; klasörlerin st_dev/st_ino bilgilerini toplar"""
+        entries = []
+        follow = self.follow_symlinks
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=follow)
+                    if is_dir:
+                        # Windows'ta DirEntry.stat() st_dev/st_ino doldurmaz
+                        st = os.stat(entry.path, follow_symlinks=follow)
+                        entries.append((entry.name, True, st.st_dev, st.st_ino))
+                    elif entry.is_file(follow_symlinks=True):
+                        entries.append((entry.name, False, 0, 0))
+                except OSError:
+                    continue
+        return entries
+
+    def prune(self, root: str) -> None:
+        """Son taramada görülmeyen (silinmiş veya budanmış) klasörleri görüntüden çıkarır"""
+        prefix = os.path.join(root, '')
+        with self._lock:
+            for path in list(self._dirs):
+                if (path == root or path.startswith(prefix)) and path not in self._seen:
+                    del self._dirs[path]
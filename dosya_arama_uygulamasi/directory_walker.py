@@ -0,0 +1,327 @@
+import os
+import fnmatch
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Varsayılan olarak hiç girilmeyecek klasörler ('/' ile biten kalıplar yalnızca klasörlere uyar)
+DEFAULT_EXCLUDES = [
+    '.git/', '.svn/', '.hg/', 'node_modules/', '__pycache__/', '.venv/',
+    '$RECYCLE.BIN/', 'System Volume Information/',
+]
+# Önceki sürümlerin varsayılanı; ayarlarda değiştirilmeden kaldıysa yenisiyle değiştirilir
+LEGACY_DEFAULT_EXCLUDES = [
+    '.git', '.svn', '.hg', 'node_modules', '__pycache__', '.venv',
+    '$RECYCLE.BIN', 'System Volume Information', '*.bak', 'backup*', 'yedek*',
+]
+
+
+class FileEntry:
+    """Tarama sırasında bulunan bir dosyanın yolu ve stat bilgileri."""
+
+    __slots__ = ('path', 'size', 'mtime', 'dev', 'ino')
+
+    def __init__(self, path: str, size: int, mtime: float, dev: int = 0, ino: int = 0):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.dev = dev
+        self.ino = ino
+
+    def __repr__(self):
+        return f"FileEntry({self.path!r}, size={self.size})"
+
+
+class WalkOptions:
+    """Dizin taramasının filtre ve budama ayarları."""
+
+    def __init__(self,
+                 include_patterns: Optional[List[str]] = None,
+                 exclude_patterns: Optional[List[str]] = None,
+                 max_depth: Optional[int] = None,
+                 min_size: Optional[int] = None,
+                 max_size: Optional[int] = None,
+                 modified_after: Optional[float] = None,
+                 modified_before: Optional[float] = None,
+                 same_filesystem: bool = False,
+                 follow_symlinks: bool = False,
+                 max_workers: int = 8):
+        """
+        Args:
+            include_patterns: Dosya adının uyması gereken glob kalıpları (boşsa hepsi)
+            exclude_patterns: Dosya/klasör adı veya göreli yol için hariç tutma kalıpları;
+                '/' ile biten kalıplar yalnızca klasörlere uygulanır
+            max_depth: En fazla inilecek klasör derinliği (kök = 0)
+            min_size / max_size: Bayt cinsinden boyut sınırları
+            modified_after / modified_before: Değişiklik zamanı sınırları (epoch saniye)
+            same_filesystem: Kökün bulunduğu dosya sisteminin dışına çıkma
+            follow_symlinks: Sembolik bağlantılı klasörlere gir
+            max_workers: Aynı anda listelenecek klasör sayısı
+        """
+        self.include_patterns = [p.lower() for p in (include_patterns or [])]
+        self.exclude_patterns = [p.lower() for p in (DEFAULT_EXCLUDES if exclude_patterns is None else exclude_patterns)]
+        self.max_depth = max_depth
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = modified_after
+        self.modified_before = modified_before
+        self.same_filesystem = same_filesystem
+        self.follow_symlinks = follow_symlinks
+        self.max_workers = max(1, max_workers)
+
+    def is_excluded(self, name: str, rel_path: str, is_dir: bool = False) -> bool:
+        """Ad veya göreli yol hariç tutma kalıplarından birine uyuyor mu"""
+        name = name.lower()
+        rel_path = rel_path.replace(os.sep, '/').lower()
+        for pattern in self.exclude_patterns:
+            if pattern.endswith('/'):
+                if not is_dir:
+                    continue
+                pattern = pattern[:-1]
+            if fnmatch.fnmatchcase(name, pattern) or fnmatch.fnmatchcase(rel_path, pattern):
+                return True
+        return False
+
+    def is_included(self, name: str) -> bool:
+        """Dosya adı dahil etme kalıplarına uyuyor mu"""
+        if not self.include_patterns:
+            return True
+        name = name.lower()
+        return any(fnmatch.fnmatchcase(name, p) for p in self.include_patterns)
+
+    def accepts_stat(self, size: int, mtime: float) -> bool:
+        """Boyut ve tarih filtrelerini uygular"""
+        if self.min_size is not None and size < self.min_size:
+            return False
+        if self.max_size is not None and size > self.max_size:
+            return False
+        if self.modified_after is not None and mtime < self.modified_after:
+            return False
+        if self.modified_before is not None and mtime > self.modified_before:
+            return False
+        return True
+
+
+class DirectoryWalker:
+    """
+    Klasörleri birden fazla iş parçacığıyla paralel listeleyen tarayıcı.
+
+    Ağ sürücülerinde tarama gecikmeye bağlı olduğundan her klasör ayrı bir
+    iş parçacığında listelenir. Hariç tutulan klasörler hiç listelenmeden
+    budanır.
+    """
+
+    def __init__(self, options: Optional[WalkOptions] = None,
+                 should_stop: Optional[Callable[[], bool]] = None,
+                 snapshot=None):
+        """
+        Args:
+            options: Filtre ve budama ayarları
+            should_stop: True döndürdüğünde taramayı kesen fonksiyon
+            snapshot: Değişmemiş klasörleri yeniden listelememek için DirectorySnapshot
+        """
+        self.options = options or WalkOptions()
+        self.should_stop = should_stop or (lambda: False)
+        self.snapshot = snapshot
+        # Listelenmek üzere sıraya alınmış veya dosyaları henüz tamamen üretilmemiş
+        # klasörler: yol -> (derinlik, st_dev, st_ino). Kontrol noktası için kullanılır.
+        self.frontier: Dict[str, Tuple[int, int, int]] = {}
+        # Dosyanın ilk bulunan yolu -> aynı dosyaya giden diğer yollar
+        self.aliases: Dict[str, List[str]] = {}
+
+    def walk(self, root: Union[str, List[str]], resume: Optional[List[Tuple[str, int, int, int]]] = None,
+             known: Optional[Iterable[FileEntry]] = None) -> Iterator[FileEntry]:
+        """
+        Kök dizin(ler) altındaki uygun dosyaları üretir.
+
+        Birden fazla kök aynı iş parçacığı havuzunda birlikte taranır. İç içe
+        kökler, bind mount ile iki yerde görünen ve sembolik bağlantıyla
+        girilen klasörler (st_dev, st_ino) ile bir kez listelenir. Aynı
+        dosyaya giden diğer yollar (sabit bağlantılar, örtüşen bağlamalar)
+        üretilmez, `aliases` sözlüğüne ilk bulunan yolun karşılığı olarak
+        eklenir. Windows'ta DirEntry dosyalar için st_ino vermediğinden orada
+        dosya düzeyinde ayıklama yapılmaz, klasörler yine ayıklanır.
+
+        Args:
+            root: Taranacak kök dizin veya kök dizin listesi
+            resume: Yarıda kalmış bir taramanın `frontier` kaydı
+                    ((yol, derinlik, st_dev, st_ino) listesi); verilirse tarama
+                    kökten değil bu klasörlerden devam eder
+            known: Devam eden taramada daha önce bulunmuş dosyalar (diğer
+                   yolları yeniden üretilmesin diye)
+
+        Returns:
+            FileEntry nesneleri üreten iterator (sıra garanti edilmez)
+        """
+        options = self.options
+        root_stats = {}
+        for path in ([root] if isinstance(root, str) else root):
+            path = os.path.abspath(path)
+            if path in root_stats or not os.path.isdir(path):
+                continue
+            try:
+                root_stats[path] = os.stat(path)
+            except OSError:
+                continue
+        self.frontier = {}
+        self.aliases = {}
+        if not root_stats:
+            return
+        visited = set()
+        roots = []
+        for path, st in root_stats.items():
+            # Aynı klasörü gösteren ikinci kök (bind mount, sembolik bağlantı) atlanır
+            if (st.st_dev, st.st_ino) in visited:
+                continue
+            visited.add((st.st_dev, st.st_ino))
+            roots.append(path)
+        # Birden fazla kökte örtüşen alt ağaçlar için klasör kimlikleri her zaman izlenir
+        track_dirs = options.follow_symlinks or options.same_filesystem or len(roots) > 1
+        # (st_dev, st_ino) -> dosyanın ilk bulunan yolu
+        seen_files: Dict[Tuple[int, int], str] = {}
+        for entry in known or ():
+            if entry.ino:
+                seen_files.setdefault((entry.dev, entry.ino), entry.path)
+
+        results = queue.Queue()
+        cancelled = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=options.max_workers)
+
+        def submit(path, depth, base, dev=0, ino=0):
+            self.frontier[path] = (depth, dev, ino)
+            future = executor.submit(self._list_directory, base, path, depth, track_dirs, cancelled)
+            future.add_done_callback(lambda f: results.put((base, f)))
+
+        try:
+            if resume:
+                for path, depth, dev, ino in resume:
+                    if dev or ino:
+                        visited.add((dev, ino))
+                    submit(path, depth, root_of(path, roots), dev, ino)
+            else:
+                for path in roots:
+                    submit(path, 0, path)
+            pending = len(self.frontier)
+            while pending:
+                base, future = results.get()
+                pending -= 1
+                if self.should_stop():
+                    return
+                try:
+                    files, subdirs, depth, listed = future.result()
+                except Exception:
+                    continue
+                for entry in files:
+                    if entry.ino:
+                        first = seen_files.setdefault((entry.dev, entry.ino), entry.path)
+                        if first != entry.path:
+                            self.aliases.setdefault(first, []).append(entry.path)
+                            continue
+                    yield entry
+                if options.max_depth is None or depth + 1 <= options.max_depth:
+                    for path, dev, ino in subdirs:
+                        if track_dirs:
+                            if options.same_filesystem and dev != root_stats[base].st_dev:
+                                continue
+                            # Sembolik bağlantı döngülerini ve örtüşen kökleri engelle
+                            if (dev, ino) in visited:
+                                continue
+                            visited.add((dev, ino))
+                        submit(path, depth + 1, base, dev, ino)
+                        pending += 1
+                # Dosyaları üretilip alt klasörleri sıraya alınan klasör sınırdan çıkar
+                self.frontier.pop(listed, None)
+            # Devam eden taramada görülmeyen klasörler silinmiş sayılmamalı
+            if self.snapshot is not None and not resume:
+                for path in roots:
+                    self.snapshot.prune(path)
+        finally:
+            # Erken çıkışta kuyruktaki listelemeler boşa çalışmasın
+            cancelled.set()
+            executor.shutdown(wait=False)
+
+    def _list_directory(self, root: str, path: str, depth: int, track_dirs: bool,
+                        cancelled: threading.Event) -> Tuple[List[FileEntry], List[Tuple[str, int, int]], int, str]:
+        """Tek bir klasörü listeler; iş parçacığı havuzunda çalışır."""
+        options = self.options
+        files, subdirs = [], []
+        if cancelled.is_set():
+            return files, subdirs, depth, path
+        if self.snapshot is not None:
+            try:
+                listing = self.snapshot.list_directory(path)
+            except OSError:
+                return files, subdirs, depth, path
+            for name, is_dir, dev, ino in listing:
+                entry_path = os.path.join(path, name)
+                if options.is_excluded(name, os.path.relpath(entry_path, root), is_dir):
+                    continue
+                if is_dir:
+                    subdirs.append((entry_path, dev, ino))
+                elif options.is_included(name):
+                    # Görüntü yalnızca adları verir; yerinde düzenlenen dosyalar için stat yeniden alınır.
+                    # Dosyaya giden sembolik bağlantılar her zaman izlenir (döngü yalnızca klasörlerde olur)
+                    try:
+                        st = os.stat(entry_path)
+                    except OSError:
+                        continue
+                    if options.accepts_stat(st.st_size, st.st_mtime):
+                        files.append(FileEntry(entry_path, st.st_size, st.st_mtime, st.st_dev, st.st_ino))
+            return files, subdirs, depth, path
+        try:
+            it = os.scandir(path)
+        except OSError:
+            # Erişilemeyen klasör atlanır (sınırdan da çıkarılır)
+            return files, subdirs, depth, path
+        with it:
+            for entry in it:
+                rel_path = os.path.relpath(entry.path, root)
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=options.follow_symlinks)
+                    if options.is_excluded(entry.name, rel_path, is_dir):
+                        continue
+                    if is_dir:
+                        if track_dirs:
+                            # Windows'ta DirEntry.stat() st_dev/st_ino doldurmaz
+                            st = os.stat(entry.path, follow_symlinks=options.follow_symlinks)
+                            subdirs.append((entry.path, st.st_dev, st.st_ino))
+                        else:
+                            subdirs.append((entry.path, 0, 0))
+                    elif entry.is_file(follow_symlinks=True):
+                        # Dosyaya giden sembolik bağlantılar her zaman aranır; hedefin st_dev/st_ino
+                        # bilgisi alındığından hedef de taranıyorsa bağlantı onun diğer yolu sayılır
+                        if not options.is_included(entry.name):
+                            continue
+                        st = entry.stat(follow_symlinks=True)
+                        if not options.accepts_stat(st.st_size, st.st_mtime):
+                            continue
+                        files.append(FileEntry(entry.path, st.st_size, st.st_mtime, st.st_dev, st.st_ino))
+                except OSError:
+                    continue
+        return files, subdirs, depth, path
+
+
+def root_of(path: str, roots: List[str]) -> str:
+    """Yolun bulunduğu kök (iç içe köklerde en derindeki)"""
+    best = None
+    for root in roots:
+        if path == root or path.startswith(os.path.join(root, '')):
+            if best is None or len(root) > len(best):
+                best = root
+    return best or roots[0]
+
+
+def parse_roots(text: str) -> List[str]:
+    """Noktalı virgülle ayrılmış kök dizin metnini listeye çevirir (tekrarlar atılır)"""
+    roots = []
+    for part in text.split(';'):
+        part = part.strip()
+        if part and part not in roots:
+            roots.append(part)
+    return roots
+
+
+def parse_patterns(text: str) -> List[str]:
+    """Virgülle ayrılmış kalıp metnini listeye çevirir"""
+    return [p.strip() for p in text.split(',') if p.strip()]
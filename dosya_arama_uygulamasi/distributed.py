@@ -0,0 +1,359 @@
+import argparse
+import json
+import multiprocessing
+import os
+import queue
+import re
+import socket
+import sys
+import threading
+from http.client import HTTPConnection, HTTPException
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from directory_walker import WalkOptions
+from extractors import ARCHIVE_SEPARATOR
+from query import CompiledQuery, parse_keywords
+from resource_governor import ResourceLimits, IO_PRIORITY_IDLE, IO_PRIORITY_LOW
+from search_pipeline import search_tree
+
+DEFAULT_PORT = 8765
+# İstemcinin sunucuya kendini tanıttığı paylaşılan anahtar başlığı
+TOKEN_HEADER = 'X-Arama-Anahtari'
+MAX_REQUEST_BYTES = 64 * 1024
+
+
+class SearchServer(ThreadingHTTPServer):
+    """
+    Verinin bulunduğu makinede çalışan arama sunucusu.
+
+    Yalnızca başlatılırken verilen kök klasörde arama yapar; istemci en
+    fazla bu kökün altındaki bir klasörü seçebilir. Sonuçlar bulundukça
+    satır satır JSON (NDJSON) olarak akıtılır.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, root: str, host: str = '127.0.0.1', port: int = DEFAULT_PORT,
+                 token: Optional[str] = None, processes: Optional[int] = None,
+                 limits: Optional[ResourceLimits] = None, sequential_io: bool = False):
+        """
+        Args:
+            root: Aranabilecek kök klasör
+            host: Dinlenecek adres (varsayılan yalnızca yerel bağlantılar)
+            port: Dinlenecek port
+            token: Verilirse istemciler bu anahtarı göndermek zorundadır
+            processes: Arama başına işçi süreç sayısı
+            limits: Paylaşılan makinede aramanın kaynak sınırları
+            sequential_io: Dosyaları disk sırasıyla oku (döner disk / NAS)
+        """
+        super().__init__((host, port), SearchRequestHandler)
+        self.root = os.path.abspath(root)
+        self.token = token
+        self.processes = processes
+        self.limits = limits
+        self.sequential_io = sequential_io
+
+    def prepare(self, params: dict) -> Tuple[CompiledQuery, List[str], str, WalkOptions]:
+        """
+        İstek parametrelerinden sorguyu ve arama klasörünü hazırlar.
+
+        Raises:
+            ValueError: Parametreler geçersizse veya klasör kökün dışındaysa
+            re.error: Düzenli ifade geçersizse
+        """
+        use_regex = bool(params.get('use_regex', False))
+        keywords = parse_keywords(str(params.get('keywords', '')), use_regex)
+        if not keywords:
+            raise ValueError("Aranacak kelime yok")
+        extensions = [str(ext).lower() for ext in params.get('extensions', [])]
+        if not extensions or not all(ext.startswith('.') for ext in extensions):
+            raise ValueError("Geçersiz dosya türleri")
+        query = CompiledQuery(keywords, int(params.get('match_type', 0)), bool(params.get('case_sensitive', False)),
+                              use_regex, int(params.get('max_errors', 1)), bool(params.get('ignore_diacritics', False)))
+        root = os.path.abspath(os.path.join(self.root, str(params.get('path', ''))))
+        if os.path.commonpath([root, self.root]) != self.root:
+            raise ValueError("Klasör sunucunun kök klasörünün dışında")
+        exclude_patterns = params.get('exclude_patterns')
+        walk_options = WalkOptions(exclude_patterns=[str(p) for p in exclude_patterns] if exclude_patterns is not None else None,
+                                   same_filesystem=bool(params.get('same_filesystem', False)))
+        return query, extensions, root, walk_options
+
+
+class SearchRequestHandler(BaseHTTPRequestHandler):
+    """GET /health ve POST /search isteklerini karşılar"""
+
+    server_version = 'DosyaAramaSunucusu/1.0'
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'type': 'error', 'message': "Bulunamadı"})
+            return
+        if self._authorized():
+            self._send_json(200, {'status': 'ok', 'root': self.server.root})
+
+    def do_POST(self):
+        if self.path != '/search':
+            self._send_json(404, {'type': 'error', 'message': "Bulunamadı"})
+            return
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > MAX_REQUEST_BYTES:
+                raise ValueError("İstek çok büyük")
+            params = json.loads(self.rfile.read(length).decode('utf-8'))
+            query, extensions, root, walk_options = self.server.prepare(params)
+        except (ValueError, TypeError, re.error) as e:
+            self._send_json(400, {'type': 'error', 'message': str(e)})
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.end_headers()
+        events = search_tree(root, query, extensions, walk_options, processes=self.server.processes,
+                             limits=self.server.limits, sequential_io=self.server.sequential_io)
+        try:
+            # Yerel kök eşlemesi için sunucunun kök klasörü bildirilir
+            self._write_event({'type': 'start', 'root': self.server.root})
+            for kind, value in events:
+                if kind == 'hit':
+                    self._write_event({'type': 'hit', 'hit': value})
+                elif kind == 'total':
+                    self._write_event({'type': 'total', 'files': value})
+                else:
+                    self._write_event({'type': 'progress', 'searched': value})
+            self._write_event({'type': 'done'})
+        except (BrokenPipeError, ConnectionResetError):
+            # Koordinatör aramayı durdurup bağlantıyı kapattı
+            pass
+        except Exception as e:
+            # Arama hatası akış kesilmeden önce koordinatöre bildirilir
+            try:
+                self._write_event({'type': 'error', 'message': f"Sunucuda arama hatası: {e}"})
+            except OSError:
+                pass
+        finally:
+            # Üreteç kapatılınca işçi havuzu da sonlandırılır
+            events.close()
+
+    def _authorized(self) -> bool:
+        if self.server.token and self.headers.get(TOKEN_HEADER) != self.server.token:
+            self._send_json(403, {'type': 'error', 'message': "Geçersiz anahtar"})
+            return False
+        return True
+
+    def _send_json(self, status: int, data: dict) -> None:
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _write_event(self, event: dict) -> None:
+        self.wfile.write(json.dumps(event, ensure_ascii=False).encode('utf-8') + b'\n')
+        self.wfile.flush()
+
+    def log_message(self, format, *args):
+        # Her istek için satır basılmaz; hatalar log_error ile yazılır
+        pass
+
+
+class WorkerSpec:
+    """
+    Uzak arama sunucusunun adresi.
+
+    Biçim: [http://][anahtar@]sunucu[:port][=yerel kök]. Yerel kök verilirse
+    sunucunun döndürdüğü yollar bu klasöre (ör. SMB paylaşımı) çevrilir;
+    böylece sonuçlar bu makineden açılabilir.
+    """
+
+    def __init__(self, spec: str):
+        url, _, mount = spec.strip().partition('=')
+        parts = urlsplit(url if '://' in url else 'http://' + url)
+        if not parts.hostname:
+            raise ValueError(f"Geçersiz sunucu adresi: {spec}")
+        self.host = parts.hostname
+        self.port = parts.port or DEFAULT_PORT
+        self.token = parts.username
+        self.mount = mount.strip() or None
+        self.label = f'{self.host}:{self.port}'
+        self.root: Optional[str] = None
+
+    def local_path(self, path: str) -> str:
+        """Sunucudaki yolu bu makineden erişilebilen yola çevirir"""
+        if not self.mount or not self.root or not path.startswith(self.root):
+            return path
+        outer, separator, member = path.partition(ARCHIVE_SEPARATOR)
+        relative = outer[len(self.root):].replace('\\', '/').lstrip('/')
+        local = os.path.normpath(os.path.join(self.mount, *relative.split('/')))
+        return local + separator + member
+
+
+def parse_workers(text: str) -> List[WorkerSpec]:
+    """Virgülle ayrılmış sunucu adreslerini ayrıştırır"""
+    return [WorkerSpec(part) for part in text.split(',') if part.strip()]
+
+
+class SearchCoordinator:
+    """
+    Sorguyu birden çok arama sunucusuna dağıtıp akan sonuçları birleştiren sınıf.
+
+    Her sunucu ayrı bir iş parçacığında okunur; olaylar ortak bir kuyruğa
+    yazılır ve geldikleri sırayla üretilir. Bir sunucunun hatası diğerlerini
+    durdurmaz, ('error') olayı olarak bildirilir.
+    """
+
+    def __init__(self, workers: List[WorkerSpec], connect_timeout: float = 10.0):
+        self.workers = workers
+        self.connect_timeout = connect_timeout
+
+    def search(self, params: dict,
+               should_stop: Optional[Callable[[], bool]] = None) -> Iterator[Tuple[WorkerSpec, dict]]:
+        """
+        Sorguyu tüm sunuculara gönderir.
+
+        Args:
+            params: keywords, extensions, match_type, case_sensitive, use_regex,
+                    max_errors, ignore_diacritics, exclude_patterns, path alanları
+            should_stop: True döndürürse tüm bağlantılar kapatılır
+
+        Yields:
+            (sunucu, olay) çiftleri; olay türleri: start, total, hit, progress, done, error.
+            Sonuç yolları sunucunun yerel köküne göre çevrilmiş olarak gelir.
+        """
+        events: 'queue.Queue[Tuple[WorkerSpec, Optional[dict]]]' = queue.Queue()
+        sockets: List[socket.socket] = []
+        for worker in self.workers:
+            threading.Thread(target=self._stream, args=(worker, params, events, sockets), daemon=True).start()
+        remaining = len(self.workers)
+        try:
+            while remaining:
+                if should_stop is not None and should_stop():
+                    return
+                try:
+                    worker, event = events.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                if event is None:
+                    remaining -= 1
+                    continue
+                if event.get('type') == 'start':
+                    worker.root = event.get('root')
+                elif event.get('type') == 'hit':
+                    hit = event['hit']
+                    hit['file_path'] = worker.local_path(hit['file_path'])
+                    if hit.get('duplicates'):
+                        hit['duplicates'] = [worker.local_path(path) for path in hit['duplicates']]
+                    hit['worker'] = worker.label
+                yield worker, event
+        finally:
+            # Bloklanmış okumaları kesmek için soketler kapatılır
+            for sock in list(sockets):
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+
+    def _stream(self, worker: WorkerSpec, params: dict, events: queue.Queue,
+                sockets: List[socket.socket]) -> None:
+        connection = HTTPConnection(worker.host, worker.port, timeout=self.connect_timeout)
+        try:
+            headers = {'Content-Type': 'application/json'}
+            if worker.token:
+                headers[TOKEN_HEADER] = worker.token
+            connection.request('POST', '/search', json.dumps(params).encode('utf-8'), headers)
+            # Yanıt bağlantı kapanınca biter; http.client bu durumda connection.sock'u bırakır
+            sock = connection.sock
+            sockets.append(sock)
+            response = connection.getresponse()
+            if response.status != 200:
+                try:
+                    message = json.loads(response.read().decode('utf-8')).get('message')
+                except ValueError:
+                    message = None
+                events.put((worker, {'type': 'error', 'message': message or f"HTTP {response.status}"}))
+                return
+            # Klasör taraması uzun sürebilir; başlıklar geldikten sonra okuma süresiz beklenir
+            sock.settimeout(None)
+            # 'done' (veya sunucunun 'error' olayı) gelmeden biten akış yarıda kesilmiştir
+            finished = False
+            for line in response:
+                if line.strip():
+                    event = json.loads(line.decode('utf-8'))
+                    finished = finished or event.get('type') in ('done', 'error')
+                    events.put((worker, event))
+            if not finished:
+                events.put((worker, {'type': 'error', 'message': "bağlantı yarıda kesildi"}))
+        except (OSError, ValueError, HTTPException) as e:
+            events.put((worker, {'type': 'error', 'message': str(e)}))
+        finally:
+            connection.close()
+            events.put((worker, None))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dağıtık dosya içeriği arama")
+    commands = parser.add_subparsers(dest='command')
+    serve = commands.add_parser('serve', help="Arama sunucusunu başlat")
+    serve.add_argument('--root', required=True, help="Aranabilecek kök klasör")
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=DEFAULT_PORT)
+    serve.add_argument('--token', help="İstemcilerin göndermesi gereken anahtar")
+    serve.add_argument('--processes', type=int, help="Arama başına işçi süreç sayısı")
+    serve.add_argument('--nice', type=int, default=0, help="İşçilerin CPU önceliğini düşürme miktarı (0-19)")
+    serve.add_argument('--ionice', choices=[IO_PRIORITY_IDLE, IO_PRIORITY_LOW], help="İşçilerin disk önceliği")
+    serve.add_argument('--max-read-mbps', type=float, default=0, help="Toplam okuma hızı sınırı (MB/sn)")
+    serve.add_argument('--max-heavy', type=int, default=0, help="Aynı anda ayrıştırılacak en fazla PDF/Office/arşiv")
+    serve.add_argument('--adaptive', action='store_true', help="Sistem yükü yükseldiğinde yavaşla")
+    serve.add_argument('--sequential-io', action='store_true',
+                       help="Dosyaları diskteki yerleşim sırasıyla oku (döner disk / ağ paylaşımı)")
+    search = commands.add_parser('search', help="Sunuculara sorgu gönder")
+    search.add_argument('--worker', action='append', required=True,
+                        help="Sunucu adresi ([anahtar@]sunucu:port[=yerel kök]); birden çok verilebilir")
+    search.add_argument('--ext', action='append', default=None, help="Dosya uzantısı (varsayılan .txt)")
+    search.add_argument('--match', type=int, default=0, help="Eşleştirme türü (0-4)")
+    search.add_argument('--case', action='store_true', help="Büyük/küçük harf duyarlı")
+    search.add_argument('--regex', action='store_true', help="Düzenli ifade")
+    search.add_argument('keywords')
+    args = parser.parse_args(argv)
+    if args.command == 'serve':
+        limits = ResourceLimits(nice=args.nice, io_priority=args.ionice,
+                                max_read_bytes_per_sec=int(args.max_read_mbps * 1024 * 1024),
+                                max_heavy_parses=args.max_heavy, adaptive=args.adaptive)
+        server = SearchServer(args.root, args.host, args.port, args.token, args.processes, limits,
+                              args.sequential_io)
+        print(f"Arama sunucusu {args.host}:{args.port} adresinde, kök: {server.root}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return 0
+    if args.command == 'search':
+        coordinator = SearchCoordinator([WorkerSpec(spec) for spec in args.worker])
+        params = {
+            'keywords': args.keywords,
+            'extensions': args.ext or ['.txt'],
+            'match_type': args.match,
+            'case_sensitive': args.case,
+            'use_regex': args.regex,
+        }
+        found = 0
+        for worker, event in coordinator.search(params):
+            if event['type'] == 'hit':
+                found += 1
+                print(f"{worker.label}\t{event['hit']['file_path']}\t{', '.join(event['hit']['found_keywords'])}")
+            elif event['type'] == 'error':
+                print(f"{worker.label}: {event['message']}", file=sys.stderr)
+        print(f"{found} sonuç", file=sys.stderr)
+        return 0
+    parser.print_help()
+    return 1
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import os
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, List, Optional, Tuple, Union
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# Arşiv içindeki dosyalar "arsiv.zip!/ic/klasor/dosya.docx" biçiminde gösterilir
+ARCHIVE_EXTS = ['.zip']
+ARCHIVE_SEPARATOR = '!/'
+
+# Zip bombalarına karşı varsayılan sınırlar
+MAX_ARCHIVE_DEPTH = 2
+MAX_ARCHIVE_TOTAL_BYTES = 512 * 1024 * 1024
+MAX_MEMBER_BYTES = 100 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 200
+
+Source = Union[str, io.BytesIO]
+
+
+def read_vsdx_text(file_path):
+    metinler = []
+    try:
+        with zipfile.ZipFile(file_path, 'r') as zf:
+            for name in zf.namelist():
+                if name.startswith('visio/pages/page') and name.endswith('.xml'):
+                    try:
+                        data = zf.read(name)
+                        root = ET.parse(io.BytesIO(data)).getroot()
+                        for t in root.iter('{*}t'):
+                            if t.text:
+                                metinler.append(t.text)
+                    except Exception:
+                        continue
+    except zipfile.BadZipFile:
+        pass
+    return metinler
+
+
+def extract_text(source: Source, ext: str, preview: bool = False) -> Optional[str]:
+    """
+    Dosya türüne göre metni çıkarır.
+
+    Args:
+        source: Dosya yolu veya bellekteki içerik (BytesIO)
+        ext: Küçük harfli dosya uzantısı
+        preview: Önizleme biçimi (boş paragrafları atla, Visio metinlerini satır satır birleştir)
+
+    Returns:
+        Çıkarılan metin; gerekli kütüphane yoksa None
+    """
+    content = ""
+    if ext == '.txt':
+        if isinstance(source, str):
+            with open(source, 'r', encoding='utf-8') as f:
+                content = f.read()
+        else:
+            content = source.getvalue().decode('utf-8')
+    elif ext in ['.docx', '.docm', '.dotx', '.dotm']:
+        try:
+            from docx import Document
+        except ImportError:
+            return None
+        doc = Document(source)
+        if preview:
+            content = '\n'.join(p.text.strip() for p in doc.paragraphs if p.text.strip())
+        else:
+            content = '\n'.join([p.text for p in doc.paragraphs])
+    elif ext in ['.xlsx', '.xlsm', '.xltx', '.xltm']:
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            return None
+        wb = load_workbook(source, data_only=True)
+        texts = []
+        for sheet in wb.worksheets:
+            for row in sheet.iter_rows(values_only=True):
+                for cell in row:
+                    if cell is not None:
+                        texts.append(str(cell))
+        content = '\n'.join(texts)
+    elif ext == '.xlsb':
+        try:
+            from pyxlsb import open_workbook
+        except ImportError:
+            return None
+        texts = []
+        with open_workbook(source) as wb:
+            for sheet_name in wb.get_sheet_names():
+                with wb.get_sheet(sheet_name) as sheet:
+                    for row in sheet.rows():
+                        for cell in row:
+                            if cell.v is not None:
+                                texts.append(str(cell.v))
+        content = '\n'.join(texts)
+    elif ext in ['.pptx', '.pptm', '.ppsx', '.ppsm', '.potx', '.potm']:
+        try:
+            from pptx import Presentation
+        except ImportError:
+            return None
+        prs = Presentation(source)
+        texts = []
+        for slide in prs.slides:
+            for shape in slide.shapes:
+                if hasattr(shape, "text_frame") and shape.text_frame:
+                    for paragraph in shape.text_frame.paragraphs:
+                        if paragraph.text.strip():
+                            texts.append(paragraph.text.strip())
+        content = '\n'.join(texts)
+    elif ext == '.pdf':
+        if fitz is None:
+            return None
+        if isinstance(source, str):
+            doc = fitz.open(source)
+        else:
+            doc = fitz.open(stream=source.getvalue(), filetype='pdf')
+        with doc:
+            content = '\n'.join(page.get_text() for page in doc)
+    elif ext == '.vsdx':
+        metinler = read_vsdx_text(source)
+        content = ('\n' if preview else ' ').join(metinler)
+    # .vsd için içerik okuma yok
+    return content
+
+
+class ArchiveBudget:
+    """Bir arşiv ağacından toplam açılabilecek bayt miktarını izler."""
+
+    def __init__(self, max_total_bytes: int = MAX_ARCHIVE_TOTAL_BYTES,
+                 max_member_bytes: int = MAX_MEMBER_BYTES,
+                 max_depth: int = MAX_ARCHIVE_DEPTH):
+        self.remaining = max_total_bytes
+        self.max_member_bytes = max_member_bytes
+        self.max_depth = max_depth
+
+    def allows(self, info: zipfile.ZipInfo) -> bool:
+        """Üye boyut, sıkıştırma oranı ve kalan bütçe sınırlarına uyuyor mu"""
+        if info.file_size > self.max_member_bytes or info.file_size > self.remaining:
+            return False
+        if info.compress_size and info.file_size / info.compress_size > MAX_COMPRESSION_RATIO:
+            return False
+        return True
+
+    def read(self, zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> Optional[bytes]:
+        """Üyeyi belleğe okur; başlıktaki boyut yanlışsa sınırda keser"""
+        limit = min(self.max_member_bytes, self.remaining)
+        with zf.open(info) as member:
+            data = member.read(limit + 1)
+        if len(data) > limit:
+            return None
+        self.remaining -= len(data)
+        return data
+
+
+def iter_archive_members(source: Source, label: str, extensions: List[str],
+                         budget: Optional[ArchiveBudget] = None,
+                         depth: int = 0) -> Iterator[Tuple[str, str, io.BytesIO]]:
+    """
+    Arşivdeki desteklenen dosyaları diske açmadan bellekte üretir.
+
+    Args:
+        source: Arşiv yolu veya bellekteki arşiv içeriği
+        label: Sonuçlarda kullanılacak arşiv yolu
+        extensions: Aranacak uzantılar (iç içe arşivler için .zip de dahil olmalı)
+        budget: Toplam açılacak bayt ve derinlik sınırları
+        depth: Mevcut iç içe arşiv derinliği
+
+    Returns:
+        (sanal yol, uzantı, BytesIO) üçlüleri
+    """
+    budget = budget or ArchiveBudget()
+    try:
+        with zipfile.ZipFile(source, 'r') as zf:
+            for info in zf.infolist():
+                if info.is_dir():
+                    continue
+                ext = os.path.splitext(info.filename)[1].lower()
+                if ext not in extensions:
+                    continue
+                is_archive = ext in ARCHIVE_EXTS
+                if is_archive and depth >= budget.max_depth:
+                    continue
+                if not budget.allows(info):
+                    continue
+                data = budget.read(zf, info)
+                if data is None:
+                    continue
+                virtual_path = f"{label}{ARCHIVE_SEPARATOR}{info.filename}"
+                if is_archive:
+                    yield from iter_archive_members(io.BytesIO(data), virtual_path, extensions, budget, depth + 1)
+                else:
+                    yield virtual_path, ext, io.BytesIO(data)
+    except (zipfile.BadZipFile, OSError, RuntimeError):
+        # Bozuk veya şifreli arşivler atlanır
+        return
+
+
+def archive_outer_path(file_path: str) -> str:
+    """Sanal arşiv yolundan diskteki arşiv dosyasının yolunu döndürür"""
+    return file_path.split(ARCHIVE_SEPARATOR, 1)[0]
+
+
+def open_source(file_path: str) -> Source:
+    """
+    Sanal arşiv yolunu dahil her yolu okunabilir bir kaynağa çevirir.
+
+    Args:
+        file_path: Normal yol veya "arsiv.zip!/ic/dosya.docx" biçiminde sanal yol
+
+    Returns:
+        Normal dosyalar için yolun kendisi, arşiv üyeleri için BytesIO
+    """
+    if ARCHIVE_SEPARATOR not in file_path:
+        return file_path
+    parts = file_path.split(ARCHIVE_SEPARATOR)
+    budget = ArchiveBudget()
+    source: Source = parts[0]
+    for member_name in parts[1:]:
+        with zipfile.ZipFile(source, 'r') as zf:
+            info = zf.getinfo(member_name)
+            if not budget.allows(info):
+                raise ValueError(f"Arşiv üyesi sınırları aşıyor: {member_name}")
+            data = budget.read(zf, info)
+            if data is None:
+                raise ValueError(f"Arşiv üyesi sınırları aşıyor: {member_name}")
+        source = io.BytesIO(data)
+    return source
+
+
+def read_file_text(file_path: str, preview: bool = False) -> Optional[str]:
+    """Normal dosya veya arşiv üyesinin metnini okur"""
+    ext = os.path.splitext(file_path)[1].lower()
+    return extract_text(open_source(file_path), ext, preview)
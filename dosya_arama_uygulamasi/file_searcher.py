@@ -1,7 +1,13 @@
+import copy
 import os
 import re
+from contextlib import nullcontext
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Optional, Union
+
+from directory_walker import DirectoryWalker, WalkOptions
+from resource_governor import ResourceGovernor, ResourceLimits
+from search_trace import TraceRecorder, write_trace
 
 # Dosya okuma kütüphaneleri
 try:
@@ -26,40 +32,76 @@ class FileSearcher:
     def __init__(self):
         self.supported_extensions = ['.txt', '.docx', '.pdf', '.xlsx']
     
-    def search_in_directory(self, directory_path: str, keywords: List[str]) -> List[Dict[str, str]]:
+    def search_in_directory(self, directory_path: Union[str, List[str]], keywords: List[str],
+                            walk_options: Optional[WalkOptions] = None,
+                            trace_path: Optional[str] = None,
+                            limits: Optional[ResourceLimits] = None) -> List[Dict[str, str]]:
         """
         Belirtilen dizinde anahtar kelimeleri arar.
         
         Args:
-            directory_path: Aranacak dizin yolu
+            directory_path: Aranacak dizin yolu veya dizin yolları listesi (örtüşen
+                dizinlerde aynı dosya bir kez aranır, diğer yolları 'duplicates' alanında listelenir)
             keywords: Aranacak anahtar kelimeler listesi
+            walk_options: Hariç tutma, derinlik ve boyut filtreleri (varsayılan ayarlar için None)
+            trace_path: Verilirse arama cProfile ile profillenir; alev grafiği yığınları
+                (trace_path + '.folded'), dosya başına zaman çizelgesi ('.trace.json',
+                Chrome trace) ve profil ('.prof') yazılır
+            limits: Okuma hızı, pahalı ayrıştırma ve öncelik sınırları (sınırsız için None).
+                Arama çağıran süreçte yapıldığından CPU/disk önceliği bu süreç için
+                düşürülür ve arama bittikten sonra da düşük kalır
         
         Returns:
             Bulunan dosyaların bilgilerini içeren liste
         """
         results = []
         
-        if not os.path.exists(directory_path):
+        roots = [directory_path] if isinstance(directory_path, str) else directory_path
+        if not any(os.path.exists(root) for root in roots):
             return results
         
+        trace = TraceRecorder('FileSearcher') if trace_path else None
+        
+        governor = ResourceGovernor(limits)
+        throttle = governor.throttle
+        if throttle is not None:
+            throttle.start_worker()
+        if governor.limits.max_workers:
+            # Klasör tarama iş parçacıkları da aynı sınırla kısılır
+            walk_options = copy.copy(walk_options) if walk_options is not None else WalkOptions()
+            walk_options.max_workers = min(walk_options.max_workers, governor.limits.max_workers)
+        
         # Tüm dosyaları tarar
-        for root, dirs, files in os.walk(directory_path):
-            for file in files:
-                file_path = os.path.join(root, file)
+        walker = DirectoryWalker(walk_options)
+        with governor, trace.profiling() if trace is not None else nullcontext():
+            for entry in walker.walk(roots):
+                file_path = entry.path
+                file = os.path.basename(file_path)
                 file_extension = Path(file_path).suffix.lower()
                 
                 if file_extension in self.supported_extensions:
-                    try:
-                        content = self._read_file_content(file_path, file_extension)
-                        if content and self._search_keywords_in_content(content, keywords):
-                            results.append({
-                                'file_path': file_path,
-                                'file_name': file,
-                                'file_type': file_extension,
-                                'found_keywords': self._get_found_keywords(content, keywords)
-                            })
-                    except Exception as e:
-                        print(f"Dosya okuma hatası {file_path}: {str(e)}")
+                    with trace.file(file_path) if trace is not None else nullcontext({}) as event:
+                        try:
+                            with throttle.file(file_path) if throttle is not None else nullcontext():
+                                content = self._read_file_content(file_path, file_extension)
+                            event['found'] = bool(content) and self._search_keywords_in_content(content, keywords)
+                            if event['found']:
+                                results.append({
+                                    'file_path': file_path,
+                                    'file_name': file,
+                                    'file_type': file_extension,
+                                    'found_keywords': self._get_found_keywords(content, keywords)
+                                })
+                        except Exception as e:
+                            print(f"Dosya okuma hatası {file_path}: {str(e)}")
+        
+        if trace is not None:
+            write_trace(trace_path, [trace])
+        
+        # Aynı dosyaya giden diğer yollar tarama bitince bilinir
+        for result in results:
+            if result['file_path'] in walker.aliases:
+                result['duplicates'] = walker.aliases[result['file_path']]
         
         return results
     
@@ -0,0 +1,117 @@
+from typing import Dict, Iterator, List, Tuple
+
+
+class FuzzyPattern:
+    """
+    Belirli sayıda düzenleme hatasına izin veren yaklaşık arama kalıbı.
+
+    Myers'ın bit-paralel algoritması kullanılır: her metin karakteri için
+    tüm kalıp sütunu tek bir tamsayı üzerinde birkaç bit işlemiyle
+    güncellenir. Ayrıca güvercin yuvası ilkesiyle kalıp k+1 parçaya
+    bölünür; en fazla k hatalı bir eşleşme bu parçalardan en az birini
+    aynen içermek zorunda olduğundan parçalar str.find ile aranır ve
+    bit-paralel tarama yalnızca adayların çevresinde çalıştırılır.
+    """
+
+    def __init__(self, pattern: str, max_errors: int = 1):
+        """
+        Args:
+            pattern: Aranacak kelime (büyük/küçük harf dönüşümü çağırana aittir)
+            max_errors: İzin verilen en fazla ekleme/silme/değiştirme sayısı
+        """
+        self.pattern = pattern
+        self.m = len(pattern)
+        # Hata sayısı kalıp uzunluğuna ulaşırsa her metin eşleşir
+        self.k = max(0, min(max_errors, self.m - 1))
+        self._peq: Dict[str, int] = {}
+        for i, ch in enumerate(pattern):
+            self._peq[ch] = self._peq.get(ch, 0) | (1 << i)
+        self._mask = (1 << self.m) - 1
+        self._high = 1 << (self.m - 1) if self.m else 0
+        self._pieces = self._split_pieces()
+
+    def _split_pieces(self) -> List[Tuple[str, int]]:
+        """Kalıbı k+1 parçaya böler; (parça, kalıp içindeki başlangıç) döndürür"""
+        count = self.k + 1
+        size = self.m // count
+        pieces = []
+        for i in range(count):
+            start = i * size
+            end = self.m if i == count - 1 else start + size
+            pieces.append((self.pattern[start:end], start))
+        return pieces
+
+    def search(self, text: str) -> bool:
+        """Metinde en fazla k hatalı bir eşleşme var mı"""
+        for _ in self.find_ends(text):
+            return True
+        return False
+
+    def find_ends(self, text: str) -> Iterator[int]:
+        """
+        En fazla k hatalı eşleşmelerin bitiş konumlarını (hariç) üretir.
+
+        Art arda gelen bitiş konumları tek bir eşleşme olarak bildirilir.
+        """
+        if not self.m:
+            return
+        if self.k == 0:
+            start = text.find(self.pattern)
+            while start != -1:
+                yield start + self.m
+                start = text.find(self.pattern, start + 1)
+            return
+        last_end = -2
+        for lo, hi in self._candidate_windows(text):
+            for end in self._scan(text, lo, hi):
+                if end != last_end + 1:
+                    yield end
+                last_end = end
+
+    def _candidate_windows(self, text: str) -> List[Tuple[int, int]]:
+        """Parçaların tam geçtiği yerlerin çevresindeki, birleştirilmiş tarama pencereleri"""
+        reach = self.m + self.k
+        windows = []
+        for piece, offset in self._pieces:
+            pos = text.find(piece)
+            while pos != -1:
+                lo = max(0, pos - offset - self.k)
+                windows.append((lo, min(len(text), lo + reach + self.k)))
+                pos = text.find(piece, pos + 1)
+        if not windows:
+            return []
+        windows.sort()
+        merged = [list(windows[0])]
+        for lo, hi in windows[1:]:
+            if lo <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], hi)
+            else:
+                merged.append([lo, hi])
+        return [(lo, hi) for lo, hi in merged]
+
+    def _scan(self, text: str, lo: int, hi: int) -> Iterator[int]:
+        """text[lo:hi] üzerinde Myers taraması; skor <= k olan bitiş konumlarını üretir"""
+        peq = self._peq
+        mask = self._mask
+        high = self._high
+        k = self.k
+        pv = mask
+        mv = 0
+        score = self.m
+        for j in range(lo, hi):
+            eq = peq.get(text[j], 0)
+            xv = eq | mv
+            xh = (((eq & pv) + pv) ^ pv) | eq
+            ph = mv | (~(xh | pv) & mask)
+            mh = pv & xh
+            if ph & high:
+                score += 1
+            elif mh & high:
+                score -= 1
+            # Metin içinde arama: eşleşme her konumdan başlayabilir, sınır satırı 0 kalır
+            ph = (ph << 1) & mask
+            mh = (mh << 1) & mask
+            pv = mh | (~(xv | ph) & mask)
+            mv = ph & xv
+            if score <= k:
+                yield j + 1
@@ -0,0 +1,138 @@
+import heapq
+import math
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from index_segment import DocumentRecord, Segment, SourceRecord, TermPostings, write_segment
+
+
+class MergeCancelled(Exception):
+    """Birleştirme yarıda kesildiğinde fırlatılır; yarım segment diske taşınmaz"""
+
+
+def live_document_counts(segment: Segment, deleted: Set[int]) -> Tuple[int, int]:
+    """Segmentteki (canlı, silinmiş) belge sayıları"""
+    live = dead = 0
+    for source_id, (_, _, _, _, doc_count) in enumerate(segment.sources):
+        if source_id in deleted:
+            dead += doc_count
+        else:
+            live += doc_count
+    return live, dead
+
+
+class TieredMergePolicy:
+    """
+    Segmentleri boyut katmanlarına ayırıp birleştirilecekleri seçen politika.
+
+    Bir segmentin katmanı canlı boyutunun `floor_bytes` üzerinden
+    `segments_per_tier` tabanında logaritmasıdır. Bir katmanda
+    `segments_per_tier` kadar segment biriktiğinde en küçükleri tek bir
+    segmentte birleştirilir; böylece her belge yalnızca logaritmik sayıda
+    yeniden yazılır. Silinmiş belge oranı yüksek segmentler tek başına
+    yeniden yazılarak temizlenir.
+    """
+
+    def __init__(self, segments_per_tier: int = 8, max_merge_at_once: int = 10,
+                 floor_bytes: int = 2 * 1024 * 1024, expunge_ratio: float = 0.4):
+        """
+        Args:
+            segments_per_tier: Bir katmanda birleştirme başlatan segment sayısı
+            max_merge_at_once: Tek birleştirmeye girecek en fazla segment
+            floor_bytes: Bundan küçük segmentler aynı (en alt) katmanda sayılır
+            expunge_ratio: Bu orandan fazla silinmiş belge içeren segment yeniden yazılır
+        """
+        self.segments_per_tier = max(2, segments_per_tier)
+        self.max_merge_at_once = max(2, max_merge_at_once)
+        self.floor_bytes = floor_bytes
+        self.expunge_ratio = expunge_ratio
+
+    def tier(self, live_bytes: float) -> int:
+        return int(math.log(max(live_bytes, self.floor_bytes) / self.floor_bytes, self.segments_per_tier))
+
+    def select(self, segments: List[Segment], deleted: Dict[str, Set[int]]) -> Optional[List[Segment]]:
+        """
+        Sıradaki birleştirmeyi seçer.
+
+        Returns:
+            Birleştirilecek segmentler; yapılacak iş yoksa None
+        """
+        tiers: Dict[int, List[Tuple[float, Segment]]] = {}
+        for segment in segments:
+            live, dead = live_document_counts(segment, deleted.get(segment.name, set()))
+            total = live + dead
+            if total and dead / total >= self.expunge_ratio:
+                return [segment]
+            live_bytes = segment.size * (live / total) if total else 0
+            tiers.setdefault(self.tier(live_bytes), []).append((live_bytes, segment))
+        for tier in sorted(tiers):
+            members = tiers[tier]
+            if len(members) >= self.segments_per_tier:
+                members.sort(key=itemgetter(0))
+                return [segment for _, segment in members[:self.max_merge_at_once]]
+        return None
+
+
+def _tagged_terms(segment: Segment, number: int) -> Iterator[Tuple[str, int, int, int]]:
+    for term, offset, length in segment.iter_terms():
+        yield term, number, offset, length
+
+
+def merge_segments(segments: List[Segment], deleted: Dict[str, Set[int]], path: str,
+                   should_stop: Optional[Callable[[], bool]] = None) -> Dict[str, Dict[int, int]]:
+    """
+    Segmentleri silinmiş kayıtları atarak tek bir segmentte birleştirir.
+
+    Sözlükler sıralı olduğundan kelimeler heapq.merge ile akış halinde
+    birleştirilir; konum baytları çözülmeden yeni belge numaralarıyla
+    yeniden yazılır.
+
+    Args:
+        segments: Birleştirilecek segmentler
+        deleted: Segment adı -> silinmiş kaynak numaraları
+        path: Yazılacak segment dosyası
+        should_stop: True döndürürse birleştirme MergeCancelled ile kesilir
+
+    Returns:
+        Segment adı -> {eski kaynak numarası: yeni kaynak numarası}
+    """
+    docs: List[DocumentRecord] = []
+    sources: List[SourceRecord] = []
+    doc_maps: List[Dict[int, int]] = []
+    source_maps: Dict[str, Dict[int, int]] = {}
+    for segment in segments:
+        dead = deleted.get(segment.name, set())
+        doc_map = {}
+        source_map = {}
+        for source_id, (source, mtime, size, first_doc, doc_count) in enumerate(segment.sources):
+            if source_id in dead:
+                continue
+            new_source_id = len(sources)
+            source_map[source_id] = new_source_id
+            sources.append((source, mtime, size, len(docs), doc_count))
+            for old_doc in range(first_doc, first_doc + doc_count):
+                doc_path, _, token_count = segment.document(old_doc)
+                doc_map[old_doc] = len(docs)
+                docs.append((doc_path, new_source_id, token_count))
+        doc_maps.append(doc_map)
+        source_maps[segment.name] = source_map
+
+    def merged_terms() -> Iterator[TermPostings]:
+        streams = [_tagged_terms(segment, number) for number, segment in enumerate(segments)]
+        for count, (term, group) in enumerate(groupby(heapq.merge(*streams), key=itemgetter(0))):
+            if should_stop is not None and count % 1024 == 0 and should_stop():
+                raise MergeCancelled()
+            postings = []
+            # Segmentler sırayla numaralandığından yeni belge numaraları artan sırada kalır
+            for _, number, offset, length in group:
+                doc_map = doc_maps[number]
+                for old_doc, positions in segments[number].postings(offset, length).items():
+                    new_doc = doc_map.get(old_doc)
+                    if new_doc is not None:
+                        postings.append((new_doc, positions))
+            if postings:
+                yield term, postings
+
+    write_segment(path, merged_terms(), docs, sources)
+    return source_maps
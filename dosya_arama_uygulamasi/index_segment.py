@@ -0,0 +1,347 @@
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+SEGMENT_MAGIC = b'DASEG\x00\x01\x00'
+# magic, kelime sayısı, belge sayısı, kaynak dosya sayısı, seyrek indeks aralığı,
+# ardından bölümlerin dosya içindeki başlangıçları
+_HEADER = struct.Struct('<8sIIII6Q')
+_DOUBLE = struct.Struct('<d')
+_OFFSET = struct.Struct('<Q')
+
+# Sözlükteki her kaçıncı kelimenin bellekteki seyrek indekse alınacağı
+TERM_INDEX_INTERVAL = 64
+
+# (kaynak dosya yolu, mtime, boyut, ilk belge numarası, belge sayısı)
+SourceRecord = Tuple[str, float, int, int, int]
+# (belge yolu, kaynak numarası, kelime sayısı)
+DocumentRecord = Tuple[str, int, int]
+# (kelime, sıralı (belge numarası, delta kodlu konumlar) listesi)
+TermPostings = Tuple[str, List[Tuple[int, bytes]]]
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """Negatif olmayan tamsayıyı 7 bitlik gruplar halinde (LEB128) ekler"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data, pos: int) -> Tuple[int, int]:
+    """data[pos] konumundaki varint'i okur; (değer, sonraki konum) döndürür"""
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, pos
+        shift += 7
+
+
+def iter_varints(data: bytes) -> Iterator[int]:
+    """encode_varint ile yazılmış tamsayıları sırayla okur"""
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            yield value
+            value = 0
+            shift = 0
+
+
+def encode_positions(positions: Sequence[int]) -> bytes:
+    """Sıralı konumları farkları alınarak (delta) varint dizisi olarak kodlar"""
+    out = bytearray()
+    previous = 0
+    for position in positions:
+        encode_varint(position - previous, out)
+        previous = position
+    return bytes(out)
+
+
+def decode_positions(data: bytes) -> List[int]:
+    """encode_positions ile kodlanmış konumları geri açar"""
+    positions = []
+    current = 0
+    for delta in iter_varints(data):
+        current += delta
+        positions.append(current)
+    return positions
+
+
+def _encode_str(text: str, out: bytearray) -> None:
+    raw = text.encode('utf-8', 'surrogatepass')
+    encode_varint(len(raw), out)
+    out += raw
+
+
+class SegmentWriter:
+    """
+    Bellekte biriktirilen belgeleri değişmez bir segment dosyası olarak yazar.
+
+    Dosya düzeni (bölümler sırayla):
+      başlık | konum listeleri | sıralı kelime sözlüğü | seyrek kelime indeksi |
+      belge tablosu | belge konum tablosu (8 baytlık sabit girdiler) | kaynak dosya tablosu
+
+    Kelimenin konum listesi: [belge sayısı] ve her belge için
+    [belge numarası farkı][konum baytlarının uzunluğu][delta kodlu konumlar].
+    Tüm tamsayılar varint olarak yazılır.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, List[Tuple[int, bytes]]] = {}
+        self._docs: List[DocumentRecord] = []
+        self._sources: List[SourceRecord] = []
+        self.posting_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def add_source(self, source: str, mtime: float, size: int,
+                   documents: List[Tuple[str, Dict[str, bytes], int]]) -> int:
+        """
+        Kaynak dosyayı ve belgelerini ekler.
+
+        Args:
+            source: Diskteki dosya
+            mtime, size: Dosyanın indekslendiği andaki stat bilgileri
+            documents: (belge yolu, kelime -> delta kodlu konumlar, kelime sayısı) listesi
+
+        Returns:
+            Kaynağın segment içindeki numarası
+        """
+        source_id = len(self._sources)
+        first_doc = len(self._docs)
+        for doc_path, term_positions, token_count in documents:
+            doc_id = len(self._docs)
+            self._docs.append((doc_path, source_id, token_count))
+            for term, encoded in term_positions.items():
+                self._postings.setdefault(term, []).append((doc_id, encoded))
+                self.posting_bytes += len(encoded) + 4
+        self._sources.append((source, mtime, size, first_doc, len(documents)))
+        return source_id
+
+    def write(self, path: str) -> None:
+        """Segmenti diske yazar"""
+        terms = ((term, self._postings[term]) for term in sorted(self._postings))
+        write_segment(path, terms, self._docs, self._sources)
+
+
+def write_segment(path: str, terms: Iterable[TermPostings], docs: List[DocumentRecord],
+                  sources: List[SourceRecord]) -> None:
+    """
+    Segmenti önce geçici dosyaya yazıp ardından atomik olarak yerine taşır.
+
+    Args:
+        path: Segment dosyası
+        terms: Sıralı kelimeler ve konum listeleri (akış halinde okunur)
+        docs: Belge tablosu
+        sources: Kaynak dosya tablosu
+    """
+    folder = os.path.dirname(path) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            _write_sections(f, terms, docs, sources)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _write_sections(f, terms: Iterable[TermPostings], docs: List[DocumentRecord],
+                    sources: List[SourceRecord]) -> None:
+    f.write(b'\0' * _HEADER.size)
+    postings_offset = f.tell()
+    dictionary = bytearray()
+    term_index = bytearray()
+    buffer = bytearray()
+    relative = 0
+    term_count = 0
+    for term, postings in terms:
+        if term_count % TERM_INDEX_INTERVAL == 0:
+            _encode_str(term, term_index)
+            encode_varint(len(dictionary), term_index)
+        term_count += 1
+        buffer.clear()
+        encode_varint(len(postings), buffer)
+        previous = 0
+        for doc_id, encoded in postings:
+            encode_varint(doc_id - previous, buffer)
+            encode_varint(len(encoded), buffer)
+            buffer += encoded
+            previous = doc_id
+        f.write(buffer)
+        _encode_str(term, dictionary)
+        encode_varint(relative, dictionary)
+        encode_varint(len(buffer), dictionary)
+        relative += len(buffer)
+    dictionary_offset = f.tell()
+    f.write(dictionary)
+    term_index_offset = f.tell()
+    f.write(term_index)
+    docs_offset = f.tell()
+    doc_offsets = bytearray()
+    record = bytearray()
+    relative = 0
+    for doc_path, source_id, token_count in docs:
+        doc_offsets += _OFFSET.pack(relative)
+        record.clear()
+        _encode_str(doc_path, record)
+        encode_varint(source_id, record)
+        encode_varint(token_count, record)
+        f.write(record)
+        relative += len(record)
+    doc_offsets_offset = f.tell()
+    f.write(doc_offsets)
+    sources_offset = f.tell()
+    record = bytearray()
+    for source, mtime, size, first_doc, doc_count in sources:
+        _encode_str(source, record)
+        record += _DOUBLE.pack(mtime)
+        encode_varint(size, record)
+        encode_varint(first_doc, record)
+        encode_varint(doc_count, record)
+    f.write(record)
+    f.seek(0)
+    f.write(_HEADER.pack(SEGMENT_MAGIC, term_count, len(docs), len(sources), TERM_INDEX_INTERVAL,
+                         postings_offset, dictionary_offset, term_index_offset, docs_offset,
+                         doc_offsets_offset, sources_offset))
+
+
+class Segment:
+    """
+    mmap ile açılan salt okunur segment.
+
+    Açılışta yalnızca başlık, seyrek kelime indeksi (her 64 kelimeden biri)
+    ve kaynak dosya tablosu okunur. Kelime sözlüğü ve konum listeleri
+    sorgu sırasında mmap üzerinden okunduğundan bellekte yalnızca
+    sorgunun dokunduğu sayfalar yer kaplar.
+    """
+
+    def __init__(self, path: str):
+        """
+        Raises:
+            OSError: Dosya açılamazsa
+            ValueError: Dosya geçerli bir segment değilse
+        """
+        self.path = path
+        self.name = os.path.basename(path)
+        self._file = open(path, 'rb')
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        try:
+            fields = _HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self.close()
+            raise ValueError(f"Geçersiz segment: {path}")
+        if fields[0] != SEGMENT_MAGIC:
+            self.close()
+            raise ValueError(f"Geçersiz segment: {path}")
+        (_, self.term_count, self.doc_count, self.source_count, _,
+         self._postings_offset, self._dictionary_offset, self._term_index_offset,
+         self._docs_offset, self._doc_offsets_offset, self._sources_offset) = fields
+        self._index_terms: List[str] = []
+        self._index_offsets: List[int] = []
+        pos = self._term_index_offset
+        while pos < self._docs_offset:
+            term, pos = self._read_str(pos)
+            offset, pos = read_varint(self._mm, pos)
+            self._index_terms.append(term)
+            self._index_offsets.append(offset)
+        self.sources: List[SourceRecord] = []
+        pos = self._sources_offset
+        for _ in range(self.source_count):
+            source, pos = self._read_str(pos)
+            mtime = _DOUBLE.unpack_from(self._mm, pos)[0]
+            size, pos = read_varint(self._mm, pos + _DOUBLE.size)
+            first_doc, pos = read_varint(self._mm, pos)
+            doc_count, pos = read_varint(self._mm, pos)
+            self.sources.append((source, mtime, size, first_doc, doc_count))
+
+    @property
+    def size(self) -> int:
+        return len(self._mm)
+
+    def close(self) -> None:
+        mm = getattr(self, '_mm', None)
+        if mm is not None:
+            mm.close()
+            self._mm = None
+        self._file.close()
+
+    def _read_str(self, pos: int) -> Tuple[str, int]:
+        length, pos = read_varint(self._mm, pos)
+        return self._mm[pos:pos + length].decode('utf-8', 'surrogatepass'), pos + length
+
+    def _iter_dictionary(self, pos: int) -> Iterator[Tuple[str, int, int]]:
+        """Sözlüğü verilen konumdan itibaren (kelime, konum listesi başlangıcı, uzunluğu) olarak okur"""
+        end = self._term_index_offset
+        while pos < end:
+            term, pos = self._read_str(pos)
+            offset, pos = read_varint(self._mm, pos)
+            length, pos = read_varint(self._mm, pos)
+            yield term, self._postings_offset + offset, length
+
+    def _block_start(self, term: str) -> int:
+        """Kelimenin bulunabileceği sözlük bloğunun başlangıcı (seyrek indekste ikili arama)"""
+        block = bisect_right(self._index_terms, term) - 1
+        if block < 0:
+            return self._dictionary_offset
+        return self._dictionary_offset + self._index_offsets[block]
+
+    def lookup(self, term: str) -> Optional[Tuple[int, int]]:
+        """Kelimenin konum listesinin (başlangıç, uzunluk) bilgisi; kelime yoksa None"""
+        for candidate, offset, length in self._iter_dictionary(self._block_start(term)):
+            if candidate == term:
+                return offset, length
+            if candidate > term:
+                return None
+        return None
+
+    def iter_terms(self, prefix: str = '') -> Iterator[Tuple[str, int, int]]:
+        """Sözlükteki kelimeleri sırayla üretir; önek verilirse yalnızca o aralığı okur"""
+        start = self._block_start(prefix) if prefix else self._dictionary_offset
+        for term, offset, length in self._iter_dictionary(start):
+            if term < prefix:
+                continue
+            if prefix and not term.startswith(prefix):
+                return
+            yield term, offset, length
+
+    def postings(self, offset: int, length: int) -> Dict[int, bytes]:
+        """Konum listesini belge numarası -> delta kodlu konum baytları olarak okur"""
+        data = self._mm[offset:offset + length]
+        count, pos = read_varint(data, 0)
+        result = {}
+        doc_id = 0
+        for _ in range(count):
+            gap, pos = read_varint(data, pos)
+            size, pos = read_varint(data, pos)
+            doc_id += gap
+            result[doc_id] = data[pos:pos + size]
+            pos += size
+        return result
+
+    def document(self, doc_id: int) -> Tuple[str, int, int]:
+        """Belgenin (yolu, kaynak numarası, kelime sayısı)"""
+        relative = _OFFSET.unpack_from(self._mm, self._doc_offsets_offset + doc_id * _OFFSET.size)[0]
+        path, pos = self._read_str(self._docs_offset + relative)
+        source_id, pos = read_varint(self._mm, pos)
+        token_count, _ = read_varint(self._mm, pos)
+        return path, source_id, token_count
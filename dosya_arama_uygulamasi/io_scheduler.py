@@ -0,0 +1,206 @@
+import os
+import struct
+import sys
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Linux FIEMAP: dosyanın diskteki fiziksel kesimlerini sorgular
+_FS_IOC_FIEMAP = 0xC020660B
+_FIEMAP_HEADER = struct.Struct('=QQIIII')
+_FIEMAP_EXTENT = struct.Struct('=QQQQQIIII')
+
+DEFAULT_READERS = 2
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# (dosya yolu, mtime, içerik); içerik None ise dosya (bütçeden büyük veya
+# okunamadığı için) işçide yolundan açılır
+PrefetchedFile = Tuple[str, float, Optional[bytes]]
+
+
+def physical_offset(file_path: str) -> Optional[int]:
+    """
+    Dosyanın ilk kesiminin diskteki fiziksel konumu (yalnızca Linux).
+
+    Returns:
+        Bayt cinsinden konum; dosya sistemi desteklemiyorsa (ör. NFS/SMB) veya
+        dosya boşsa None
+    """
+    if fcntl is None or not sys.platform.startswith('linux'):
+        return None
+    request = bytearray(_FIEMAP_HEADER.pack(0, 0xFFFFFFFFFFFFFFFF, 0, 0, 1, 0) + bytes(_FIEMAP_EXTENT.size))
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        fcntl.ioctl(fd, _FS_IOC_FIEMAP, request)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    if not _FIEMAP_HEADER.unpack_from(request)[3]:
+        return None
+    return _FIEMAP_EXTENT.unpack_from(request, _FIEMAP_HEADER.size)[1]
+
+
+def locality_order(entries, use_extents: bool = True) -> List:
+    """
+    Dosyaları disk üzerindeki yerleşimlerine göre sıralar.
+
+    Aynı aygıttaki dosyalar birlikte tutulur; fiziksel konum öğrenilebiliyorsa
+    (FIEMAP) ona, öğrenilemiyorsa inode numarasına göre sıralanır. Çoğu
+    dosya sisteminde inode sırası ayırma sırasına yakın olduğundan döner
+    disklerde ve ağ paylaşımlarında rastgele erişim yerine sıralı okuma
+    sağlanır. FIEMAP desteklemeyen aygıtlarda bir kez başarısız olunca
+    o aygıt için bir daha denenmez.
+
+    Args:
+        entries: FileEntry nesneleri
+        use_extents: Fiziksel konumu FIEMAP ile sorgula
+
+    Returns:
+        Sıralanmış FileEntry listesi
+    """
+    unsupported = set()
+    keyed = []
+    for entry in entries:
+        offset = None
+        if use_extents and entry.dev not in unsupported:
+            offset = physical_offset(entry.path)
+            if offset is None and entry.size:
+                unsupported.add(entry.dev)
+        # Konumu bilinen dosyalar önce, sonra inode ve yol sırası
+        if offset is None:
+            key = (entry.dev, 1, entry.ino, entry.path)
+        else:
+            key = (entry.dev, 0, offset, entry.path)
+        keyed.append((key, entry))
+    keyed.sort(key=lambda item: item[0])
+    return [entry for _, entry in keyed]
+
+
+class PrefetchReader:
+    """
+    Dosyaları az sayıda iş parçacığıyla sırayla okuyup belleğe alan okuyucu.
+
+    Dosyalar verilen sırada (locality_order) okunur; okuyucu sayısı küçük
+    tutulduğundan disk kafası ileri doğru ilerler. Bellekte bekleyen
+    içeriklerin toplamı `memory_budget` ile sınırlıdır: tüketici bir dosyayı
+    aldıkça yeni okumalara yer açılır. Tüketicinin sıradaki beklediği dosya
+    bütçeyi aşsa da okunur; aksi halde ondan sonraki dosyalar bütçeyi
+    doldurup akışı kilitleyebilirdi. Bütçeden büyük dosyalar belleğe
+    alınmaz, içerik yerine None üretilir ve işçi dosyayı kendisi açar.
+    """
+
+    def __init__(self, entries, readers: int = DEFAULT_READERS,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET,
+                 should_stop: Optional[Callable[[], bool]] = None,
+                 throttle=None):
+        """
+        Args:
+            entries: Okunacak FileEntry nesneleri (okuma sırasıyla)
+            readers: Okuyucu iş parçacığı sayısı
+            memory_budget: Bellekte bekletilecek en fazla bayt
+            should_stop: True döndürürse okuma durur
+            throttle: Okuma hızı sınırı için resource_governor.WorkerThrottle
+        """
+        self.entries = list(entries)
+        self.readers = max(1, readers)
+        self.memory_budget = memory_budget
+        self.should_stop = should_stop or (lambda: False)
+        self.throttle = throttle
+        self.bytes_read = 0
+        self._next = 0
+        self._buffered = 0
+        self._done_readers = 0
+        self._closed = False
+        # Tüketicinin sıradaki beklediği dosyanın sırası
+        self._wanted = 0
+        self._cond = threading.Condition()
+        self._ready: Dict[int, PrefetchedFile] = {}
+
+    def __iter__(self) -> Iterator[PrefetchedFile]:
+        """Dosyaları okuma sırasıyla üretir"""
+        threads = [threading.Thread(target=self._read_loop, daemon=True) for _ in range(self.readers)]
+        for thread in threads:
+            thread.start()
+        try:
+            for index in range(len(self.entries)):
+                with self._cond:
+                    self._wanted = index
+                    self._cond.notify_all()
+                    while index not in self._ready:
+                        if self.should_stop() or self._done_readers == len(threads):
+                            return
+                        self._cond.wait(0.2)
+                    item = self._ready.pop(index)
+                    if item[2] is not None:
+                        self._buffered -= len(item[2])
+                    self._cond.notify_all()
+                yield item
+        finally:
+            with self._cond:
+                # Tüketici bıraktıysa bekleyen okuyucular da çıkar
+                self._closed = True
+                self._cond.notify_all()
+
+    def _read_loop(self) -> None:
+        try:
+            while True:
+                with self._cond:
+                    index = self._next
+                    if index >= len(self.entries) or self._closed or self.should_stop():
+                        return
+                    self._next += 1
+                    entry = self.entries[index]
+                    if entry.size > self.memory_budget:
+                        self._ready[index] = (entry.path, entry.mtime, None)
+                        self._cond.notify_all()
+                        continue
+                    # Bellek bütçesi doluysa tüketicinin yer açması beklenir
+                    while index != self._wanted and self._buffered + entry.size > self.memory_budget:
+                        if self._closed or self.should_stop():
+                            return
+                        self._cond.wait(0.2)
+                    self._buffered += entry.size
+                data = self._read(entry)
+                with self._cond:
+                    # Okunan boyut walk sırasındakinden farklı olabilir
+                    self._buffered += (len(data) if data is not None else 0) - entry.size
+                    self._ready[index] = (entry.path, entry.mtime, data)
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._done_readers += 1
+                self._cond.notify_all()
+
+    def _read(self, entry) -> Optional[bytes]:
+        if self.throttle is not None:
+            self.throttle.consume(entry.size)
+        try:
+            with open(entry.path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        self.bytes_read += len(data)
+        return data
+
+
+def prefetched_batches(reader: PrefetchReader, target_bytes: int, max_files: int) -> Iterator[List[PrefetchedFile]]:
+    """Okunan dosyaları işçilere gönderilecek, toplam boyutu sınırlı gruplar halinde üretir"""
+    batch: List[PrefetchedFile] = []
+    batch_bytes = 0
+    for item in reader:
+        batch.append(item)
+        batch_bytes += len(item[2]) if item[2] is not None else 0
+        if batch_bytes >= target_bytes or len(batch) >= max_files:
+            yield batch
+            batch = []
+            batch_bytes = 0
+    if batch:
+        yield batch
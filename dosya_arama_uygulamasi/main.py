@@ -2,188 +2,637 @@ import sys
 import os
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton, QListWidget, QFileDialog, QStatusBar, QCheckBox, QGroupBox, QMenu, QTextEdit, QGridLayout, QSplitter, QListWidgetItem, QMessageBox, QRadioButton, QButtonGroup
+    QLabel, QLineEdit, QPushButton, QListWidget, QFileDialog, QStatusBar, QCheckBox, QGroupBox, QMenu, QTextEdit, QGridLayout, QSplitter, QListWidgetItem, QMessageBox, QRadioButton, QButtonGroup, QSpinBox
 )
 from PyQt5.QtCore import QThread, pyqtSignal, Qt, QEvent, QSettings
 from PyQt5.QtGui import QCursor
 from PyQt5.QtGui import QFont, QCursor, QTextCharFormat, QTextCursor, QColor
 from file_searcher import FileSearcher
+from directory_walker import (DirectoryWalker, WalkOptions, DEFAULT_EXCLUDES, LEGACY_DEFAULT_EXCLUDES, parse_patterns,
+                              parse_roots, root_of)
+from directory_snapshot import DirectorySnapshot, SNAPSHOT_DEFAULT
+from dedup import group_duplicates
+from extractors import archive_outer_path, read_file_text
+from query import CompiledQuery, parse_keywords
+from text_cache import ExtractedText, TextCache
+from ranking import BM25Scorer, TopKCollector, filename_matches
+from positional_index import PositionalIndex
+from result_cache import CachedResult, QueryResultCache, query_cache_key
+from scan_checkpoint import ScanCheckpoint, checkpoint_key
+from search_pipeline import (SEARCHED_EXTS, search_pool, index_pool, search_batch_task, plan_batches, hit_for_copy,
+                             index_worker, index_chunksize, search_bytes_task, sequential_batches, index_bytes_task,
+                             prefetch_reader)
+from resource_governor import ResourceGovernor, ResourceLimits, IO_PRIORITY_IDLE
+from distributed import SearchCoordinator, parse_workers
+from ngram_filter import NgramQuery, SignatureStore
+from search_trace import SearchTrace
+from app_cache import cache_path
+from result_export import ResultExporter, export_format, line_snippet, match_lines, parquet_available, MAX_LINES_PER_FILE
 import subprocess
 import platform
-import zipfile
-import xml.etree.ElementTree as ET
-import io
 import multiprocessing
-from multiprocessing import Pool, Manager
-import fitz
 import re
+import time
+from contextlib import nullcontext
 
-# Yardımcı: Dosya türü kategorileri
-TXT_EXTS = ['.txt']
-PDF_EXTS = ['.pdf']
-OFFICE_EXTS = ['.docx', '.docm', '.dotx', '.dotm', '.xlsx', '.xlsm', '.xltx', '.xltm', '.xlsb', '.pptx', '.pptm', '.ppsx', '.ppsm', '.potx', '.potm', '.vsdx', '.vsd']
+# Önizlemede bir seferde gösterilen eşleşen satır sayısı
+PREVIEW_PAGE_LINES = 20
 
-def matches_keyword_simple(text, keyword, match_type, case_sensitive):
-    """UI'dan bağımsız kelime eşleştirme fonksiyonu"""
-    import re
-    
-    # Büyük/küçük harf ayarı
-    search_text = text if case_sensitive else text.lower()
-    search_keyword = keyword if case_sensitive else keyword.lower()
-    
-    if match_type == 0:  # Normal arama
-        return search_keyword in search_text
-    elif match_type == 1:  # Tam kelime
-        # Word boundary kullanarak tam kelime ara
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = r'\b' + re.escape(keyword) + r'\b'
-        return bool(re.search(pattern, text, flags))
-    elif match_type == 2:  # Başlangıç
-        # Kelime başında ara
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = r'\b' + re.escape(keyword)
-        return bool(re.search(pattern, text, flags))
-    elif match_type == 3:  # Bitiş
-        # Kelime sonunda ara
-        flags = 0 if case_sensitive else re.IGNORECASE
-        pattern = re.escape(keyword) + r'\b'
-        return bool(re.search(pattern, text, flags))
-    
-    return False
-
-def file_search_worker(args):
-    file_path, keyword_list, extensions, case_sensitive, match_type = args
-    file_extension = os.path.splitext(file_path)[1].lower()
-    try:
-        content = ""
-        if file_extension == '.txt':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        elif file_extension in ['.docx', '.docm', '.dotx', '.dotm']:
-            from docx import Document
-            doc = Document(file_path)
-            content = '\n'.join([p.text for p in doc.paragraphs])
-        elif file_extension in ['.xlsx', '.xlsm', '.xltx', '.xltm']:
-            from openpyxl import load_workbook
-            wb = load_workbook(file_path, data_only=True)
-            texts = []
-            for sheet in wb.worksheets:
-                for row in sheet.iter_rows(values_only=True):
-                    for cell in row:
-                        if cell is not None:
-                            texts.append(str(cell))
-            content = '\n'.join(texts)
-        elif file_extension == '.xlsb':
-            try:
-                from pyxlsb import open_workbook
-                texts = []
-                with open_workbook(file_path) as wb:
-                    for sheet_name in wb.get_sheet_names():
-                        with wb.get_sheet(sheet_name) as sheet:
-                            for row in sheet.rows():
-                                for cell in row:
-                                    if cell.v is not None:
-                                        texts.append(str(cell.v))
-                content = '\n'.join(texts)
-            except ImportError:
-                return None
-        elif file_extension in ['.pptx', '.pptm', '.ppsx', '.ppsm', '.potx', '.potm']:
-            try:
-                from pptx import Presentation
-                prs = Presentation(file_path)
-                texts = []
-                for slide in prs.slides:
-                    for shape in slide.shapes:
-                        if hasattr(shape, "text_frame") and shape.text_frame:
-                            for paragraph in shape.text_frame.paragraphs:
-                                if paragraph.text.strip():
-                                    texts.append(paragraph.text.strip())
-                content = '\n'.join(texts)
-            except ImportError:
-                return None
-        elif file_extension == '.pdf':
-            with fitz.open(file_path) as doc:
-                content = '\n'.join(page.get_text() for page in doc)
-        elif file_extension == '.vsdx':
-            metinler = read_vsdx_text(file_path)
-            content = ' '.join(metinler)
-        # .vsd için içerik okuma yok
-        for keyword in keyword_list:
-            if matches_keyword_simple(content, keyword, match_type, case_sensitive):
-                return file_path
-    except Exception:
-        return None
-    return None
+class SearchOptions:
+    """Aramanın sorgu, önbellek ve çıktı ayarları."""
+
+    def __init__(self,
+                 case_sensitive=False,
+                 match_type=0,
+                 use_regex=False,
+                 max_errors=1,
+                 ignore_diacritics=False,
+                 top_k=0,
+                 use_snapshot=False,
+                 deduplicate=False,
+                 use_index=False,
+                 use_result_cache=False,
+                 resumable=False,
+                 sequential_io=False,
+                 use_signatures=False,
+                 remote_workers=None,
+                 export_path=None,
+                 trace_path=None):
+        """
+        Args:
+            case_sensitive / match_type / use_regex / max_errors / ignore_diacritics: Sorgu seçenekleri (bkz. CompiledQuery)
+            top_k: Yalnızca en alakalı bu kadar sonucu göster (0 = hepsi, bulundukça)
+            use_snapshot: Klasör listelerini anlık görüntüden al
+            deduplicate: Aynı içerikli dosyaları grupla
+            use_index: Konumsal indeksle ara
+            use_result_cache: Değişmemiş dosyalarda önceki aramanın sonuçlarını kullan
+            resumable: İlerlemeyi kaydet, yarıda kalan aramayı sürdür
+            sequential_io: Dosyaları disk yerleşimine göre sırayla oku
+            use_signatures: N-gram imzalarıyla eşleşemeyecek dosyaları ele
+            remote_workers: Doluysa yerel klasör yerine bu arama sunucularında ara
+            export_path: Doluysa sonuçları bulundukça bu dosyaya yaz
+            trace_path: Doluysa aramayı profille, iz dosyalarını bu önekle yaz
+        """
+        self.case_sensitive = case_sensitive
+        self.match_type = match_type
+        self.use_regex = use_regex
+        self.max_errors = max_errors
+        self.ignore_diacritics = ignore_diacritics
+        self.top_k = top_k
+        self.use_snapshot = use_snapshot
+        self.deduplicate = deduplicate
+        self.use_index = use_index
+        self.use_result_cache = use_result_cache
+        self.resumable = resumable
+        self.sequential_io = sequential_io
+        self.use_signatures = use_signatures
+        self.remote_workers = remote_workers or []
+        self.export_path = export_path
+        self.trace_path = trace_path
 
 class SearchThread(QThread):
-    dosya_bulundu = pyqtSignal(str)
+    # Dosya yolu ve işçinin bulduğu satırlar ({'line', 'keywords', 'snippet', 'matches'} listesi; indeks aramasında None)
+    dosya_bulundu = pyqtSignal(str, object)
+    kopyalar_bulundu = pyqtSignal(str, list)
     arama_bitti = pyqtSignal(int)
     arama_durumu = pyqtSignal(str)
 
-    def __init__(self, directory, keywords, extensions, case_sensitive=False, match_type=0):
+    def __init__(self, directory, keywords, extensions, options=None, walk_options=None, limits=None):
+        """
+        Args:
+            directory: Aranacak kök dizin veya kök dizinler listesi
+            keywords: Anahtar kelime metni (parse_keywords ile ayrılır)
+            extensions: Aranacak dosya uzantıları
+            options: Sorgu, önbellek ve çıktı ayarları (varsayılanlar için None)
+            walk_options: Dizin taramasının filtreleri (varsayılanlar için None)
+            limits: İşçi sayısı, öncelik ve okuma hızı sınırları (sınırsız için None)
+        """
         super().__init__()
-        self.directory = directory
+        options = options or SearchOptions()
+        # Bir veya birden fazla kök dizin; hepsi tek bir arama hattında taranır
+        self.roots = [os.path.abspath(directory)] if isinstance(directory, str) else \
+            [os.path.abspath(path) for path in directory]
+        # Dosyanın ilk bulunan yolu -> aynı dosyaya giden diğer yollar (sabit bağlantı, örtüşen kök)
+        self.aliases = {}
         self.keywords = keywords
         self.extensions = extensions
-        self.case_sensitive = case_sensitive
-        self.match_type = match_type
+        self.case_sensitive = options.case_sensitive
+        self.match_type = options.match_type
+        self.walk_options = walk_options or WalkOptions()
+        self.use_snapshot = options.use_snapshot
+        self.deduplicate = options.deduplicate
+        self.use_regex = options.use_regex
+        self.max_errors = options.max_errors
+        self.ignore_diacritics = options.ignore_diacritics
+        self.top_k = options.top_k
+        self.use_index = options.use_index
+        self.use_result_cache = options.use_result_cache
+        # Doluysa yerel klasör yerine uzak arama sunucularında aranır
+        self.remote_workers = options.remote_workers
+        # Uzak aramada hata veren (sonuçları eksik olabilecek) sunucular
+        self.failed_workers = []
+        # Doluysa tüm sonuçlar bulundukça bu dosyaya yazılır
+        self.export_path = options.export_path
+        self.exporter = None
+        # İşçi sayısı, öncelik ve okuma hızı sınırları (paylaşılan sunucular için)
+        self.limits = limits or ResourceLimits()
+        self._reported_backoff = 0.0
+        # Uzun aramaların ilerlemesi aralıklarla kaydedilir, yarıda kalırsa devam edilir
+        self.resumable = options.resumable
+        # Dosyalar disk yerleşimine göre sırayla okunur, işçiler bellekteki içeriği ayrıştırır
+        self.sequential_io = options.sequential_io
+        # Dosyaların n-gram imzalarıyla kesinlikle eşleşmeyenler metin çıkarılmadan elenir
+        self.use_signatures = options.use_signatures
+        # Doluysa arama iş parçacığı ve işçiler profillenir, iz dosyaları bu önekle yazılır
+        self.trace = SearchTrace(options.trace_path) if options.trace_path else None
         self._stop_requested = False
 
     def run(self):
+        if self.trace is None:
+            self._run()
+            return
+        try:
+            with self.trace.main.profiling():
+                self._run()
+        finally:
+            # İz finish() içinde yazılır; arama erken bittiyse işçi klasörü burada silinir
+            self.trace.discard()
+
+    def phase(self, name, **args):
+        """İz kaydı açıksa aramanın bir aşamasını zaman çizelgesine ekler"""
+        return self.trace.main.span(name, **args) if self.trace is not None else nullcontext({})
+
+    def _run(self):
         self.arama_durumu.emit("Arama yapılıyor...")
-        keyword_list = [k.strip() for k in self.keywords.split(',') if k.strip()]
+        keyword_list = parse_keywords(self.keywords, self.use_regex)
         if not keyword_list:
             self.arama_durumu.emit("Lütfen aranacak kelimeleri girin.")
             self.arama_bitti.emit(0)
             return
+        # Sorgu arama başına bir kez derlenir
+        try:
+            query = CompiledQuery(keyword_list, self.match_type, self.case_sensitive, self.use_regex, self.max_errors,
+                                  self.ignore_diacritics)
+        except re.error as e:
+            self.arama_durumu.emit(f"Geçersiz düzenli ifade: {e}")
+            self.arama_bitti.emit(0)
+            return
         if not self.extensions:
             self.arama_durumu.emit("Lütfen en az bir dosya türü seçin.")
             self.arama_bitti.emit(0)
             return
-        # 1. Tüm dosya yollarını topla ve kategorilere ayır
-        txt_files, office_files, pdf_files = [], [], []
-        for root, dirs, files in os.walk(self.directory):
+        if not self.open_export():
+            return
+        if self.remote_workers:
+            collector = TopKCollector(self.top_k, BM25Scorer(keyword_list, 0)) if self.top_k else None
+            with self.phase('Uzak arama', servers=len(self.remote_workers)):
+                toplam_bulunan = self.search_remote(collector)
+            self.finish(toplam_bulunan, collector)
+            return
+        # Aynı sorgu bu klasörde yarıda kaldıysa kontrol noktasından devam edilir
+        checkpoint = None
+        if self.resumable:
+            checkpoint = ScanCheckpoint.load(
+                checkpoint_key(query_cache_key(query, self.extensions, self.roots), self.walk_options),
+                self.roots)
+        entries = []
+        walked = set()
+        resume = None
+        if checkpoint is not None and checkpoint.walk_started:
+            self.arama_durumu.emit("Yarıda kalan arama kaldığı yerden sürdürülüyor...")
+            entries = checkpoint.file_entries()
+            walked = set(checkpoint.walked)
+            resume = checkpoint.frontier
+            self.aliases = checkpoint.aliases
+        # 1. Tüm dosya yollarını topla
+        snapshot = None
+        if checkpoint is None or not checkpoint.walk_done:
+            snapshot = DirectorySnapshot.load(follow_symlinks=self.walk_options.follow_symlinks) if self.use_snapshot else None
+            walker = DirectoryWalker(self.walk_options, should_stop=lambda: self._stop_requested, snapshot=snapshot)
+            previous_aliases = self.aliases
+
+            def aliases():
+                merged = {path: list(paths) for path, paths in previous_aliases.items()}
+                for path, paths in walker.aliases.items():
+                    merged.setdefault(path, []).extend(paths)
+                return merged
+
+            with self.phase('Klasör tarama') as phase:
+                for entry in walker.walk(self.roots, resume=resume, known=entries):
+                    # Devam eden taramada sınırdaki klasörler yeniden listelenebilir
+                    if entry.path in walked:
+                        continue
+                    walked.add(entry.path)
+                    ext = os.path.splitext(entry.path)[1].lower()
+                    if ext in self.extensions:
+                        entries.append(entry)
+                    if checkpoint is not None and checkpoint.due():
+                        checkpoint.record_walk(walker.frontier, entries, walked, aliases())
+                phase['files'] = len(entries)
+            self.aliases = aliases()
             if self._stop_requested:
-                self.arama_durumu.emit("Arama iptal edildi.")
-                self.arama_bitti.emit(0)
+                if checkpoint is not None:
+                    checkpoint.record_walk(walker.frontier, entries, walked, self.aliases)
+                self.finish(0, None)
                 return
-            for file in files:
-                file_path = os.path.join(root, file)
-                ext = os.path.splitext(file_path)[1].lower()
-                if ext not in self.extensions:
-                    continue
-                if ext in TXT_EXTS:
-                    txt_files.append(file_path)
-                elif ext in OFFICE_EXTS:
-                    office_files.append(file_path)
-                elif ext in PDF_EXTS:
-                    pdf_files.append(file_path)
-        # 2. Paralel arama fonksiyonu
-        def parallel_search(file_list):
-            found = []
-            if not file_list:
-                return found
-            with Pool(processes=max(1, multiprocessing.cpu_count()-1)) as pool:
-                args = [(fp, keyword_list, self.extensions, self.case_sensitive, self.match_type) for fp in file_list]
-                for result in pool.imap_unordered(file_search_worker, args):
+            if checkpoint is not None:
+                checkpoint.record_walk({}, entries, walked, self.aliases, done=True)
+        if snapshot is not None:
+            snapshot.save()
+            self.arama_durumu.emit(f"Arama yapılıyor... ({snapshot.hits} klasör önbellekten, {snapshot.misses} klasör diskten okundu)")
+        # En iyi K sonuç isteniyorsa sonuçlar puanlanıp sınırlı bir heap'te tutulur
+        collector = None
+        if self.top_k:
+            collector = TopKCollector(self.top_k, BM25Scorer(keyword_list, len(entries)))
+        index_patterns = query.index_patterns() if self.use_index else None
+        if index_patterns is not None:
+            toplam_bulunan = self.search_with_index(entries, walked, query, index_patterns, collector, checkpoint)
+        else:
+            if self.use_index:
+                self.arama_durumu.emit("Bu sorgu indeksle cevaplanamıyor, dosyalar taranıyor...")
+            with self.phase('Dosya arama', files=len(entries)):
+                toplam_bulunan = self.search_files(entries, query, collector, checkpoint, walked)
+        if checkpoint is not None and not self._stop_requested:
+            checkpoint.remove()
+        self.finish(toplam_bulunan, collector)
+
+    def open_export(self):
+        """Dışa aktarma dosyasını açar; açılamazsa aramayı bitirip False döndürür"""
+        if not self.export_path:
+            return True
+        try:
+            self.exporter = ResultExporter(self.export_path)
+        except (OSError, ValueError, RuntimeError) as e:
+            self.arama_durumu.emit(f"Dışa aktarma dosyası açılamadı: {e}")
+            self.arama_bitti.emit(0)
+            return False
+        return True
+
+    def trace_dir(self):
+        """İz kaydı açıksa işçilerin profil ve olaylarını yazacağı klasör"""
+        return self.trace.work_dir if self.trace is not None else None
+
+    def join_traced(self, pool):
+        """İz kaydı açıksa havuzu kapatıp işçilerin kalan kayıtlarını yazmasını bekler"""
+        if self.trace is not None:
+            pool.close()
+            pool.join()
+
+    def finish(self, toplam_bulunan, collector):
+        """Puanlanmış sonuçları gönderir ve aramanın bittiğini bildirir"""
+        ranked = []
+        if collector is not None:
+            ranked = collector.results()
+            for hit in ranked:
+                toplam_bulunan += self.emit_hit(hit)
+        export_note = ""
+        if self.exporter is not None:
+            try:
+                self.exporter.close()
+                export_note = f" {self.exporter.rows} sonuç {self.export_path} dosyasına yazıldı."
+            except Exception as e:
+                export_note = f" Dışa aktarma tamamlanamadı: {e}"
+        if self.failed_workers:
+            export_note += f" Hata veren sunucular: {', '.join(self.failed_workers)} (sonuçlar eksik olabilir)."
+        if self.trace is not None:
+            try:
+                paths = self.trace.write()
+                export_note += f" İz kaydı: {os.path.dirname(paths[0])} ({', '.join(os.path.basename(p) for p in paths)})"
+            except Exception as e:
+                export_note += f" İz kaydı yazılamadı: {e}"
+        if self._stop_requested:
+            self.arama_durumu.emit("Arama iptal edildi." + export_note)
+        elif collector is not None:
+            self.arama_durumu.emit(f"Arama tamamlandı. {collector.seen} eşleşmeden en iyi {len(ranked)} tanesi gösteriliyor." + export_note)
+        else:
+            self.arama_durumu.emit(f"Arama tamamlandı. {toplam_bulunan} dosya bulundu." + export_note)
+        self.arama_bitti.emit(toplam_bulunan)
+
+    def search_files(self, entries, query, collector, checkpoint=None, walked=None):
+        """Dosyaları işçi süreçlerde tarar, gösterilen dosya sayısını döndürür"""
+        toplam_bulunan = 0
+        # Aynı sorgu daha önce çalıştıysa (veya yarıda kaldıysa) yalnızca yeni ve değişmiş dosyalar aranır
+        cache = cache_key = kept = None
+        if self.use_result_cache or checkpoint is not None:
+            previous = CachedResult()
+            if self.use_result_cache:
+                cache = QueryResultCache()
+                cache_key = query_cache_key(query, self.extensions, self.roots)
+                previous = cache.load(cache_key)
+            if checkpoint is not None:
+                previous.update(checkpoint.results)
+            kept, entries = previous.partition(entries)
+            for hit in kept.iter_hits():
+                alternates = self.alternate_paths(hit['file_path'])
+                if alternates:
+                    hit['duplicates'] = alternates
+                toplam_bulunan += self.accept(hit, collector)
+            if kept.files:
+                self.arama_durumu.emit(f"Arama yapılıyor... {len(kept.files)} dosyanın sonucu önceki aramadan alındı, "
+                                       f"{len(entries)} dosya aranıyor")
+        # İmzası sorgunun hiçbir anahtar kelimesinin n-gramlarını içermeyen dosyalar açılmadan atlanır
+        signatures = None
+        if self.use_signatures:
+            signatures = SignatureStore.load()
+            ngram_query = NgramQuery(query)
+            if ngram_query.usable and len(signatures):
+                remaining = []
+                for entry in entries:
+                    signature = signatures.get(entry)
+                    if signature is None or ngram_query.may_match(signature):
+                        remaining.append(entry)
+                    elif kept is not None:
+                        kept.record(entry, [])
+                if len(remaining) < len(entries):
+                    self.arama_durumu.emit(f"Arama yapılıyor... {len(entries) - len(remaining)} dosya n-gram imzasıyla "
+                                           f"elendi, {len(remaining)} dosya aranıyor")
+                entries = remaining
+        entry_by_path = {entry.path: entry for entry in entries}
+        # Aynı içerikli dosyalardan yalnızca biri taranır, sonuç kopyalara dağıtılır
+        kopyalar = {}
+        if self.deduplicate:
+            self.arama_durumu.emit("Aynı içerikli dosyalar belirleniyor...")
+            kopyalar = group_duplicates(entries, should_stop=lambda: self._stop_requested)
+            file_paths = list(kopyalar)
+        else:
+            file_paths = [entry.path for entry in entries]
+        files = [(fp, entry_by_path[fp].size) for fp in file_paths
+                 if os.path.splitext(fp)[1].lower() in SEARCHED_EXTS]
+        if collector is not None:
+            # IDF için taranan (kopyaları ayıklanmış) dosya sayısı kullanılır
+            collector.scorer.total_documents = max(1, len(file_paths) + (len(kept.files) if kept else 0))
+        # 2. Paralel arama: sorgu işçilere bir kez gönderilir, dosyalar gruplar halinde aranır
+        if files and not self._stop_requested:
+            governor = ResourceGovernor(self.limits)
+            processes = governor.worker_count()
+            with governor, search_pool(query, self.extensions, processes, governor.throttle,
+                                       signatures is not None, self.trace_dir()) as pool:
+                if self.sequential_io:
+                    batches = sequential_batches((entry_by_path[fp] for fp, _ in files), processes,
+                                                 lambda: self._stop_requested, governor.throttle)
+                    tasks = pool.imap_unordered(search_bytes_task, batches)
+                else:
+                    tasks = pool.imap_unordered(search_batch_task, plan_batches(files, processes))
+                for results in tasks:
                     if self._stop_requested:
                         pool.terminate()
                         break
-                    if result:
-                        self.dosya_bulundu.emit(result)
-                        found.append(result)
-            return found
+                    self.report_backoff(governor)
+                    for file_path, result, signature in results:
+                        if signature is not None and signatures is not None:
+                            for path in (file_path, *kopyalar.get(file_path, ())):
+                                signatures.put(entry_by_path[path], signature)
+                        if kept is not None:
+                            kept.record(entry_by_path[file_path], result)
+                            for kopya in kopyalar.get(file_path, ()):
+                                kept.record(entry_by_path[kopya], [hit_for_copy(hit, file_path, kopya) for hit in result])
+                        for hit in result:
+                            alternates = self.alternate_paths(hit['file_path'], kopyalar)
+                            if alternates:
+                                hit['duplicates'] = alternates
+                            toplam_bulunan += self.accept(hit, collector)
+                    if checkpoint is not None and checkpoint.due():
+                        checkpoint.record_results(kept)
+                else:
+                    self.join_traced(pool)
+        if signatures is not None:
+            if walked is not None:
+                signatures.prune(self.roots, walked)
+            signatures.save()
+        if cache is not None:
+            # Yarıda kesilen aramada yalnızca tamamlanan dosyalar kaydedilmiştir
+            cache.store(cache_key, kept)
+        if checkpoint is not None and self._stop_requested:
+            checkpoint.record_results(kept)
+        return toplam_bulunan
+
+    def search_remote(self, collector):
+        """
+        Sorguyu uzak arama sunucularına gönderip akan sonuçları birleştirir;
+        gösterilen dosya sayısını döndürür.
+        """
+        params = {
+            'keywords': self.keywords,
+            'extensions': list(self.extensions),
+            'match_type': self.match_type,
+            'case_sensitive': self.case_sensitive,
+            'use_regex': self.use_regex,
+            'max_errors': self.max_errors,
+            'ignore_diacritics': self.ignore_diacritics,
+            'exclude_patterns': list(self.walk_options.exclude_patterns),
+            'same_filesystem': self.walk_options.same_filesystem,
+        }
+        coordinator = SearchCoordinator(self.remote_workers)
+        toplam_bulunan = 0
+        toplam_dosya = 0
+        aranan = {}
+        for worker, event in coordinator.search(params, should_stop=lambda: self._stop_requested):
+            kind = event.get('type')
+            if kind == 'hit':
+                toplam_bulunan += self.accept(event['hit'], collector)
+            elif kind == 'total':
+                # IDF için tüm sunuculardaki dosya sayısı kullanılır
+                toplam_dosya += event['files']
+                if collector is not None:
+                    collector.scorer.total_documents = max(1, toplam_dosya)
+            elif kind == 'progress':
+                aranan[worker.label] = event['searched']
+                self.arama_durumu.emit(f"Arama yapılıyor... {sum(aranan.values())} dosya arandı "
+                                       f"({len(self.remote_workers)} sunucu)")
+            elif kind == 'error':
+                if worker.label not in self.failed_workers:
+                    self.failed_workers.append(worker.label)
+                self.arama_durumu.emit(f"{worker.label} sunucusunda hata: {event.get('message')}")
+        return toplam_bulunan
+
+    def search_with_index(self, entries, walked, query, patterns, collector, checkpoint=None):
+        """
+        Konumsal indeksi değişen dosyalar için günceller ve sorguyu konum
+        listeleriyle cevaplar; gösterilen dosya sayısını döndürür.
+
+        Her kök dizinin kendi indeksi vardır; dosyalar bulundukları köke
+        (iç içe köklerde en derindekine) göre dağıtılır.
+        """
         toplam_bulunan = 0
-        for file_list in [txt_files, office_files, pdf_files]:
+        for root in self.roots:
+            root_entries = [entry for entry in entries if root_of(entry.path, self.roots) == root]
+            with self.phase('İndeks', root=root, files=len(root_entries)):
+                toplam_bulunan += self.search_root_index(root, root_entries, walked, query, patterns, collector,
+                                                         checkpoint)
             if self._stop_requested:
                 break
-            bulunanlar = parallel_search(file_list)
-            toplam_bulunan += len(bulunanlar)
+        return toplam_bulunan
+
+    def search_root_index(self, root, entries, walked, query, patterns, collector, checkpoint=None):
+        """
+        Bir kökün indeksiyle arar.
+
+        Kontrol noktası açıksa indeks güncellemesi aralıklarla diske
+        işlenir; yarıda kalırsa indekslenmiş dosyalar yeniden okunmaz.
+        """
+        index = PositionalIndex.load(root)
+        index.prune(walked)
+        stale = {entry.path: entry for entry in entries if not index.is_current(entry.path, entry.mtime, entry.size)}
+        if stale:
+            self.arama_durumu.emit(f"İndeks güncelleniyor... ({len(stale)} dosya)")
+            governor = ResourceGovernor(self.limits)
+            processes = governor.worker_count()
+            # Küçük dosyalar işçilere tek tek değil, gruplar halinde gönderilir
+            chunksize = index_chunksize(len(stale), processes)
+            with governor, index_pool(processes, governor.throttle, self.trace_dir()) as pool:
+                if self.sequential_io:
+                    reader = prefetch_reader(stale.values(), lambda: self._stop_requested, governor.throttle)
+                    tasks = pool.imap_unordered(index_bytes_task, reader, chunksize)
+                else:
+                    tasks = pool.imap_unordered(index_worker, list(stale), chunksize)
+                for done, (file_path, documents) in enumerate(tasks, 1):
+                    if self._stop_requested:
+                        pool.terminate()
+                        break
+                    self.report_backoff(governor)
+                    if documents is not None:
+                        entry = stale[file_path]
+                        index.add_source(file_path, entry.mtime, entry.size, documents)
+                    if done % 100 == 0:
+                        self.arama_durumu.emit(f"İndeks güncelleniyor... {done}/{len(stale)}")
+                    if checkpoint is not None and checkpoint.due():
+                        index.save()
+                        checkpoint.save()
+                else:
+                    self.join_traced(pool)
+        # Yarıda kesilse bile tamamlanan dosyalar ve silinen dosyalar kaydedilir
+        index.save()
         if self._stop_requested:
-            self.arama_durumu.emit("Arama iptal edildi.")
+            index.close()
+            return 0
+        allowed = {entry.path for entry in entries}
+        fold = query.folder.fold_str if query.ignore_diacritics else None
+        toplam_bulunan = 0
+        for doc_path, mtime, token_count, frequencies in index.search(patterns, fold):
+            # İndeks seçili olmayan türleri ve filtre dışı kalan dosyaları da içerebilir
+            if archive_outer_path(doc_path) not in allowed:
+                continue
+            if os.path.splitext(doc_path)[1].lower() not in self.extensions:
+                continue
+            tf = dict(zip(query.keywords, frequencies))
+            hit = {
+                'file_path': doc_path,
+                'file_name': os.path.basename(doc_path),
+                'file_type': os.path.splitext(doc_path)[1].lower(),
+                'found_keywords': [k for k, n in tf.items() if n],
+                'term_frequencies': tf,
+                'doc_length': token_count,
+                'mtime': mtime,
+                'name_match': filename_matches(query, doc_path),
+            }
+            alternates = self.alternate_paths(doc_path)
+            if alternates:
+                hit['duplicates'] = alternates
+            if self.exporter is not None:
+                # İndeks satır bilgisi tutmaz; dışa aktarılacak satırlar için metin yeniden okunur
+                hit['lines'] = self.read_lines(query, doc_path)
+            toplam_bulunan += self.accept(hit, collector)
+        index.close()
+        return toplam_bulunan
+
+    def report_backoff(self, governor):
+        """Uyarlamalı kaynak sınırı aramayı yavaşlattığında veya yeniden hızlandırdığında bildirir"""
+        backoff = governor.backoff
+        if backoff == self._reported_backoff:
+            return
+        self._reported_backoff = backoff
+        if backoff:
+            self.arama_durumu.emit(f"Sistem yükü yüksek, arama yavaşlatıldı (dosya başına {backoff:.2f} sn bekleme)")
         else:
-            self.arama_durumu.emit(f"Arama tamamlandı. {toplam_bulunan} dosya bulundu.")
-        self.arama_bitti.emit(toplam_bulunan)
+            self.arama_durumu.emit("Sistem yükü normale döndü, arama tam hızda sürüyor")
+
+    def read_lines(self, query, file_path):
+        """Dosyadaki eşleşen satırlar (okunamazsa boş liste)"""
+        try:
+            content = read_file_text(file_path)
+        except Exception:
+            return []
+        if not content:
+            return []
+        return match_lines(content, query.find_spans(content), query.keywords)
+
+    def accept(self, hit, collector):
+        """
+        Sonucu dışa aktarır, ardından puanlamaya ya da doğrudan arayüze
+        gönderir; gösterilen dosya sayısını döndürür.
+        """
+        if self.exporter is not None:
+            try:
+                self.exporter.write(hit)
+            except Exception as e:
+                self.arama_durumu.emit(f"Dışa aktarma durduruldu: {e}")
+                exporter, self.exporter = self.exporter, None
+                try:
+                    exporter.close()
+                except Exception:
+                    pass
+        if collector is None:
+            return self.emit_hit(hit)
+        collector.add(hit)
+        if collector.seen % 50 == 0:
+            self.arama_durumu.emit(f"Arama yapılıyor... {collector.seen} eşleşme puanlandı")
+        return 0
+
+    def alternate_paths(self, hit_path, kopyalar=None):
+        """
+        Sonucun diğer yolları: aynı içerikli kopyalar ve aynı dosyaya giden
+        yollar (sabit bağlantı, örtüşen kök). Arşiv üyeleri için diğer
+        arşivdeki aynı üyenin yolu üretilir.
+        """
+        source = archive_outer_path(hit_path)
+        paths = list(self.aliases.get(source, ()))
+        for kopya in (kopyalar or {}).get(source, ()):
+            paths.append(kopya)
+            paths.extend(self.aliases.get(kopya, ()))
+        return [path + hit_path[len(source):] for path in paths]
+
+    def emit_hit(self, hit):
+        """Sonucu ve varsa kopyalarını arayüze gönderir, gösterilen dosya sayısını döndürür"""
+        self.dosya_bulundu.emit(hit['file_path'], hit.get('lines'))
+        kopyalar = hit.get('duplicates')
+        if kopyalar:
+            self.kopyalar_bulundu.emit(hit['file_path'], kopyalar)
+            return 1 + len(kopyalar)
+        return 1
+
+    def stop(self):
+        self._stop_requested = True
+
+class IndexMaintenanceThread(QThread):
+    """Konum indeksinin küçük segmentlerini birleştirip silinmiş kayıtları temizler (düşük öncelikli)"""
+    bakim_bitti = pyqtSignal(str)
+
+    def __init__(self, roots):
+        super().__init__()
+        self.roots = roots
+        self._stop_requested = False
+
+    def run(self):
+        for root in self.roots:
+            if self._stop_requested:
+                return
+            self.maintain(root)
+
+    def maintain(self, root):
+        index = PositionalIndex.load(root)
+        try:
+            merges = index.maintain(should_stop=lambda: self._stop_requested)
+            stats = index.stats()
+        except Exception as e:
+            print(f"İndeks bakımı yapılamadı {root}: {str(e)}")
+            return
+        finally:
+            index.close()
+        if merges:
+            self.bakim_bitti.emit(
+                f"İndeks birleştirildi: {stats['segments']} segment, "
+                f"%{stats['dead_ratio'] * 100:.0f} silinmiş kayıt, "
+                f"toplam {stats['reclaimed_bytes'] / (1024 * 1024):.1f} MB geri kazanıldı")
 
     def stop(self):
         self._stop_requested = True
@@ -194,6 +643,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("Dosya İçeriği Arama Motoru")
         self.setGeometry(200, 200, 750, 700)
         self.search_thread = None
+        self.maintenance_thread = None
         self.settings = QSettings("Beyza", "DosyaAramaUygulamasi")
         self.init_ui()
 
@@ -306,12 +756,18 @@ class MainWindow(QMainWindow):
         self.dir_edit = QLineEdit()
         self.dir_edit.setReadOnly(True)
         self.dir_edit.setMinimumHeight(36)
+        self.dir_edit.setToolTip("Birden fazla dizin noktalı virgülle ayrılır; örtüşen dizinlerdeki aynı dosyalar bir kez aranır")
         dir_btn = QPushButton("Dizin Seç")
         dir_btn.setMinimumHeight(36)
         dir_btn.clicked.connect(self.select_directory)
+        add_dir_btn = QPushButton("Dizin Ekle")
+        add_dir_btn.setMinimumHeight(36)
+        add_dir_btn.setToolTip("Aramaya başka bir dizin ekle")
+        add_dir_btn.clicked.connect(self.add_directory)
         dir_layout.addWidget(dir_label)
         dir_layout.addWidget(self.dir_edit)
         dir_layout.addWidget(dir_btn)
+        dir_layout.addWidget(add_dir_btn)
         main_layout.addLayout(dir_layout)
 
         # --- Arama metni ---
@@ -319,6 +775,7 @@ class MainWindow(QMainWindow):
         word_layout.addWidget(QLabel("Aranacak Kelimeler (virgülle ayırın):"))
         self.word_edit = QLineEdit()
         self.word_edit.setMinimumHeight(35)
+        self.word_edit.setToolTip('Virgülle ayırın. Öbek: "fatura tarihi", yakınlık: fatura NEAR/5 ödeme')
         self.word_edit.setStyleSheet("font-size: 15px; padding: 8px; border: 2px solid #ddd; border-radius: 8px; background: white;")
         word_layout.addWidget(self.word_edit)
         main_layout.addLayout(word_layout)
@@ -331,6 +788,18 @@ class MainWindow(QMainWindow):
         self.case_sensitive_cb.setStyleSheet("font-size: 14px; margin: 5px;")
         options_layout.addWidget(self.case_sensitive_cb)
         
+        # Düzenli ifade modu (seçiliyken kelime eşleştirme türü kullanılmaz)
+        self.regex_cb = QCheckBox("Düzenli ifade (regex)")
+        self.regex_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.regex_cb.setToolTip("Arama metninin tamamını tek bir düzenli ifade olarak kullan")
+        options_layout.addWidget(self.regex_cb)
+        
+        # Aksanları yok sayma (ş=s, ç=c, ğ=g, ı=i, ö=o, ü=u)
+        self.diacritics_cb = QCheckBox("Aksanları yok say")
+        self.diacritics_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.diacritics_cb.setToolTip("ş/s, ç/c, ğ/g, ı/i, ö/o, ü/u harflerini eşit say")
+        options_layout.addWidget(self.diacritics_cb)
+        
         # Kelime eşleştirme seçenekleri
         match_group = QGroupBox("Kelime Eşleştirme:")
         match_group.setStyleSheet("QGroupBox { font-weight: bold; font-size: 14px; margin: 5px; } QGroupBox::title { color: #1976d2; }")
@@ -344,6 +813,8 @@ class MainWindow(QMainWindow):
         self.exact_match_rb = QRadioButton("Tam kelime")
         self.starts_with_rb = QRadioButton("Başlangıç")
         self.ends_with_rb = QRadioButton("Bitiş")
+        self.fuzzy_match_rb = QRadioButton("Yaklaşık")
+        self.fuzzy_match_rb.setToolTip("Yazım ve OCR hatalarına toleranslı arama")
         
         # Radio button stilini ayarla
         radio_style = "QRadioButton { font-size: 13px; margin: 2px; min-width: 80px; }"
@@ -351,6 +822,7 @@ class MainWindow(QMainWindow):
         self.exact_match_rb.setStyleSheet(radio_style)
         self.starts_with_rb.setStyleSheet(radio_style)
         self.ends_with_rb.setStyleSheet(radio_style)
+        self.fuzzy_match_rb.setStyleSheet(radio_style)
         
         # Varsayılan olarak normal seçili
         self.normal_match_rb.setChecked(True)
@@ -360,17 +832,156 @@ class MainWindow(QMainWindow):
         self.match_button_group.addButton(self.exact_match_rb, 1)
         self.match_button_group.addButton(self.starts_with_rb, 2)
         self.match_button_group.addButton(self.ends_with_rb, 3)
+        self.match_button_group.addButton(self.fuzzy_match_rb, 4)
+        
+        # Yaklaşık arama için izin verilen hata sayısı
+        self.max_errors_spin = QSpinBox()
+        self.max_errors_spin.setRange(1, 3)
+        self.max_errors_spin.setValue(1)
+        self.max_errors_spin.setPrefix("Hata: ")
+        self.max_errors_spin.setToolTip("Yaklaşık aramada izin verilen en fazla harf hatası")
         
         # Layout'a ekle
         match_layout.addWidget(self.normal_match_rb)
         match_layout.addWidget(self.exact_match_rb)
         match_layout.addWidget(self.starts_with_rb)
         match_layout.addWidget(self.ends_with_rb)
+        match_layout.addWidget(self.fuzzy_match_rb)
+        match_layout.addWidget(self.max_errors_spin)
         
         options_layout.addWidget(match_group)
+        
+        # En iyi K sonuç (0 = tümü, bulundukça listelenir)
+        self.top_k_spin = QSpinBox()
+        self.top_k_spin.setRange(0, 100000)
+        self.top_k_spin.setSingleStep(50)
+        self.top_k_spin.setPrefix("En iyi: ")
+        self.top_k_spin.setSpecialValueText("Tüm sonuçlar")
+        self.top_k_spin.setToolTip("Sonuçları ilgiye göre sırala ve yalnızca en iyi K tanesini göster")
+        options_layout.addWidget(self.top_k_spin)
         options_layout.addStretch()
         main_layout.addLayout(options_layout)
 
+        # --- Tarama filtreleri ---
+        exclude_layout = QHBoxLayout()
+        exclude_label = QLabel("Hariç Tutulacaklar:")
+        exclude_label.setMinimumWidth(120)
+        self.exclude_edit = QLineEdit()
+        self.exclude_edit.setMinimumHeight(32)
+        self.exclude_edit.setToolTip("Virgülle ayrılmış klasör/dosya kalıpları (ör: .git/, node_modules/, *.bak); "
+                                     "'/' ile biten kalıplar yalnızca klasörlere uygulanır")
+        exclude_text = self.settings.value("exclude_patterns", ", ".join(DEFAULT_EXCLUDES))
+        if parse_patterns(exclude_text) == LEGACY_DEFAULT_EXCLUDES:
+            exclude_text = ", ".join(DEFAULT_EXCLUDES)
+        self.exclude_edit.setText(exclude_text)
+        self.same_fs_cb = QCheckBox("Aynı dosya sisteminde kal")
+        self.same_fs_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        exclude_layout.addWidget(exclude_label)
+        exclude_layout.addWidget(self.exclude_edit)
+        exclude_layout.addWidget(self.same_fs_cb)
+        self.snapshot_cb = QCheckBox("Klasör önbelleği")
+        self.snapshot_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.snapshot_cb.setToolTip("Değişmemiş klasörleri yeniden listelemek yerine kayıtlı görüntüden oku "
+                                    "(dosyalar yine stat edilir; Windows'ta listeleme stat bilgisini zaten "
+                                    "verdiğinden kazanç sağlamaz)")
+        self.snapshot_cb.setChecked(self.settings.value("use_snapshot", SNAPSHOT_DEFAULT, type=bool))
+        exclude_layout.addWidget(self.snapshot_cb)
+        self.dedup_cb = QCheckBox("Kopyaları bir kez tara")
+        self.dedup_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.dedup_cb.setToolTip("Aynı içerikli dosyaları bir kez okuyup sonucu tüm kopyalara uygula")
+        self.dedup_cb.setChecked(self.settings.value("deduplicate", False, type=bool))
+        exclude_layout.addWidget(self.dedup_cb)
+        self.index_cb = QCheckBox("Konum indeksi")
+        self.index_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.index_cb.setToolTip("Dosyaları bir kez indeksleyip öbek ve NEAR/n sorgularını indeksten cevapla "
+                                 "(yalnızca değişen dosyalar yeniden okunur)")
+        self.index_cb.setChecked(self.settings.value("use_index", False, type=bool))
+        exclude_layout.addWidget(self.index_cb)
+        self.result_cache_cb = QCheckBox("Sonuç önbelleği")
+        self.result_cache_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.result_cache_cb.setToolTip("Aynı sorgu tekrarlandığında yalnızca yeni ve değişmiş dosyaları ara")
+        self.result_cache_cb.setChecked(self.settings.value("use_result_cache", True, type=bool))
+        exclude_layout.addWidget(self.result_cache_cb)
+        self.resume_cb = QCheckBox("Kaldığı yerden devam")
+        self.resume_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.resume_cb.setToolTip("Aramanın ilerlemesini aralıklarla kaydet; uygulama kapanır veya arama durdurulursa "
+                                  "aynı sorgu aynı klasörde yeniden çalıştırıldığında kaldığı yerden sürdür")
+        self.resume_cb.setChecked(self.settings.value("resumable", True, type=bool))
+        exclude_layout.addWidget(self.resume_cb)
+        self.signature_cb = QCheckBox("N-gram imzaları")
+        self.signature_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.signature_cb.setToolTip("Aranan dosyaların küçük n-gram imzalarını sakla; sonraki aramalarda aranan "
+                                     "kelimeleri kesinlikle içermeyen dosyaları açmadan atla")
+        self.signature_cb.setChecked(self.settings.value("use_signatures", False, type=bool))
+        exclude_layout.addWidget(self.signature_cb)
+        main_layout.addLayout(exclude_layout)
+
+        # --- Uzak arama sunucuları ---
+        remote_layout = QHBoxLayout()
+        remote_label = QLabel("Uzak Sunucular:")
+        remote_label.setMinimumWidth(120)
+        self.remote_edit = QLineEdit()
+        self.remote_edit.setMinimumHeight(32)
+        self.remote_edit.setPlaceholderText("Boş bırakılırsa seçili klasörde aranır")
+        self.remote_edit.setToolTip("Virgülle ayrılmış arama sunucuları: [anahtar@]sunucu:port[=yerel kök] "
+                                    "(sunucular 'python distributed.py serve --root KLASÖR' ile başlatılır)")
+        self.remote_edit.setText(self.settings.value("remote_workers", ""))
+        remote_layout.addWidget(remote_label)
+        remote_layout.addWidget(self.remote_edit)
+        main_layout.addLayout(remote_layout)
+
+        # --- Kaynak sınırları (paylaşılan sunucularda diğer servisleri yormamak için) ---
+        limits_layout = QHBoxLayout()
+        limits_label = QLabel("Kaynak Sınırları:")
+        limits_label.setMinimumWidth(120)
+        limits_layout.addWidget(limits_label)
+        self.max_workers_spin = QSpinBox()
+        self.max_workers_spin.setRange(0, multiprocessing.cpu_count())
+        self.max_workers_spin.setPrefix("İşçi: ")
+        self.max_workers_spin.setSpecialValueText("İşçi: otomatik")
+        self.max_workers_spin.setToolTip("Aynı anda çalışacak en fazla arama süreci (otomatik: çekirdek sayısı - 1)")
+        self.max_workers_spin.setValue(self.settings.value("max_workers", 0, type=int))
+        limits_layout.addWidget(self.max_workers_spin)
+        self.read_limit_spin = QSpinBox()
+        self.read_limit_spin.setRange(0, 10000)
+        self.read_limit_spin.setSuffix(" MB/sn")
+        self.read_limit_spin.setSpecialValueText("Okuma: sınırsız")
+        self.read_limit_spin.setToolTip("Tüm işçilerin toplam disk okuma hızı sınırı")
+        self.read_limit_spin.setValue(self.settings.value("read_limit_mb", 0, type=int))
+        limits_layout.addWidget(self.read_limit_spin)
+        self.heavy_spin = QSpinBox()
+        self.heavy_spin.setRange(0, 64)
+        self.heavy_spin.setPrefix("Ağır dosya: ")
+        self.heavy_spin.setSpecialValueText("Ağır dosya: sınırsız")
+        self.heavy_spin.setToolTip("Aynı anda ayrıştırılacak en fazla PDF/Office/arşiv dosyası")
+        self.heavy_spin.setValue(self.settings.value("max_heavy_parses", 0, type=int))
+        limits_layout.addWidget(self.heavy_spin)
+        self.low_priority_cb = QCheckBox("Düşük öncelik")
+        self.low_priority_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.low_priority_cb.setToolTip("Arama süreçlerini düşük CPU (nice) ve boşta disk (ionice) önceliğiyle çalıştır")
+        self.low_priority_cb.setChecked(self.settings.value("low_priority", False, type=bool))
+        limits_layout.addWidget(self.low_priority_cb)
+        self.adaptive_cb = QCheckBox("Yüke göre yavaşla")
+        self.adaptive_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.adaptive_cb.setToolTip("Sistem yükü veya disk bekleme oranı yükseldiğinde dosyalar arasında bekle")
+        self.adaptive_cb.setChecked(self.settings.value("adaptive_throttle", False, type=bool))
+        limits_layout.addWidget(self.adaptive_cb)
+        self.sequential_io_cb = QCheckBox("Sıralı disk okuma")
+        self.sequential_io_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.sequential_io_cb.setToolTip("Dosyaları diskteki yerleşim sırasıyla az sayıda okuyucuyla oku; "
+                                         "döner disklerde ve ağ paylaşımlarında (NAS) hızlıdır, SSD'de gerekmez")
+        self.sequential_io_cb.setChecked(self.settings.value("sequential_io", False, type=bool))
+        limits_layout.addWidget(self.sequential_io_cb)
+        # Tanı amaçlıdır, aramayı yavaşlattığı için ayarlara kaydedilmez
+        self.trace_cb = QCheckBox("İz kaydı (profil)")
+        self.trace_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.trace_cb.setToolTip("Aramayı ve işçi süreçleri cProfile ile profille; alev grafiği (.folded), "
+                                 "dosya başına zaman çizelgesi (Chrome trace .json) ve birleşik profil (.prof) "
+                                 "önbellek klasöründeki 'izler' klasörüne yazılır")
+        limits_layout.addWidget(self.trace_cb)
+        limits_layout.addStretch()
+        main_layout.addLayout(limits_layout)
+
         # --- Dosya türü seçim kutuları ---
         filetype_layout = QVBoxLayout()
         filetype_layout.setSpacing(6)
@@ -412,6 +1023,9 @@ class MainWindow(QMainWindow):
         self.cb_vsdx = QCheckBox(".vsdx")
         self.cb_vsd = QCheckBox(".vsd")
         filetype_layout.addLayout(section_row("Visio:", [self.cb_vsdx, self.cb_vsd]))
+        # Arşivler
+        self.cb_zip = QCheckBox(".zip")
+        filetype_layout.addLayout(section_row("Arşiv:", [self.cb_zip]))
         main_layout.addLayout(filetype_layout)
 
         # --- Butonlar ---
@@ -424,6 +1038,12 @@ class MainWindow(QMainWindow):
         self.save_btn.setMinimumHeight(40)
         self.save_btn.clicked.connect(self.save_results)
         btn_layout.addWidget(self.save_btn)
+        self.export_cb = QCheckBox("Arama sırasında dışa aktar")
+        self.export_cb.setStyleSheet("font-size: 14px; margin: 5px;")
+        self.export_cb.setToolTip("Tüm sonuçları (anahtar kelimeler, satır numaraları ve satır özetleriyle) "
+                                  "bulundukça CSV, JSONL veya Parquet dosyasına yaz")
+        self.export_cb.setChecked(self.settings.value("stream_export", False, type=bool))
+        btn_layout.addWidget(self.export_cb)
         main_layout.addLayout(btn_layout)
 
         # --- Sonuç listesi ---
@@ -451,9 +1071,14 @@ class MainWindow(QMainWindow):
         sag_widget = QWidget()
         sag_layout = QVBoxLayout(sag_widget)
         sag_layout.addWidget(QLabel("📍 Satır Bilgileri:"))
-        self.satir_bilgileri = QListWidget()
+        self.satir_bilgileri = QTextEdit()
+        self.satir_bilgileri.setReadOnly(True)
         self.satir_bilgileri.setMinimumHeight(150)
         sag_layout.addWidget(self.satir_bilgileri)
+        self.more_lines_btn = QPushButton("Daha Fazla Göster")
+        self.more_lines_btn.setVisible(False)
+        self.more_lines_btn.clicked.connect(self.show_more_lines)
+        sag_layout.addWidget(self.more_lines_btn)
         
         # QSplitter ile iki tarafı ayır
         splitter = QSplitter(Qt.Horizontal)
@@ -482,6 +1107,13 @@ class MainWindow(QMainWindow):
         self.setStyleSheet("QWidget { background: #f4f6fa; } QLabel { font-size: 15px; }")
 
         self._searching = False
+        self.query = None
+        self.text_cache = TextCache()
+        # Dosya yolu -> işçinin döndürdüğü eşleşen satırlar
+        self.hit_lines = {}
+        # Önizlemedeki dosyanın satırları ve gösterilen satır sayısı
+        self.preview_lines = []
+        self.preview_shown = 0
 
     def select_directory(self):
         folder = QFileDialog.getExistingDirectory(self, "Dizin Seç")
@@ -491,6 +1123,16 @@ class MainWindow(QMainWindow):
             # Ayarlara kaydet
             self.settings.setValue("last_directory", folder)
 
+    def add_directory(self):
+        folder = QFileDialog.getExistingDirectory(self, "Dizin Ekle")
+        if folder:
+            roots = parse_roots(self.dir_edit.text())
+            if folder not in roots:
+                roots.append(folder)
+            self.dir_edit.setText("; ".join(roots))
+            self.status_bar.showMessage(f"{len(roots)} dizin seçildi. Aranacak kelimeleri girin.")
+            self.settings.setValue("last_directory", self.dir_edit.text())
+
     def toggle_search(self):
         if not self._searching:
             self.start_search()
@@ -498,7 +1140,7 @@ class MainWindow(QMainWindow):
             self.stop_search()
 
     def start_search(self):
-        directory = self.dir_edit.text().strip()
+        directory = parse_roots(self.dir_edit.text())
         keywords = self.word_edit.text().strip()
         extensions = []
         
@@ -549,8 +1191,17 @@ class MainWindow(QMainWindow):
             extensions.append('.vsdx')
         if self.cb_vsd.isChecked():
             extensions.append('.vsd')
+            
+        # Arşivler (içlerindeki dosyalar yukarıda seçilen türlere göre aranır)
+        if self.cb_zip.isChecked():
+            extensions.append('.zip')
 
-        if not directory:
+        try:
+            remote_workers = parse_workers(self.remote_edit.text())
+        except ValueError as e:
+            self.status_bar.showMessage(str(e))
+            return
+        if not directory and not remote_workers:
             self.status_bar.showMessage("Lütfen bir dizin seçin.")
             return
         if not keywords:
@@ -559,9 +1210,24 @@ class MainWindow(QMainWindow):
         if not extensions:
             self.status_bar.showMessage("Lütfen en az bir dosya türü seçin.")
             return
+        export_path = None
+        self.settings.setValue("stream_export", self.export_cb.isChecked())
+        if self.export_cb.isChecked():
+            export_path = self.ask_export_path("Sonuçları Arama Sırasında Dışa Aktar")
+            if not export_path:
+                return
+        use_regex = self.regex_cb.isChecked()
+        try:
+            self.query = CompiledQuery(parse_keywords(keywords, use_regex), self.match_button_group.checkedId(),
+                                       self.case_sensitive_cb.isChecked(), use_regex, self.max_errors_spin.value(),
+                                       self.diacritics_cb.isChecked())
+        except re.error as e:
+            self.status_bar.showMessage(f"Geçersiz düzenli ifade: {e}")
+            return
         self.result_list.clear()
         self.dosya_listesi.clear() # Dosya listesini temizle
-        self.satir_bilgileri.clear() # Satır bilgilerini temizle
+        self.clear_preview()
+        self.hit_lines = {}
         self.status_bar.showMessage("Arama yapılıyor...")
         self.search_btn.setText("Aramayı Durdur")
         self.search_btn.setStyleSheet("background-color: #d32f2f; color: white; font-weight: bold; font-size: 16px; border-radius: 8px;")
@@ -569,8 +1235,62 @@ class MainWindow(QMainWindow):
         self._searching = True
         case_sensitive = self.case_sensitive_cb.isChecked()
         match_type = self.match_button_group.checkedId()
-        self.search_thread = SearchThread(directory, keywords, extensions, case_sensitive, match_type)
+        exclude_text = self.exclude_edit.text()
+        self.settings.setValue("exclude_patterns", exclude_text)
+        limits = ResourceLimits(max_workers=self.max_workers_spin.value(),
+                                nice=10 if self.low_priority_cb.isChecked() else 0,
+                                io_priority=IO_PRIORITY_IDLE if self.low_priority_cb.isChecked() else None,
+                                max_read_bytes_per_sec=self.read_limit_spin.value() * 1024 * 1024,
+                                max_heavy_parses=self.heavy_spin.value(),
+                                adaptive=self.adaptive_cb.isChecked())
+        self.settings.setValue("max_workers", self.max_workers_spin.value())
+        self.settings.setValue("read_limit_mb", self.read_limit_spin.value())
+        self.settings.setValue("max_heavy_parses", self.heavy_spin.value())
+        self.settings.setValue("low_priority", self.low_priority_cb.isChecked())
+        self.settings.setValue("adaptive_throttle", self.adaptive_cb.isChecked())
+        walk_options = WalkOptions(exclude_patterns=parse_patterns(exclude_text),
+                                   same_filesystem=self.same_fs_cb.isChecked())
+        if limits.max_workers:
+            # Klasör tarama iş parçacıkları da aynı sınırla kısılır
+            walk_options.max_workers = min(walk_options.max_workers, limits.max_workers)
+        use_snapshot = self.snapshot_cb.isChecked()
+        self.settings.setValue("use_snapshot", use_snapshot)
+        deduplicate = self.dedup_cb.isChecked()
+        self.settings.setValue("deduplicate", deduplicate)
+        use_index = self.index_cb.isChecked()
+        self.settings.setValue("use_index", use_index)
+        use_result_cache = self.result_cache_cb.isChecked()
+        self.settings.setValue("use_result_cache", use_result_cache)
+        resumable = self.resume_cb.isChecked()
+        self.settings.setValue("resumable", resumable)
+        sequential_io = self.sequential_io_cb.isChecked()
+        self.settings.setValue("sequential_io", sequential_io)
+        use_signatures = self.signature_cb.isChecked()
+        self.settings.setValue("use_signatures", use_signatures)
+        trace_path = None
+        if self.trace_cb.isChecked():
+            trace_path = os.path.join(cache_path('izler'), time.strftime('arama-%Y%m%d-%H%M%S'))
+        self.settings.setValue("remote_workers", self.remote_edit.text())
+        options = SearchOptions(case_sensitive=case_sensitive,
+                                match_type=match_type,
+                                use_regex=use_regex,
+                                max_errors=self.max_errors_spin.value(),
+                                ignore_diacritics=self.diacritics_cb.isChecked(),
+                                top_k=self.top_k_spin.value(),
+                                use_snapshot=use_snapshot,
+                                deduplicate=deduplicate,
+                                use_index=use_index,
+                                use_result_cache=use_result_cache,
+                                resumable=resumable,
+                                sequential_io=sequential_io,
+                                use_signatures=use_signatures,
+                                remote_workers=remote_workers,
+                                export_path=export_path,
+                                trace_path=trace_path)
+        self.search_thread = SearchThread(directory, keywords, extensions, options=options,
+                                          walk_options=walk_options, limits=limits)
         self.search_thread.dosya_bulundu.connect(self.add_result)
+        self.search_thread.kopyalar_bulundu.connect(self.add_duplicates)
         self.search_thread.arama_bitti.connect(self.search_finished)
         self.search_thread.arama_durumu.connect(self.status_bar.showMessage)
         self.search_thread.start()
@@ -581,12 +1301,14 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("Arama iptal ediliyor...")
             self.search_btn.setEnabled(False)
 
-    def add_result(self, file_path):
+    def add_result(self, file_path, lines=None):
         self.result_list.addItem(file_path)
         
-        # Dosya içeriğini okuyup satır numaralarını bul
-        keywords = [k.strip() for k in self.word_edit.text().split(',') if k.strip()]
-        satir_numaralari = self.get_satir_numaralari(file_path, keywords)
+        # Satır numaraları işçide bulundu; dosya arayüzde yeniden okunmaz
+        satir_numaralari = []
+        if lines is not None:
+            self.hit_lines[file_path] = lines
+            satir_numaralari = [line['line'] for line in lines]
         
         # Sol tarafa dosyayı ekle (dosya adı + satır numaraları)
         dosya_adi = os.path.basename(file_path)
@@ -603,110 +1325,48 @@ class MainWindow(QMainWindow):
         # İlk bulunan dosyayı otomatik seç
         if self.dosya_listesi.count() == 1:
             self.dosya_listesi.setCurrentRow(0)
+
+    def add_duplicates(self, file_path, kopyalar):
+        """Aynı içerikli kopyaları temsilci dosyanın altında gruplar"""
+        for kopya in kopyalar:
+            item = QListWidgetItem(f"    ↳ {kopya}")
+            item.setData(Qt.UserRole, kopya)
+            self.result_list.addItem(item)
+        
+        # Alt listede temsilci dosyanın satırına kopya sayısını ekle
+        for i in range(self.dosya_listesi.count() - 1, -1, -1):
+            list_item = self.dosya_listesi.item(i)
+            if list_item.data(Qt.UserRole) == file_path:
+                list_item.setText(f"{list_item.text()} [+{len(kopyalar)} kopya]")
+                list_item.setToolTip("Aynı içerikli dosyalar:\n" + "\n".join(kopyalar))
+                break
     
-    def get_satir_numaralari(self, file_path, keywords):
-        """Dosyadaki anahtar kelimelerin bulunduğu satır numaralarını döndürür"""
+    def eslesen_satirlar(self, file_path, extracted=None):
+        """
+        Eşleşmeleri tüm metinde tek geçişte bulur ve satırlara dağıtır.
+
+        Eşleşme konumları, önbellekteki satır başlangıç tablosunda ikili
+        aramayla satır numarasına çevrilir.
+
+        Returns:
+            (ExtractedText veya None, {satır numarası: [anahtar kelimeler]})
+        """
+        if self.query is None:
+            return None, {}
         try:
-            ext = os.path.splitext(file_path)[1].lower()
-            full_content = ""
-            
-            if ext == '.txt':
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    full_content = f.read()
-                    
-            elif ext in ['.docx', '.docm', '.dotx', '.dotm']:
-                try:
-                    from docx import Document
-                    doc = Document(file_path)
-                    paragraphs = []
-                    for p in doc.paragraphs:
-                        if p.text.strip():
-                            paragraphs.append(p.text.strip())
-                    full_content = '\n'.join(paragraphs)
-                except ImportError:
-                    return []
-                    
-            elif ext in ['.xlsx', '.xlsm', '.xltx', '.xltm']:
-                try:
-                    from openpyxl import load_workbook
-                    wb = load_workbook(file_path, data_only=True)
-                    all_cells = []
-                    for sheet in wb.worksheets:
-                        for row in sheet.iter_rows(values_only=True):
-                            for cell in row:
-                                if cell is not None:
-                                    all_cells.append(str(cell))
-                    full_content = '\n'.join(all_cells)
-                except ImportError:
-                    return []
-                    
-            elif ext == '.xlsb':
-                try:
-                    from pyxlsb import open_workbook
-                    all_cells = []
-                    with open_workbook(file_path) as wb:
-                        for sheet_name in wb.get_sheet_names():
-                            with wb.get_sheet(sheet_name) as sheet:
-                                for row in sheet.rows():
-                                    for cell in row:
-                                        if cell.v is not None:
-                                            all_cells.append(str(cell.v))
-                    full_content = '\n'.join(all_cells)
-                except ImportError:
-                    return []
-                    
-            elif ext in ['.pptx', '.pptm', '.ppsx', '.ppsm', '.potx', '.potm']:
-                try:
-                    from pptx import Presentation
-                    prs = Presentation(file_path)
-                    all_text = []
-                    for slide in prs.slides:
-                        for shape in slide.shapes:
-                            if hasattr(shape, "text_frame") and shape.text_frame:
-                                for paragraph in shape.text_frame.paragraphs:
-                                    if paragraph.text.strip():
-                                        all_text.append(paragraph.text.strip())
-                    full_content = '\n'.join(all_text)
-                except ImportError:
-                    return []
-                    
-            elif ext == '.pdf':
-                try:
-                    with fitz.open(file_path) as doc:
-                        all_text = []
-                        for page in doc:
-                            text = page.get_text()
-                            all_text.append(text)
-                        full_content = '\n'.join(all_text)
-                except Exception:
-                    return []
-                    
-            elif ext == '.vsdx':
-                try:
-                    metinler = read_vsdx_text(file_path)
-                    full_content = '\n'.join(metinler)
-                except Exception:
-                    return []
-                    
-            else:
-                return []
-                
-            # Satır numaralarını bul
-            lines = full_content.split('\n')
-            satir_numaralari = []
-            case_sensitive = self.case_sensitive_cb.isChecked()
-            match_type = self.match_button_group.checkedId()
-            
-            for line_num, line in enumerate(lines, 1):
-                for keyword in keywords:
-                    if self.matches_keyword(line, keyword, match_type, case_sensitive):
-                        satir_numaralari.append(line_num)
-                        break  # Bu satırda bir anahtar kelime bulundu, diğerlerine bakmaya gerek yok
-                        
-            return sorted(list(set(satir_numaralari)))  # Tekrarları kaldır ve sırala
-            
+            if extracted is None:
+                extracted = self.text_cache.get(file_path)
+            if extracted is None:
+                return None, {}
+            satirlar = {}
+            for index, start, _ in self.query.find_spans(extracted.text):
+                keywords = satirlar.setdefault(extracted.line_of(start), [])
+                keyword = self.query.keywords[index]
+                if keyword not in keywords:
+                    keywords.append(keyword)
+            return extracted, satirlar
         except Exception:
-            return []
+            return None, {}
 
     def search_finished(self, count):
         if self._searching:
@@ -728,9 +1388,26 @@ class MainWindow(QMainWindow):
         self.search_btn.setStyleSheet("background-color: #1976d2; color: white; font-weight: bold; font-size: 16px; border-radius: 8px;")
         self.search_btn.setEnabled(True)
         self._searching = False
+        # İndeksle yapılan aramadan sonra segmentler arka planda birleştirilir
+        if self.search_thread is not None and self.search_thread.use_index and not self.search_thread.remote_workers:
+            self.start_index_maintenance(self.search_thread.roots)
+
+    def start_index_maintenance(self, roots):
+        if self.maintenance_thread is not None and self.maintenance_thread.isRunning():
+            return
+        self.maintenance_thread = IndexMaintenanceThread(roots)
+        self.maintenance_thread.bakim_bitti.connect(self.status_bar.showMessage)
+        self.maintenance_thread.start(QThread.LowestPriority)
+
+    def closeEvent(self, event):
+        if self.maintenance_thread is not None and self.maintenance_thread.isRunning():
+            self.maintenance_thread.stop()
+            self.maintenance_thread.wait()
+        super().closeEvent(event)
 
     def open_selected_file(self, item):
-        file_path = item.text()
+        # Arşiv üyeleri için arşivin kendisi açılır
+        file_path = archive_outer_path(item.data(Qt.UserRole) or item.text())
         try:
             if platform.system() == "Windows":
                 os.startfile(file_path)
@@ -745,7 +1422,7 @@ class MainWindow(QMainWindow):
         item = self.result_list.itemAt(pos)
         if not item:
             return
-        file_path = item.text()
+        file_path = item.data(Qt.UserRole) or item.text()
         menu = QMenu()
         ac_action = menu.addAction("Dosyayı Aç")
         konum_action = menu.addAction("Dosyanın Konumunu Aç")
@@ -759,6 +1436,7 @@ class MainWindow(QMainWindow):
             self.copy_file_path(file_path)
 
     def open_file_location(self, file_path):
+        file_path = archive_outer_path(file_path)
         try:
             folder = os.path.dirname(file_path)
             if platform.system() == "Windows":
@@ -778,21 +1456,58 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.status_bar.showMessage(f"Kopyalama hatası: {e}")
 
+    def ask_export_path(self, title):
+        """Dışa aktarma dosyasını sorar; biçim kullanılamıyorsa None döndürür"""
+        filters = "CSV Dosyası (*.csv);;JSON Lines (*.jsonl);;Parquet (*.parquet);;Metin Dosyası (*.txt)"
+        path, selected = QFileDialog.getSaveFileName(self, title, self.settings.value("last_export", ""), filters)
+        if not path:
+            return None
+        if not os.path.splitext(path)[1]:
+            # Uzantı yazılmadıysa seçili filtreninki eklenir
+            match = re.search(r'\(\*(\.\w+)\)', selected or "")
+            path += match.group(1) if match else '.csv'
+        try:
+            fmt = export_format(path)
+        except ValueError as e:
+            self.status_bar.showMessage(str(e))
+            return None
+        if fmt == 'parquet' and not parquet_available():
+            self.status_bar.showMessage("Parquet olarak dışa aktarmak için pyarrow yüklü olmalı (pip install pyarrow).")
+            return None
+        self.settings.setValue("last_export", path)
+        return path
+
+    def hit_for_export(self, file_path):
+        """Listedeki dosyanın dışa aktarılacak bilgileri (satırlar önizleme önbelleğinden)"""
+        extracted, satirlar = self.eslesen_satirlar(file_path)
+        keywords = []
+        lines = []
+        for line_num in sorted(satirlar)[:MAX_LINES_PER_FILE]:
+            keywords.extend(k for k in satirlar[line_num] if k not in keywords)
+            lines.append({'line': line_num, 'keywords': satirlar[line_num],
+                          'snippet': line_snippet(extracted.line_text(line_num), 0)})
+        try:
+            mtime = os.path.getmtime(archive_outer_path(file_path))
+        except OSError:
+            mtime = None
+        return {'file_path': file_path, 'found_keywords': keywords, 'lines': lines, 'mtime': mtime}
+
     def save_results(self):
         if self.result_list.count() == 0:
             self.status_bar.showMessage("Kaydedilecek sonuç yok.")
             return
-        path, _ = QFileDialog.getSaveFileName(self, "Sonuçları Kaydet", "", "Metin Dosyası (*.txt);;CSV Dosyası (*.csv)")
+        path = self.ask_export_path("Sonuçları Kaydet")
         if not path:
             return
         try:
-            with open(path, 'w', encoding='utf-8') as f:
+            with ResultExporter(path) as exporter:
                 for i in range(self.result_list.count()):
-                    line = self.result_list.item(i).text()
-                    if path.endswith('.csv'):
-                        f.write(f'"{line}"\n')
+                    item = self.result_list.item(i)
+                    file_path = item.data(Qt.UserRole) or item.text()
+                    if exporter.format == 'txt':
+                        exporter.write({'file_path': file_path})
                     else:
-                        f.write(line + '\n')
+                        exporter.write(self.hit_for_export(file_path))
             self.status_bar.showMessage(f"Sonuçlar kaydedildi: {path}")
         except Exception as e:
             self.status_bar.showMessage(f"Kayıt hatası: {e}")
@@ -801,25 +1516,15 @@ class MainWindow(QMainWindow):
         # Bu fonksiyon artık dosya_secildi tarafından kullanılıyor
         pass
 
-    def show_keyword_locations(self, content, keywords):
-        lines = content.split('\n')
+    def show_keyword_locations(self, content):
+        extracted, satirlar = self.eslesen_satirlar(None, ExtractedText(content))
         result_lines = []
-        case_sensitive = self.case_sensitive_cb.isChecked()
-        match_type = self.match_button_group.checkedId()
         
-        # Her satırı kontrol et ve anahtar kelime varsa satır numarasyla birlikte göster
-        for line_num, line in enumerate(lines, 1):
-            found_keywords = []
-            
-            # Bu satırda hangi anahtar kelimeler var
-            for keyword in keywords:
-                if self.matches_keyword(line, keyword, match_type, case_sensitive):
-                    found_keywords.append(keyword)
-            
-            if found_keywords:
-                # Satır numarası + bulunan kelimeler + içerik
-                keywords_str = ", ".join(found_keywords)
-                result_lines.append(f"[Satır {line_num}] ({keywords_str}): {line.strip()}")
+        # Anahtar kelime bulunan satırları satır numarasıyla birlikte göster
+        for line_num in sorted(satirlar):
+            # Satır numarası + bulunan kelimeler + içerik
+            keywords_str = ", ".join(satirlar[line_num])
+            result_lines.append(f"[Satır {line_num}] ({keywords_str}): {extracted.line_text(line_num).strip()}")
         
         return '\n\n'.join(result_lines) if result_lines else ""
 
@@ -831,171 +1536,71 @@ class MainWindow(QMainWindow):
             if not actual_file_path:
                 return
                 
-            self.satir_bilgileri.clear() # Satır bilgilerini temizle
+            self.clear_preview()
             
-            # Dosya var mı kontrol et
-            if not os.path.exists(actual_file_path):
+            # Dosya var mı kontrol et (arşiv üyelerinde arşivin kendisi)
+            if not os.path.exists(archive_outer_path(actual_file_path)):
                 return
                 
-            keywords = [k.strip() for k in self.word_edit.text().split(',') if k.strip()]
-            
-            if not keywords:
+            if self.query is None:
                 return
                 
-            ext = os.path.splitext(actual_file_path)[1].lower()
-            
-            try:
-                full_content = ""
-                
-                if ext == '.txt':
-                    with open(actual_file_path, 'r', encoding='utf-8') as f:
-                        full_content = f.read()
-                        
-                elif ext in ['.docx', '.docm', '.dotx', '.dotm']:
-                    try:
-                        from docx import Document
-                        doc = Document(actual_file_path)
-                        paragraphs = []
-                        for p in doc.paragraphs:
-                            if p.text.strip():
-                                paragraphs.append(p.text.strip())
-                        full_content = '\n'.join(paragraphs)
-                    except ImportError:
-                        return
-                        
-                elif ext in ['.xlsx', '.xlsm', '.xltx', '.xltm']:
-                    try:
-                        from openpyxl import load_workbook
-                        wb = load_workbook(actual_file_path, data_only=True)
-                        all_cells = []
-                        for sheet in wb.worksheets:
-                            for row in sheet.iter_rows(values_only=True):
-                                for cell in row:
-                                    if cell is not None:
-                                        all_cells.append(str(cell))
-                        full_content = '\n'.join(all_cells)
-                    except ImportError:
-                        return
-                        
-                elif ext == '.xlsb':
-                    try:
-                        from pyxlsb import open_workbook
-                        all_cells = []
-                        with open_workbook(actual_file_path) as wb:
-                            for sheet_name in wb.get_sheet_names():
-                                with wb.get_sheet(sheet_name) as sheet:
-                                    for row in sheet.rows():
-                                        for cell in row:
-                                            if cell.v is not None:
-                                                all_cells.append(str(cell.v))
-                        full_content = '\n'.join(all_cells)
-                    except ImportError:
-                        return
-                        
-                elif ext in ['.pptx', '.pptm', '.ppsx', '.ppsm', '.potx', '.potm']:
-                    try:
-                        from pptx import Presentation
-                        prs = Presentation(actual_file_path)
-                        all_text = []
-                        for slide in prs.slides:
-                            for shape in slide.shapes:
-                                if hasattr(shape, "text_frame") and shape.text_frame:
-                                    for paragraph in shape.text_frame.paragraphs:
-                                        if paragraph.text.strip():
-                                            all_text.append(paragraph.text.strip())
-                        full_content = '\n'.join(all_text)
-                    except ImportError:
-                        return
-                        
-                elif ext == '.pdf':
-                    try:
-                        with fitz.open(actual_file_path) as doc:
-                            all_text = []
-                            for page in doc:
-                                text = page.get_text()
-                                all_text.append(text)
-                            full_content = '\n'.join(all_text)
-                    except Exception:
-                        return
-                        
-                elif ext == '.vsdx':
-                    try:
-                        metinler = read_vsdx_text(actual_file_path)
-                        full_content = '\n'.join(metinler)
-                    except Exception:
+            lines = self.hit_lines.get(actual_file_path)
+            if lines is None:
+                # İndeks aramasında satırlar bilinmez, metin burada bir kez çıkarılıp saklanır
+                try:
+                    extracted = self.text_cache.get(actual_file_path)
+                    if extracted is None:
                         return
-                        
-                else:
+                    lines = match_lines(extracted.text, self.query.find_spans(extracted.text), self.query.keywords)
+                except Exception:
                     return
-                    
-                # Anahtar kelime bulunan satırları bul ve sağ sütuna ekle
-                lines = full_content.split('\n')
-                case_sensitive = self.case_sensitive_cb.isChecked()
-                match_type = self.match_button_group.checkedId()
-                
-                for line_num, line in enumerate(lines, 1):
-                    found_keywords = []
-                    
-                    # Bu satırda hangi anahtar kelimeler var
-                    for keyword in keywords:
-                        if self.matches_keyword(line, keyword, match_type, case_sensitive):
-                            found_keywords.append(keyword)
-                    
-                    if found_keywords:
-                        # Satır numarası ve içeriği göster
-                        if len(line.strip()) > 60:
-                            display_text = f"Satır {line_num}: {line.strip()[:60]}..."
-                        else:
-                            display_text = f"Satır {line_num}: {line.strip()}"
-                        self.satir_bilgileri.addItem(display_text)
-                    
-            except Exception:
-                pass
-
-    def matches_keyword(self, text, keyword, match_type, case_sensitive):
-        """Kelime eşleştirme türüne göre arama yapar"""
-        
-        # Büyük/küçük harf ayarı
-        search_text = text if case_sensitive else text.lower()
-        search_keyword = keyword if case_sensitive else keyword.lower()
-        
-        if match_type == 0:  # Normal arama
-            return search_keyword in search_text
-        elif match_type == 1:  # Tam kelime
-            # Word boundary kullanarak tam kelime ara
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            return bool(re.search(pattern, text, flags))
-        elif match_type == 2:  # Başlangıç
-            # Kelime başında ara
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = r'\b' + re.escape(keyword)
-            return bool(re.search(pattern, text, flags))
-        elif match_type == 3:  # Bitiş
-            # Kelime sonunda ara
-            flags = 0 if case_sensitive else re.IGNORECASE
-            pattern = re.escape(keyword) + r'\b'
-            return bool(re.search(pattern, text, flags))
-        
-        return False
-
-def read_vsdx_text(file_path):
-    metinler = []
-    try:
-        with zipfile.ZipFile(file_path, 'r') as zf:
-            for name in zf.namelist():
-                if name.startswith('visio/pages/page') and name.endswith('.xml'):
-                    try:
-                        data = zf.read(name)
-                        root = ET.parse(io.BytesIO(data)).getroot()
-                        for t in root.iter('{*}t'):
-                            if t.text:
-                                metinler.append(t.text)
-                    except Exception:
-                        continue
-    except zipfile.BadZipFile:
-        pass
-    return metinler
+                self.hit_lines[actual_file_path] = lines
+            
+            # Anahtar kelime bulunan satırlar sayfa sayfa gösterilir
+            self.preview_lines = lines
+            self.show_more_lines()
+
+    def clear_preview(self):
+        self.satir_bilgileri.clear()
+        self.preview_lines = []
+        self.preview_shown = 0
+        self.more_lines_btn.setVisible(False)
+
+    def show_more_lines(self):
+        """Önizlemeye sıradaki eşleşen satırları ekler; anahtar kelimeler işçinin verdiği konumlarla vurgulanır"""
+        page = self.preview_lines[self.preview_shown:self.preview_shown + PREVIEW_PAGE_LINES]
+        cursor = QTextCursor(self.satir_bilgileri.document())
+        cursor.movePosition(QTextCursor.End)
+        normal = QTextCharFormat()
+        label = QTextCharFormat()
+        label.setForeground(QColor("#1976d2"))
+        label.setFontWeight(QFont.Bold)
+        highlight = QTextCharFormat()
+        highlight.setBackground(QColor("#ffe082"))
+        highlight.setFontWeight(QFont.Bold)
+        for item in page:
+            if not cursor.atStart():
+                cursor.insertBlock()
+            cursor.insertText(f"Satır {item['line']}: ", label)
+            snippet = item['snippet']
+            pos = 0
+            for start, end in item.get('matches') or ():
+                if start < pos:
+                    start = pos
+                if start >= end:
+                    continue
+                cursor.insertText(snippet[pos:start], normal)
+                cursor.insertText(snippet[start:end], highlight)
+                pos = end
+            cursor.insertText(snippet[pos:], normal)
+        self.preview_shown += len(page)
+        remaining = len(self.preview_lines) - self.preview_shown
+        self.more_lines_btn.setVisible(remaining > 0)
+        if remaining > 0:
+            self.more_lines_btn.setText(f"Daha Fazla Göster ({remaining} satır daha)")
+        if self.preview_shown == len(page):
+            self.satir_bilgileri.moveCursor(QTextCursor.Start)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
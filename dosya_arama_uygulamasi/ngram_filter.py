@@ -0,0 +1,194 @@
+import os
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app_cache import cache_path, load_pickle, save_pickle
+from normalize import TextFolder
+
+SIGNATURE_VERSION = 1
+NGRAM = 3
+# Bloom filtresi boyutu: n-gram başına ~10 bit ve 4 özet (%1-2 yanlış pozitif);
+# boyut 2'nin kuvvetidir ve MIN_BITS ile MAX_BITS arasında tutulur
+BITS_PER_NGRAM = 10
+HASHES = 4
+MIN_BITS = 256
+MAX_BITS = 64 * 1024
+# Bitlerin yarısından fazlası doluysa imza neredeyse hiçbir dosyayı elemez;
+# böyle dosyalar için boş imza saklanır (her aramada taranır)
+MAX_FILL = 0.5
+
+# İmzalar sorgunun seçeneklerinden bağımsız, en geniş katlamayla oluşturulur:
+# büyük/küçük harf ve aksan duyarlı sorguların parçaları da aynı katlamayla aranır
+_FOLDER = TextFolder(case_sensitive=False, ignore_diacritics=True)
+
+
+def _fold(text: str) -> str:
+    folded = _FOLDER.fold_str(text)
+    # lower() büyük sigmayı kelime sonunda ς'ye çevirir; konumdan bağımsız olsun
+    if 'ς' in folded:
+        folded = folded.replace('ς', 'σ')
+    return folded
+
+
+def text_ngrams(text: str) -> Set[str]:
+    """
+    Metnin katlanmış kelimelerindeki n-gramlar.
+
+    Öbek aramalarında kelimeler arasındaki boşluk serbest olduğundan
+    boşluk içeren n-gramlar alınmaz.
+    """
+    grams = set()
+    for word in _fold(text).split():
+        for i in range(len(word) - NGRAM + 1):
+            grams.add(word[i:i + NGRAM])
+    return grams
+
+
+def _hashes(gram: str) -> Tuple[int, int]:
+    """N-gramın çift özetlemede kullanılan iki özeti (süreçten bağımsız)"""
+    data = gram.encode('utf-8')
+    return zlib.crc32(data), zlib.crc32(data, 0x9E3779B9) | 1
+
+
+def build_signature(text: str) -> bytes:
+    """
+    Çıkarılmış metnin n-gram Bloom filtresi.
+
+    Returns:
+        Filtre baytları; filtre fazla dolduysa boş bayt dizisi
+    """
+    grams = text_ngrams(text)
+    bits = MIN_BITS
+    while bits < len(grams) * BITS_PER_NGRAM and bits < MAX_BITS:
+        bits *= 2
+    mask = bits - 1
+    signature = bytearray(bits // 8)
+    for gram in grams:
+        h1, h2 = _hashes(gram)
+        for i in range(HASHES):
+            bit = (h1 + i * h2) & mask
+            signature[bit >> 3] |= 1 << (bit & 7)
+    if bin(int.from_bytes(signature, 'little')).count('1') > bits * MAX_FILL:
+        return b''
+    return bytes(signature)
+
+
+class NgramQuery:
+    """
+    Sorgunun imzalarla sınanacak biçimi.
+
+    Her anahtar kelime için gerekli parçaların n-gram özetleri bir kez
+    hesaplanır. Bir dosya, en az bir anahtar kelimenin tüm n-gramları
+    imzasında bulunuyorsa eşleşebilir; hiçbiri bulunmuyorsa kesinlikle eşleşmez.
+    """
+
+    def __init__(self, query):
+        """
+        Args:
+            query: CompiledQuery
+        """
+        self._keywords: List[Optional[List[Tuple[int, int]]]] = []
+        for parts in query.required_substrings():
+            grams = set()
+            for part in parts or ():
+                grams |= text_ngrams(part)
+            # N-gramı olmayan (ör. 3 harften kısa) anahtar kelime hiçbir dosyayı eleyemez
+            self._keywords.append([_hashes(gram) for gram in grams] if grams else None)
+
+    @property
+    def usable(self) -> bool:
+        """Sorgu imzalarla dosya eleyebilir mi (her anahtar kelimenin n-gramı var mı)"""
+        return bool(self._keywords) and all(hashes is not None for hashes in self._keywords)
+
+    def may_match(self, signature: bytes) -> bool:
+        """
+        Args:
+            signature: Dosyanın imzası (build_signature)
+
+        Returns:
+            False ise dosya kesinlikle eşleşmez; True ise dosya aranmalıdır
+        """
+        if not signature:
+            return True
+        mask = len(signature) * 8 - 1
+        for hashes in self._keywords:
+            if hashes is None:
+                return True
+            if all(self._contains(signature, mask, h1, h2) for h1, h2 in hashes):
+                return True
+        return False
+
+    @staticmethod
+    def _contains(signature: bytes, mask: int, h1: int, h2: int) -> bool:
+        for i in range(HASHES):
+            bit = (h1 + i * h2) & mask
+            if not signature[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+
+class SignatureStore:
+    """
+    Dosya imzalarının diskteki yan deposu.
+
+    Kayıtlar dosyanın mtime ve boyutuyla doğrulanır; dosya değiştiyse imza
+    kullanılmaz ve dosya bir sonraki aramada yeniden imzalanır.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        # dosya yolu -> (mtime, boyut, imza)
+        self._files: Dict[str, Tuple[float, int, bytes]] = {}
+        self._changed = False
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'SignatureStore':
+        """
+        Depoyu diskten yükler.
+
+        Args:
+            path: Depo dosyası (None ise uygulama önbellek klasörü kullanılır)
+
+        Returns:
+            SignatureStore nesnesi (dosya yoksa veya sürüm farklıysa boş)
+        """
+        path = path or cache_path('ngram_imzalari.pkl')
+        store = cls(path)
+        data = load_pickle(path, {})
+        if data.get('version') == SIGNATURE_VERSION and data.get('ngram') == NGRAM:
+            store._files = data.get('files', {})
+        return store
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def get(self, entry) -> Optional[bytes]:
+        """Dosyanın geçerli imzası; kayıt yoksa veya dosya değiştiyse None"""
+        record = self._files.get(entry.path)
+        if record is None or record[:2] != (entry.mtime, entry.size):
+            return None
+        return record[2]
+
+    def put(self, entry, signature: bytes) -> None:
+        self._files[entry.path] = (entry.mtime, entry.size, signature)
+        self._changed = True
+
+    def prune(self, roots: Iterable[str], seen: Iterable[str]) -> None:
+        """Kök klasörlerin altında olup son taramada görülmeyen dosyaların kayıtlarını siler"""
+        prefixes = tuple(os.path.join(os.path.abspath(root), '') for root in roots)
+        seen = set(seen)
+        for path in list(self._files):
+            if path.startswith(prefixes) and path not in seen:
+                del self._files[path]
+                self._changed = True
+
+    def save(self) -> None:
+        """Değişiklik varsa depoyu diske yazar"""
+        if not self.path or not self._changed:
+            return
+        data = {'version': SIGNATURE_VERSION, 'ngram': NGRAM, 'files': self._files}
+        try:
+            save_pickle(self.path, data)
+            self._changed = False
+        except Exception as e:
+            print(f"N-gram imzaları kaydedilemedi {self.path}: {str(e)}")
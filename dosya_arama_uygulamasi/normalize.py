@@ -0,0 +1,117 @@
+import re
+import unicodedata
+from array import array
+from typing import Optional, Tuple
+
+# Büyük/küçük harf duyarsız aramada I, ı, i ve İ tek harf sayılır: Türkçe
+# metinde "İSTANBUL"/"istanbul", İngilizce metinde "INVOICE"/"invoice" eşleşir.
+# lower() 'İ' harfini iki karaktere (i + birleşen nokta) çevirdiği için önce bu
+# tablo uygulanır. Diğer girdiler re.IGNORECASE'in eşit saydığı özel harflerdir.
+_TR_CASE = str.maketrans({
+    'I': 'i', 'İ': 'i', 'ı': 'i', 'ſ': 's', '\u212a': 'k', '\u212b': 'å', 'µ': 'μ', 'ς': 'σ',
+})
+
+_COMBINING = re.compile('[\u0300-\u036f]')
+
+
+def _build_diacritic_table() -> dict:
+    """Latin harflerini aksansız temel harflerine eşleyen tablo (ı -> i dahil)"""
+    table = {ord('ı'): 'i'}
+    for code in range(0xC0, 0x250):
+        ch = chr(code)
+        base = ''.join(c for c in unicodedata.normalize('NFD', ch) if not unicodedata.combining(c))
+        if len(base) == 1 and base != ch:
+            table[code] = base
+    return table
+
+
+_DIACRITICS = _build_diacritic_table()
+
+
+class FoldedText:
+    """
+    Eşleştirme için normalleştirilmiş metin ve orijinal metne konum eşlemesi.
+
+    Normalleştirme çoğunlukla karakter sayısını korur; bu durumda eşleme
+    tutulmaz (offsets None) ve konumlar aynen geçerlidir. Aksanlar
+    birleşen işaretlerle yazılmışsa silinen işaretler nedeniyle her
+    karakterin orijinal konumu ayrıca saklanır.
+    """
+
+    __slots__ = ('original', 'text', 'offsets')
+
+    def __init__(self, original: str, text: str, offsets: Optional[array] = None):
+        self.original = original
+        self.text = text
+        self.offsets = offsets
+
+    def original_index(self, index: int) -> int:
+        """Normalleştirilmiş metindeki konumu orijinal metindeki konuma çevirir"""
+        if self.offsets is None:
+            return index
+        if index >= len(self.offsets):
+            return len(self.original)
+        return self.offsets[index]
+
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Normalleştirilmiş metindeki [start, end) aralığının orijinal karşılığı"""
+        if self.offsets is None:
+            return start, end
+        if end <= start:
+            orig = self.original_index(start)
+            return orig, orig
+        return self.original_index(start), self.original_index(end - 1) + 1
+
+
+class TextFolder:
+    """Büyük/küçük harf ve aksan kurallarını bir kez belirleyip metinleri katlayan sınıf."""
+
+    def __init__(self, case_sensitive: bool = False, ignore_diacritics: bool = False):
+        """
+        Args:
+            case_sensitive: True ise harf büyüklüğü korunur
+            ignore_diacritics: True ise ş/s, ç/c, ğ/g, ı/i, ö/o, ü/u gibi harfler eşit sayılır
+        """
+        self.case_sensitive = case_sensitive
+        self.ignore_diacritics = ignore_diacritics
+
+    @property
+    def is_identity(self) -> bool:
+        return self.case_sensitive and not self.ignore_diacritics
+
+    def fold_str(self, text: str) -> str:
+        """Anahtar kelimeler gibi kısa metinleri katlar (konum eşlemesi olmadan)"""
+        return self.fold(text).text
+
+    def fold(self, text: str) -> FoldedText:
+        """
+        Metni bir kez katlar.
+
+        Args:
+            text: Orijinal metin
+
+        Returns:
+            FoldedText nesnesi
+        """
+        if self.is_identity:
+            return FoldedText(text, text)
+        folded = text
+        if not self.case_sensitive:
+            folded = folded.translate(_TR_CASE).lower()
+        if self.ignore_diacritics:
+            if _COMBINING.search(folded):
+                return self._fold_with_offsets(text, folded)
+            folded = folded.translate(_DIACRITICS)
+        return FoldedText(text, folded)
+
+    def _fold_with_offsets(self, original: str, folded: str) -> FoldedText:
+        """Birleşen işaretleri siler ve her karakterin orijinal konumunu tutar"""
+        # Buraya gelindiğinde önceki adımlar karakter sayısını korumuştur
+        chars = []
+        offsets = array('I')
+        for i, ch in enumerate(folded):
+            if unicodedata.combining(ch):
+                continue
+            chars.append(_DIACRITICS.get(ord(ch), ch))
+            offsets.append(i)
+        return FoldedText(original, ''.join(chars), offsets)
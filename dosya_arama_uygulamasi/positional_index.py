@@ -0,0 +1,418 @@
+import hashlib
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from app_cache import cache_path, load_pickle, save_pickle
+from index_merge import MergeCancelled, TieredMergePolicy, live_document_counts, merge_segments
+from index_segment import Segment, SegmentWriter, decode_positions, encode_positions
+from normalize import TextFolder
+from proximity import TOKEN_RE, ProximityPattern, Slot, merge_positions
+
+# 4: I/ı/i/İ aynı terime katlanır
+INDEX_VERSION = 4
+MANIFEST_NAME = 'manifest.pkl'
+
+# Birleştirilen segmentlerin eski kaynak numaraları bu süre boyunca çözülebilir;
+# birleştirmeden önce açılmış bir indeksin silme kayıtları yeni segmente aktarılır
+RENAME_TTL = 24 * 3600
+
+_manifest_locks: Dict[str, threading.Lock] = {}
+_manifest_locks_guard = threading.Lock()
+
+# İndeks kelimeleri Türkçe kurallarla küçük harfe katlanmış olarak saklar
+INDEX_FOLDER = TextFolder(case_sensitive=False, ignore_diacritics=False)
+
+# (belge yolu, kelime -> kodlanmış konumlar, kelime sayısı)
+IndexedDocument = Tuple[str, Dict[str, bytes], int]
+
+
+def index_document(text: str) -> Tuple[Dict[str, bytes], int]:
+    """
+    Belgenin kelime konumlarını indeks için hazırlar (işçi süreçlerde çalışır).
+
+    Returns:
+        (kelime -> delta kodlanmış konum listesi, belgedeki kelime sayısı)
+    """
+    positions: Dict[str, List[int]] = {}
+    count = 0
+    for count, term in enumerate(TOKEN_RE.findall(INDEX_FOLDER.fold_str(text)), 1):
+        positions.setdefault(term, []).append(count - 1)
+    return {term: encode_positions(p) for term, p in positions.items()}, count
+
+
+class PositionalIndex:
+    """
+    Bir kök klasör için kelime konumlarını tutan ters indeks.
+
+    İndeks değişmez segment dosyalarından ve küçük bir manifestten oluşur.
+    Segmentler mmap ile açılır; açılışta yalnızca seyrek kelime indeksi ve
+    dosya tablosu okunduğundan bellek kullanımı derlemin boyutuyla değil
+    çalıştırılan sorgularla büyür. Değişen dosyalar yeni bir segmente
+    yazılır, eski kayıtları manifestte silinmiş (tombstone) olarak işaretlenir.
+    Küçük segmentler ve silinmiş kayıtlar arka planda maintain() ile
+    birleştirilip temizlenir. Öbek ve NEAR/n sorguları belgeler yeniden
+    taranmadan konum listelerinin kesişimiyle cevaplanır.
+    """
+
+    # Bellekte biriken konum listeleri bu boyutu aşınca segment diske yazılır
+    FLUSH_BYTES = 32 * 1024 * 1024
+
+    def __init__(self, root: str, directory: Optional[str] = None):
+        self.root = root
+        self.directory = directory
+        self.segments: List[Segment] = []
+        # segment adı -> silinmiş kaynak numaraları
+        self.deleted: Dict[str, Set[int]] = {}
+        # kaynak dosya -> (mtime, boyut, segment adı, segmentteki numarası)
+        self.sources: Dict[str, Tuple[float, int, str, int]] = {}
+        self.reclaimed_bytes = 0
+        self._writer = SegmentWriter()
+        self._pending: Dict[str, Tuple[float, int, int]] = {}
+        # Kaydedilmemiş değişiklikler: yeni segmentler ve silinen (segment, kaynak) çiftleri
+        self._created: List[str] = []
+        self._removed: List[Tuple[str, int]] = []
+
+    @staticmethod
+    def default_directory(root: str) -> str:
+        digest = hashlib.blake2b(os.path.abspath(root).encode('utf-8'), digest_size=8).hexdigest()
+        return cache_path(f'konum_indeksi_{digest}')
+
+    @classmethod
+    def load(cls, root: str, directory: Optional[str] = None) -> 'PositionalIndex':
+        """
+        Kök klasörün indeksini açar.
+
+        Args:
+            root: İndekslenen kök klasör
+            directory: Segmentlerin bulunduğu klasör (None ise uygulama önbellek klasörü kullanılır)
+
+        Returns:
+            PositionalIndex nesnesi (indeks yoksa veya sürümü farklıysa boş)
+        """
+        directory = directory or cls.default_directory(root)
+        os.makedirs(directory, exist_ok=True)
+        index = cls(root, directory)
+        # Manifest okunurken segment açılışı, birleştirmenin eski dosyaları silmesiyle çakışmamalı
+        with _manifest_lock(directory):
+            manifest = index._read_manifest()
+            index.reclaimed_bytes = manifest['reclaimed_bytes']
+            for name in manifest['segments']:
+                try:
+                    segment = Segment(os.path.join(directory, name))
+                except (OSError, ValueError) as e:
+                    print(f"İndeks segmenti açılamadı {name}: {str(e)}")
+                    continue
+                index._attach(segment, manifest['deleted'].get(name, set()))
+        return index
+
+    def _read_manifest(self) -> dict:
+        manifest = load_pickle(os.path.join(self.directory, MANIFEST_NAME), {})
+        if manifest.get('version') != INDEX_VERSION or manifest.get('root') != self.root:
+            manifest = {
+                'version': INDEX_VERSION,
+                'root': self.root,
+                'segments': [],
+                'deleted': {},
+                'renames': {},
+                'obsolete': [],
+                'reclaimed_bytes': 0,
+            }
+        return manifest
+
+    def _write_manifest(self, manifest: dict) -> None:
+        manifest['deleted'] = {name: ids for name, ids in manifest['deleted'].items()
+                               if ids and name in manifest['segments']}
+        save_pickle(os.path.join(self.directory, MANIFEST_NAME), manifest)
+
+    def _attach(self, segment: Segment, deleted: Set[int]) -> None:
+        """Segmenti indekse ekler ve canlı kaynaklarını dosya tablosuna işler"""
+        self.segments.append(segment)
+        self.deleted[segment.name] = set(deleted)
+        for source_id, (source, mtime, size, _, _) in enumerate(segment.sources):
+            if source_id not in deleted:
+                self.sources[source] = (mtime, size, segment.name, source_id)
+
+    def save(self) -> None:
+        """
+        Bekleyen belgeleri yeni bir segmente yazar ve değişiklikleri manifeste işler.
+
+        Manifest kilit altında yeniden okunur; bu indeks açıldıktan sonra
+        arka planda birleştirilmiş segmentlere ait silme kayıtları yeni
+        segmentteki karşılıklarına aktarılır.
+        """
+        self.flush()
+        if not (self._created or self._removed) or not self.directory:
+            return
+        try:
+            with _manifest_lock(self.directory):
+                manifest = self._read_manifest()
+                for name in self._created:
+                    if name not in manifest['segments']:
+                        manifest['segments'].append(name)
+                for name, source_id in self._removed:
+                    resolved = _resolve(manifest['renames'], name, source_id)
+                    if resolved is not None:
+                        manifest['deleted'].setdefault(resolved[0], set()).add(resolved[1])
+                self._write_manifest(manifest)
+            self._created.clear()
+            self._removed.clear()
+        except Exception as e:
+            print(f"Konum indeksi kaydedilemedi {self.directory}: {str(e)}")
+
+    def flush(self) -> None:
+        """Bellekte biriken belgeleri değişmez bir segment dosyasına yazar"""
+        if not len(self._writer) or not self.directory:
+            return
+        name = _new_segment_name()
+        path = os.path.join(self.directory, name)
+        self._writer.write(path)
+        self._writer = SegmentWriter()
+        self._pending.clear()
+        self._attach(Segment(path), set())
+        self._created.append(name)
+
+    def close(self) -> None:
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    def is_current(self, source: str, mtime: float, size: int) -> bool:
+        """Dosya indekslendiğinden beri değişmemiş mi"""
+        stamp = self._pending.get(source) or self.sources.get(source)
+        return stamp is not None and stamp[0] == mtime and stamp[1] == size
+
+    def add_source(self, source: str, mtime: float, size: int, documents: List[IndexedDocument]) -> None:
+        """
+        Dosyanın (arşivde üyelerinin) konum listelerini ekler; eski kayıtların yerini alır.
+
+        Args:
+            source: Diskteki dosya
+            mtime, size: Dosyanın indekslendiği andaki stat bilgileri
+            documents: index_document sonuçları, belge yoluyla birlikte
+        """
+        self.remove_source(source)
+        source_id = self._writer.add_source(source, mtime, size, documents)
+        self._pending[source] = (mtime, size, source_id)
+        if self._writer.posting_bytes >= self.FLUSH_BYTES:
+            self.flush()
+
+    def remove_source(self, source: str) -> None:
+        """Dosyanın kayıtlarını silinmiş olarak işaretler"""
+        if source in self._pending:
+            # Bekleyen segmentten kayıt çıkarılamaz; önce diske yazılır
+            self.flush()
+        stamp = self.sources.pop(source, None)
+        if stamp is None:
+            return
+        self.deleted.setdefault(stamp[2], set()).add(stamp[3])
+        self._removed.append((stamp[2], stamp[3]))
+
+    def prune(self, live_sources: Set[str]) -> int:
+        """Taramada artık bulunmayan dosyaları çıkarır, çıkarılan dosya sayısını döndürür"""
+        removed = [source for source in self.sources if source not in live_sources]
+        for source in removed:
+            self.remove_source(source)
+        return len(removed)
+
+    def maintain(self, policy: Optional[TieredMergePolicy] = None,
+                 should_stop: Optional[Callable[[], bool]] = None) -> int:
+        """
+        Politikanın seçtiği segmentleri birleştirir ve silinmiş kayıtları temizler.
+
+        Arka plan iş parçacığında çağrılmak içindir. Birleştirme yeni bir
+        dosyaya yazılır ve yalnızca manifest güncellenirken kilit tutulur;
+        eski segmentleri açmış aramalar okumaya devam eder.
+
+        Returns:
+            Yapılan birleştirme sayısı
+        """
+        policy = policy or TieredMergePolicy()
+        self.save()
+        merges = 0
+        while not (should_stop and should_stop()):
+            selected = policy.select(self.segments, self.deleted)
+            if not selected:
+                break
+            used = {segment.name: set(self.deleted.get(segment.name, set())) for segment in selected}
+            name = _new_segment_name()
+            path = os.path.join(self.directory, name)
+            try:
+                source_maps = merge_segments(selected, used, path, should_stop)
+            except MergeCancelled:
+                break
+            if not self._commit_merge(selected, used, Segment(path), source_maps):
+                break
+            merges += 1
+        self._remove_obsolete()
+        return merges
+
+    def _commit_merge(self, selected: List[Segment], used: Dict[str, Set[int]], merged: Segment,
+                      source_maps: Dict[str, Dict[int, int]]) -> bool:
+        """Birleştirilen segmentleri manifestte yenisiyle değiştirir"""
+        names = [segment.name for segment in selected]
+        with _manifest_lock(self.directory):
+            manifest = self._read_manifest()
+            if not all(name in manifest['segments'] for name in names):
+                # Başka bir birleştirme aynı segmentleri kullanmış
+                merged.close()
+                _remove_file(merged.path)
+                return False
+            late_deleted = set()
+            for name in names:
+                # Birleştirme sürerken silinen kaynaklar yeni segmentte de silinmiş sayılır
+                for source_id in manifest['deleted'].get(name, set()) - used[name]:
+                    if source_id in source_maps[name]:
+                        late_deleted.add(source_maps[name][source_id])
+            now = time.time()
+            manifest['renames'] = {old: entry for old, entry in manifest['renames'].items()
+                                   if now - entry[2] < RENAME_TTL}
+            for name in names:
+                manifest['renames'][name] = (merged.name, source_maps[name], now)
+            position = manifest['segments'].index(names[0])
+            segments = [name for name in manifest['segments'] if name not in names]
+            if merged.source_count:
+                segments.insert(min(position, len(segments)), merged.name)
+                manifest['deleted'][merged.name] = late_deleted
+            manifest['segments'] = segments
+            # Tüm kayıtları silinmiş segmentlerin birleşimi boş kalır, o da atılır
+            manifest['obsolete'] = manifest['obsolete'] + names + ([] if merged.source_count else [merged.name])
+            reclaimed = sum(segment.size for segment in selected) - merged.size
+            manifest['reclaimed_bytes'] += max(0, reclaimed)
+            self._write_manifest(manifest)
+        self.reclaimed_bytes = manifest['reclaimed_bytes']
+        for segment in selected:
+            segment.close()
+            self.segments.remove(segment)
+            self.deleted.pop(segment.name, None)
+        if merged.source_count:
+            self._attach(merged, late_deleted)
+        else:
+            merged.close()
+        return True
+
+    def _remove_obsolete(self) -> None:
+        """Birleştirilmiş eski segment dosyalarını siler; açık olanlar sonraki sefere kalır"""
+        with _manifest_lock(self.directory):
+            manifest = self._read_manifest()
+            if not manifest['obsolete']:
+                return
+            manifest['obsolete'] = [name for name in manifest['obsolete']
+                                    if not _remove_file(os.path.join(self.directory, name))]
+            self._write_manifest(manifest)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        İndeks istatistikleri.
+
+        Returns:
+            segments, documents, deleted_documents, dead_ratio, bytes ve
+            reclaimed_bytes alanlarını içeren sözlük
+        """
+        live = dead = 0
+        for segment in self.segments:
+            segment_live, segment_dead = live_document_counts(segment, self.deleted.get(segment.name, set()))
+            live += segment_live
+            dead += segment_dead
+        return {
+            'segments': len(self.segments),
+            'documents': live,
+            'deleted_documents': dead,
+            'dead_ratio': dead / (live + dead) if live + dead else 0.0,
+            'bytes': sum(segment.size for segment in self.segments),
+            'reclaimed_bytes': self.reclaimed_bytes,
+        }
+
+    @staticmethod
+    def _slot_postings(segment: Segment, slot: Slot,
+                       fold: Optional[Callable[[str], str]]) -> Dict[int, List[bytes]]:
+        """
+        Yuvaya uyan kelimelerin konum listeleri, belgeye göre gruplanmış.
+
+        Tam eşleşen kelime sözlükte doğrudan, önekler sıralı sözlüğün ilgili
+        aralığında aranır; diğer yuva türleri için sözlük baştan sona okunur.
+        """
+        if fold is None and slot.kind == Slot.EXACT:
+            entry = segment.lookup(slot.word)
+            entries = [entry] if entry is not None else []
+        elif fold is None and slot.kind == Slot.PREFIX:
+            entries = [(offset, length) for _, offset, length in segment.iter_terms(slot.word)]
+        else:
+            entries = [(offset, length) for term, offset, length in segment.iter_terms()
+                       if slot.accepts(fold(term) if fold else term)]
+        result: Dict[int, List[bytes]] = {}
+        for offset, length in entries:
+            for doc_id, positions in segment.postings(offset, length).items():
+                result.setdefault(doc_id, []).append(positions)
+        return result
+
+    def search(self, patterns: List[ProximityPattern],
+               fold: Optional[Callable[[str], str]] = None) -> Iterator[Tuple[str, float, int, List[int]]]:
+        """
+        Sorguyu konum listeleriyle cevaplar (yalnızca diske yazılmış segmentlerde).
+
+        Args:
+            patterns: CompiledQuery.index_patterns() sonucu
+            fold: Sorgu indeksten farklı katlıyorsa (aksanları yok sayma)
+                  indeks kelimelerine uygulanacak katlama
+
+        Returns:
+            (belge yolu, mtime, kelime sayısı, her kalıbın eşleşme sayısı) dörtlüleri
+        """
+        for segment in self.segments:
+            dead = self.deleted.get(segment.name, set())
+            frequencies: Dict[int, List[int]] = {}
+            for k, pattern in enumerate(patterns):
+                slot_postings = []
+                candidates = None
+                for slot in pattern.slots:
+                    postings = self._slot_postings(segment, slot, fold)
+                    slot_postings.append(postings)
+                    # Aday belgeler: her yuvadan en az bir kelimeyi içerenler
+                    candidates = set(postings) if candidates is None else candidates & postings.keys()
+                    if not candidates:
+                        break
+                for doc_id in candidates or ():
+                    slot_positions = [merge_positions(decode_positions(p) for p in postings[doc_id])
+                                      for postings in slot_postings]
+                    matches = len(pattern.spans(slot_positions))
+                    if matches:
+                        frequencies.setdefault(doc_id, [0] * len(patterns))[k] = matches
+            for doc_id, tf in frequencies.items():
+                doc_path, source_id, token_count = segment.document(doc_id)
+                if source_id in dead:
+                    continue
+                yield doc_path, segment.sources[source_id][1], token_count, tf
+
+
+def _manifest_lock(directory: str) -> threading.Lock:
+    """İndeks klasörünün manifestini koruyan, süreç içinde paylaşılan kilit"""
+    with _manifest_locks_guard:
+        return _manifest_locks.setdefault(os.path.abspath(directory), threading.Lock())
+
+
+def _new_segment_name() -> str:
+    # Aynı anda çalışan arama ve birleştirme çakışmasın diye ad rastgele üretilir
+    return f'segment_{uuid.uuid4().hex[:16]}.seg'
+
+
+def _resolve(renames: dict, name: str, source_id: int) -> Optional[Tuple[str, int]]:
+    """Birleştirilmiş segmentteki kaynağın güncel (segment adı, numara) karşılığı"""
+    while name in renames:
+        name, source_map, _ = renames[name]
+        source_id = source_map.get(source_id)
+        if source_id is None:
+            return None
+    return name, source_id
+
+
+def _remove_file(path: str) -> bool:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        return True
+    except OSError:
+        return False
+    return True
@@ -0,0 +1,223 @@
+import re
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from heapq import merge
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fuzzy import FuzzyPattern
+
+# Kelime: harf, rakam ve alt çizgi dizisi (katlanmış metinde)
+TOKEN_RE = re.compile(r'\w+')
+# Yakınlık işleci: "fatura NEAR/5 ödeme" (işleç büyük harfle yazılır)
+NEAR_RE = re.compile(r'\s+NEAR/(\d+)\s+')
+
+
+def token_positions(text: str) -> Tuple[Dict[str, List[int]], List[Tuple[int, int]]]:
+    """
+    Metni kelimelere ayırır.
+
+    Returns:
+        (kelime -> sıralı konum listesi, her konumdaki kelimenin metindeki
+        [başlangıç, bitiş) aralığı)
+    """
+    positions = defaultdict(list)
+    spans = []
+    for i, match in enumerate(TOKEN_RE.finditer(text)):
+        positions[match.group()].append(i)
+        spans.append(match.span())
+    return positions, spans
+
+
+def phrase_starts(position_lists: Sequence[Sequence[int]]) -> List[int]:
+    """
+    Konum listelerinin kesişimiyle kelimelerin art arda geçtiği yerleri bulur.
+
+    Args:
+        position_lists: Öbekteki her kelimenin sıralı konum listesi
+
+    Returns:
+        Öbeğin sıralı başlangıç konumları
+    """
+    if not position_lists or any(not p for p in position_lists):
+        return []
+    # Kesişim en seyrek listeden başlar; i. kelimenin konumu i kadar kaydırılır
+    order = sorted(range(len(position_lists)), key=lambda i: len(position_lists[i]))
+    first = order[0]
+    candidates = {p - first for p in position_lists[first]}
+    for i in order[1:]:
+        candidates.intersection_update(p - i for p in position_lists[i])
+        if not candidates:
+            return []
+    return sorted(c for c in candidates if c >= 0)
+
+
+def near_spans(starts_a: Sequence[int], len_a: int, starts_b: Sequence[int], len_b: int,
+               distance: int) -> List[Tuple[int, int]]:
+    """
+    Aralarında en fazla `distance` kelime bulunan A ve B öbeklerini eşleştirir.
+
+    Her iki liste sıralı olduğundan her A için en yakın B ikili aramayla
+    bulunur. Öbekler her iki sırada da olabilir, ancak üst üste binemez.
+
+    Returns:
+        (ilk kelime, son kelime) konum çiftleri
+    """
+    spans = []
+    for a in starts_a:
+        a_last = a + len_a - 1
+        # B, A'dan sonra
+        i = bisect_right(starts_b, a_last)
+        if i < len(starts_b) and starts_b[i] - a_last - 1 <= distance:
+            spans.append((a, starts_b[i] + len_b - 1))
+            continue
+        # B, A'dan önce: son kelimesi A'nın başından önce biten en yakın B
+        j = bisect_left(starts_b, a - len_b + 1) - 1
+        if j >= 0 and a - (starts_b[j] + len_b) <= distance:
+            spans.append((starts_b[j], a_last))
+    return spans
+
+
+class Slot:
+    """
+    Öbekteki bir kelime yuvası.
+
+    Yuva türü, sorgu kelimesinin belgedeki kelimenin neresinde geçebileceğini
+    belirler: tamamı, başı, sonu, herhangi bir yeri veya yaklaşık olarak.
+    """
+
+    EXACT = 'exact'
+    PREFIX = 'prefix'
+    SUFFIX = 'suffix'
+    CONTAINS = 'contains'
+    FUZZY = 'fuzzy'
+
+    __slots__ = ('word', 'kind', 'fuzzy')
+
+    def __init__(self, word: str, kind: str = EXACT, max_errors: int = 1):
+        self.word = word
+        self.kind = kind
+        self.fuzzy = FuzzyPattern(word, max_errors) if kind == Slot.FUZZY else None
+
+    def accepts(self, term: str) -> bool:
+        """Belgedeki kelime bu yuvaya uyuyor mu"""
+        if self.kind == Slot.EXACT:
+            return term == self.word
+        if self.kind == Slot.PREFIX:
+            return term.startswith(self.word)
+        if self.kind == Slot.SUFFIX:
+            return term.endswith(self.word)
+        if self.kind == Slot.CONTAINS:
+            return self.word in term
+        return self.fuzzy.search(term)
+
+
+def phrase_slots(words: List[str], anchor_start: bool, anchor_end: bool,
+                 max_errors: Optional[int] = None) -> List[Slot]:
+    """
+    Öbek kelimeleri için yuvaları oluşturur.
+
+    Ortadaki kelimeler her zaman tam eşleşir. İlk kelimenin başı yalnızca
+    anchor_start, son kelimenin sonu yalnızca anchor_end ise sabittir;
+    böylece "Normal" aramada "fatura tarih" "e-fatura tarihinde" ile de eşleşir.
+
+    Args:
+        words: Katlanmış kelimeler
+        anchor_start: İlk kelime belgedeki kelimenin başında olmalı
+        anchor_end: Son kelime belgedeki kelimenin sonunda olmalı
+        max_errors: Verilirse her kelime yaklaşık eşleştirilir
+    """
+    slots = []
+    last = len(words) - 1
+    for i, word in enumerate(words):
+        if max_errors is not None:
+            slots.append(Slot(word, Slot.FUZZY, max_errors))
+            continue
+        fixed_start = i > 0 or anchor_start
+        fixed_end = i < last or anchor_end
+        if fixed_start and fixed_end:
+            kind = Slot.EXACT
+        elif fixed_start:
+            kind = Slot.PREFIX
+        elif fixed_end:
+            kind = Slot.SUFFIX
+        else:
+            kind = Slot.CONTAINS
+        slots.append(Slot(word, kind))
+    return slots
+
+
+class ProximityPattern:
+    """
+    Kelime konumlarıyla değerlendirilen öbek veya yakınlık kalıbı.
+
+    Metin kelimelere ayrıldığından satır sonu, fazla boşluk ve noktalama
+    eşleşmeyi bozmaz. Öbek, kelimelerin konum listelerinin (birer kaydırılarak)
+    kesişimidir; "A NEAR/n B" ise iki öbeğin aralarında en fazla n kelime
+    olacak şekilde birleştirilmesidir. Aynı değerlendirme hem tek bir belgenin
+    kelimelerine hem de konumsal indeksin konum listelerine uygulanır.
+    """
+
+    def __init__(self, phrases: List[List[Slot]], distance: Optional[int] = None):
+        """
+        Args:
+            phrases: Öbekler (yakınlık aramasında iki öbek)
+            distance: NEAR/n için n; düz öbekte None
+        """
+        self.phrases = phrases
+        self.distance = distance
+        self.slots = [slot for phrase in phrases for slot in phrase]
+
+    @property
+    def is_empty(self) -> bool:
+        return any(not phrase for phrase in self.phrases)
+
+    def spans(self, slot_positions: Sequence[Sequence[int]]) -> List[Tuple[int, int]]:
+        """
+        Eşleşmeleri bulur.
+
+        Args:
+            slot_positions: self.slots sırasıyla her yuvanın sıralı konum listesi
+
+        Returns:
+            Eşleşmelerin (ilk kelime, son kelime) konumları
+        """
+        if self.is_empty:
+            return []
+        starts = []
+        offset = 0
+        for phrase in self.phrases:
+            starts.append(phrase_starts(slot_positions[offset:offset + len(phrase)]))
+            offset += len(phrase)
+        if self.distance is None:
+            length = len(self.phrases[0])
+            return [(s, s + length - 1) for s in starts[0]]
+        return near_spans(starts[0], len(self.phrases[0]), starts[1], len(self.phrases[1]), self.distance)
+
+    def slot_positions(self, positions: Dict[str, List[int]]) -> List[List[int]]:
+        """Belgenin kelime konumlarından her yuvanın konum listesini çıkarır"""
+        result = []
+        for slot in self.slots:
+            if slot.kind == Slot.EXACT:
+                result.append(positions.get(slot.word, []))
+            else:
+                result.append(merge_positions(p for term, p in positions.items() if slot.accepts(term)))
+        return result
+
+    def find(self, text: str, tokens=None) -> List[Tuple[int, int]]:
+        """
+        Metindeki eşleşmelerin karakter aralıkları.
+
+        Args:
+            text: Katlanmış metin
+            tokens: Önceden hesaplanmış token_positions(text) sonucu
+        """
+        positions, spans = tokens if tokens is not None else token_positions(text)
+        return [(spans[first][0], spans[last][1]) for first, last in self.spans(self.slot_positions(positions))]
+
+
+def merge_positions(lists: Iterable[Sequence[int]]) -> List[int]:
+    """Sıralı konum listelerini tek sıralı listede birleştirir"""
+    lists = [p for p in lists if p]
+    if len(lists) == 1:
+        return list(lists[0])
+    return list(merge(*lists))
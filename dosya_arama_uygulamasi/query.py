@@ -0,0 +1,352 @@
+import re
+from typing import Iterator, List, Optional, Tuple, Union
+
+from fuzzy import FuzzyPattern
+from normalize import FoldedText, TextFolder
+from proximity import NEAR_RE, TOKEN_RE, ProximityPattern, Slot, phrase_slots, token_positions
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:
+    import sre_parse
+
+# Kelime eşleştirme türleri (arayüzdeki radio button id'leri ile aynı)
+MATCH_NORMAL = 0
+MATCH_EXACT = 1
+MATCH_STARTS = 2
+MATCH_ENDS = 3
+MATCH_FUZZY = 4
+
+# re.IGNORECASE, Türkçe katlamadan farklı olarak ı ile i'yi de eşit sayar;
+# düzenli ifade ön filtresi bu yüzden ikisini aynı harfe indirger
+_RE_DOTLESS = str.maketrans({'ı': 'i'})
+
+# Yalnızca boşlukla ayrılmış kelimelerden oluşan anahtar kelime öbek olarak aranır
+_PHRASE_RE = re.compile(r'\w+(?:\s+\w+)+')
+
+_ZERO_WIDTH = (sre_parse.AT,)
+_REPEATS = tuple(op for op in (getattr(sre_parse, name, None) for name in
+                               ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')) if op is not None)
+
+
+def parse_keywords(text: str, use_regex: bool = False) -> List[str]:
+    """
+    Arama kutusundaki metni anahtar kelimelere ayırır.
+
+    Düzenli ifade modunda virgül ifadenin parçası olabileceğinden metnin
+    tamamı tek bir ifade olarak kabul edilir. Diğer modlarda her parça
+    "tırnak içinde öbek" veya "A NEAR/n B" yakınlık sözdizimini içerebilir.
+    """
+    if use_regex:
+        return [text.strip()] if text.strip() else []
+    return [k.strip() for k in text.split(',') if k.strip()]
+
+
+def required_literals(pattern: str, flags: int = 0) -> List[str]:
+    """
+    Düzenli ifadenin her eşleşmede mutlaka geçmesi gereken sabit parçalarını çıkarır.
+
+    Args:
+        pattern: Düzenli ifade
+        flags: re bayrakları
+
+    Returns:
+        Gerekli sabit metinler (uzundan kısaya); çıkarılamazsa boş liste
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return []
+    literals = []
+    _collect_literals(parsed, literals)
+    return sorted({lit for lit in literals if len(lit) >= 2}, key=len, reverse=True)
+
+
+def _collect_literals(items, literals: List[str]) -> None:
+    run = []
+
+    def flush():
+        if run:
+            literals.append(''.join(run))
+            run.clear()
+
+    for op, av in items:
+        if op == sre_parse.LITERAL:
+            run.append(chr(av))
+        elif op in _ZERO_WIDTH:
+            # \b, ^ gibi sıfır genişlikli işaretler sabit diziyi bölmez
+            continue
+        elif op == sre_parse.SUBPATTERN:
+            flush()
+            add_flags = av[1] if len(av) == 4 else 0
+            if not add_flags & sre_parse.SRE_FLAG_IGNORECASE:
+                _collect_literals(av[-1], literals)
+        elif op in _REPEATS:
+            flush()
+            min_count, _, item = av
+            if min_count >= 1:
+                _collect_literals(item, literals)
+        else:
+            # BRANCH, IN, ANY vb. sabit diziyi keser
+            flush()
+    flush()
+
+
+class CompiledQuery:
+    """
+    Bir arama için bir kez derlenen sorgu.
+
+    Kelime eşleştirme kalıpları ve düzenli ifade arama başında derlenir,
+    her dosyada yeniden oluşturulmaz. Her belge bir kez katlanır
+    (Türkçe büyük/küçük harf kuralları, isteğe bağlı aksan yok sayma) ve
+    tüm eşleştirme türleri katlanmış metin üzerinde çalışır. Düzenli ifade
+    modunda ifadeden çıkarılan sabit parçalar, asıl ifade çalışmadan önce
+    hızlı bir ön filtre olarak kullanılır. Birden çok kelimeli anahtar
+    kelimeler, tırnaklı öbekler ve NEAR/n sorguları kelime konumlarıyla
+    (ProximityPattern) değerlendirilir.
+    """
+
+    def __init__(self, keywords: List[str], match_type: int = MATCH_NORMAL,
+                 case_sensitive: bool = False, use_regex: bool = False, max_errors: int = 1,
+                 ignore_diacritics: bool = False):
+        """
+        Args:
+            keywords: Anahtar kelimeler (düzenli ifade modunda tek ifade)
+            match_type: MATCH_NORMAL, MATCH_EXACT, MATCH_STARTS, MATCH_ENDS veya MATCH_FUZZY
+            case_sensitive: Büyük/küçük harf duyarlı arama
+            use_regex: Anahtar kelimeleri düzenli ifade olarak yorumla
+            max_errors: MATCH_FUZZY için izin verilen en fazla düzenleme hatası
+            ignore_diacritics: ş/s, ç/c, ğ/g, ı/i, ö/o, ü/u harflerini eşit say
+
+        Raises:
+            re.error: Düzenli ifade geçersizse
+        """
+        self.keywords = keywords
+        self.match_type = match_type
+        self.case_sensitive = case_sensitive
+        self.use_regex = use_regex
+        self.max_errors = max_errors
+        self.ignore_diacritics = ignore_diacritics
+        self.folder = TextFolder(case_sensitive, ignore_diacritics)
+        self._patterns = []
+        self._literals = []
+        for keyword in keywords:
+            if use_regex:
+                flags = 0 if case_sensitive else re.IGNORECASE
+                pattern = re.compile(self._fold_pattern(keyword), flags)
+                ignore_case = bool(pattern.flags & re.IGNORECASE)
+                literals = required_literals(pattern.pattern, flags)
+                if ignore_case:
+                    literals = [lit.lower().translate(_RE_DOTLESS) for lit in literals]
+                self._patterns.append(pattern)
+                self._literals.append((literals, ignore_case))
+                continue
+            proximity = self._proximity_pattern(keyword)
+            if proximity is not None:
+                self._patterns.append(proximity)
+                continue
+            # Katlanmış metinde aranacağı için kelime de aynı kurallarla katlanır
+            folded = self.folder.fold_str(keyword)
+            if match_type == MATCH_EXACT:
+                self._patterns.append(re.compile(r'\b' + re.escape(folded) + r'\b'))
+            elif match_type == MATCH_STARTS:
+                self._patterns.append(re.compile(r'\b' + re.escape(folded)))
+            elif match_type == MATCH_ENDS:
+                self._patterns.append(re.compile(re.escape(folded) + r'\b'))
+            elif match_type == MATCH_FUZZY:
+                self._patterns.append(FuzzyPattern(folded, max_errors))
+            else:
+                self._patterns.append(folded)
+
+    def _proximity_pattern(self, keyword: str) -> Optional[ProximityPattern]:
+        """
+        Öbek veya yakınlık sözdizimi içeren anahtar kelimenin kalıbını oluşturur.
+
+        Returns:
+            ProximityPattern; anahtar kelime tek bir kelime veya noktalama
+            içeren düz metinse None
+        """
+        parts = NEAR_RE.split(keyword.strip())
+        if len(parts) == 3:
+            return ProximityPattern([self._phrase(parts[0]), self._phrase(parts[2])], int(parts[1]))
+        if _is_quoted(keyword.strip()):
+            return ProximityPattern([self._phrase(keyword)])
+        if self.match_type != MATCH_FUZZY and _PHRASE_RE.fullmatch(self.folder.fold_str(keyword.strip())):
+            return ProximityPattern([self._phrase(keyword)])
+        return None
+
+    def _phrase(self, text: str) -> List[Slot]:
+        """Öbeğin kelime yuvaları; tırnaklı öbeğin kelimeleri her zaman tam eşleşir"""
+        text = text.strip()
+        if _is_quoted(text):
+            return phrase_slots(TOKEN_RE.findall(self.folder.fold_str(text[1:-1])), True, True)
+        words = TOKEN_RE.findall(self.folder.fold_str(text))
+        return phrase_slots(words,
+                            anchor_start=self.match_type in (MATCH_EXACT, MATCH_STARTS),
+                            anchor_end=self.match_type in (MATCH_EXACT, MATCH_ENDS),
+                            max_errors=self.max_errors if self.match_type == MATCH_FUZZY else None)
+
+    def index_patterns(self) -> Optional[List[ProximityPattern]]:
+        """
+        Sorgunun konumsal indeksle cevaplanabilecek biçimi.
+
+        İndeks küçük harfe katlanmış kelimeleri sakladığından düzenli ifade,
+        büyük/küçük harf duyarlı arama ve noktalama içeren anahtar kelimeler
+        indeksle cevaplanamaz.
+
+        Returns:
+            Her anahtar kelime için bir ProximityPattern (tek kelimeler tek
+            yuvalı öbek olur); sorgu indekse uygun değilse None
+        """
+        if self.use_regex or self.case_sensitive:
+            return None
+        patterns = []
+        for keyword, pattern in zip(self.keywords, self._patterns):
+            if isinstance(pattern, ProximityPattern):
+                patterns.append(pattern)
+                continue
+            folded = self.folder.fold_str(keyword.strip())
+            if not TOKEN_RE.fullmatch(folded):
+                return None
+            patterns.append(ProximityPattern([self._phrase(keyword)]))
+        return patterns
+
+    def required_substrings(self) -> List[Optional[List[str]]]:
+        """
+        Her anahtar kelimenin eşleşebilmesi için metinde bulunması gereken parçalar.
+
+        Parçalar sorgunun kurallarıyla katlanmıştır. Öbek ve yakınlık
+        sorgularında kelimeler arasındaki boşluk serbest olduğundan her
+        kelime ayrı parçadır; düzenli ifadelerde ön filtrenin sabit parçaları
+        kullanılır.
+
+        Returns:
+            Anahtar kelime başına parça listesi; yaklaşık aramada ya da sabit
+            parçası olmayan düzenli ifadede gerekli parça bilinmediğinden None
+        """
+        required: List[Optional[List[str]]] = []
+        for index, (keyword, pattern) in enumerate(zip(self.keywords, self._patterns)):
+            if self.use_regex:
+                required.append(list(self._literals[index][0]) or None)
+            elif self.match_type == MATCH_FUZZY:
+                required.append(None)
+            elif isinstance(pattern, ProximityPattern):
+                parts = NEAR_RE.split(keyword.strip())
+                texts = [parts[0], parts[2]] if len(parts) == 3 else [keyword]
+                required.append([word for text in texts for word in TOKEN_RE.findall(self.folder.fold_str(text))])
+            else:
+                required.append([self.folder.fold_str(keyword)])
+        return required
+
+    def _fold_pattern(self, pattern: str) -> str:
+        """
+        Düzenli ifadedeki ASCII dışı harfleri katlar.
+
+        Kaçış dizileri ve karakter sınıfları ASCII olduğundan yalnızca ASCII
+        dışı karakterler katlanır; ASCII harflerin büyüklüğünü re.IGNORECASE
+        karşılar.
+        """
+        if self.folder.is_identity:
+            return pattern
+        return ''.join(ch if ch.isascii() else self.folder.fold_str(ch) for ch in pattern)
+
+    def fold(self, text: str) -> FoldedText:
+        """Belgeyi eşleştirme için bir kez katlar"""
+        return self.folder.fold(text)
+
+    def prefilter_bytes(self, data: bytes) -> bool:
+        """
+        Ham baytlar üzerinde ucuz ön kontrol yapar (yalnızca düzenli ifade modu).
+
+        Returns:
+            False ise içerik kesinlikle eşleşmez; True ise metin çıkarılıp
+            tam kontrol yapılmalıdır
+        """
+        if not self.use_regex or not self.folder.is_identity:
+            return True
+        for literals, ignore_case in self._literals:
+            if ignore_case or not literals:
+                return True
+            if all(lit.encode('utf-8') in data for lit in literals):
+                return True
+        return False
+
+    def matches(self, text: Union[str, FoldedText]) -> bool:
+        """Metin (veya önceden katlanmış belge) herhangi bir anahtar kelimeyle eşleşiyor mu"""
+        doc = text if isinstance(text, FoldedText) else self.fold(text)
+        cache = {}
+        return any(self._match_one(i, doc.text, cache) for i in range(len(self.keywords)))
+
+    def found_keywords(self, text: Union[str, FoldedText]) -> List[str]:
+        """Metinde eşleşen anahtar kelimeleri döndürür"""
+        doc = text if isinstance(text, FoldedText) else self.fold(text)
+        cache = {}
+        return [k for i, k in enumerate(self.keywords) if self._match_one(i, doc.text, cache)]
+
+    def find_spans(self, text: Union[str, FoldedText]) -> Iterator[Tuple[int, int, int]]:
+        """
+        Tüm eşleşmeleri tek geçişte bulur.
+
+        Args:
+            text: Orijinal metin veya önceden katlanmış belge
+
+        Returns:
+            (anahtar kelime sırası, başlangıç, bitiş) üçlüleri; konumlar
+            orijinal metne göredir. Yaklaşık aramada başlangıç tahminidir.
+        """
+        doc = text if isinstance(text, FoldedText) else self.fold(text)
+        folded = doc.text
+        cache = {}
+        for index, pattern in enumerate(self._patterns):
+            if self.use_regex and not self._match_one(index, folded, cache):
+                continue
+            for start, end in self._iter_pattern(pattern, folded, cache):
+                yield (index,) + doc.original_span(start, end)
+
+    @staticmethod
+    def _tokens(text: str, cache: dict):
+        """Belgenin kelime konumları; aynı belgedeki tüm öbekler için bir kez hesaplanır"""
+        if 'tokens' not in cache:
+            cache['tokens'] = token_positions(text)
+        return cache['tokens']
+
+    @classmethod
+    def _iter_pattern(cls, pattern, text: str, cache: dict) -> Iterator[Tuple[int, int]]:
+        if isinstance(pattern, ProximityPattern):
+            yield from pattern.find(text, cls._tokens(text, cache))
+        elif isinstance(pattern, str):
+            start = text.find(pattern)
+            while start != -1:
+                yield start, start + len(pattern)
+                start = text.find(pattern, start + max(1, len(pattern)))
+        elif isinstance(pattern, FuzzyPattern):
+            for end in pattern.find_ends(text):
+                yield max(0, end - pattern.m), end
+        else:
+            for match in pattern.finditer(text):
+                if match.end() > match.start():
+                    yield match.start(), match.end()
+
+    def _match_one(self, index: int, text: str, cache: dict) -> bool:
+        pattern = self._patterns[index]
+        if self.use_regex:
+            literals, ignore_case = self._literals[index]
+            if literals:
+                if ignore_case:
+                    if 'dotless' not in cache:
+                        cache['dotless'] = text.lower().translate(_RE_DOTLESS)
+                    haystack = cache['dotless']
+                else:
+                    haystack = text
+                if not all(lit in haystack for lit in literals):
+                    return False
+            return pattern.search(text) is not None
+        if isinstance(pattern, str):
+            return pattern in text
+        if isinstance(pattern, ProximityPattern):
+            return bool(pattern.find(text, self._tokens(text, cache)))
+        return pattern.search(text)
+
+
+def _is_quoted(text: str) -> bool:
+    return len(text) >= 2 and text[0] == text[-1] == '"'
@@ -0,0 +1,142 @@
+import heapq
+import math
+import os
+import time
+from itertools import count
+from typing import Dict, List
+
+
+class BM25Scorer:
+    """
+    Sonuçları BM25 benzeri bir puanla sıralayan sınıf.
+
+    Terim frekansları ve belge uzunlukları metin çıkarılırken işçilerde
+    toplanır. Belge frekansı (df) ve ortalama uzunluk arama ilerledikçe
+    güncellenir; bu yüzden akış sırasındaki puanlar yaklaşıktır ve en iyi
+    sonuçlar arama sonunda kesin istatistiklerle yeniden puanlanır.
+    """
+
+    def __init__(self, keywords: List[str], total_documents: int,
+                 k1: float = 1.2, b: float = 0.75,
+                 recency_weight: float = 0.2, recency_half_life_days: float = 180.0,
+                 filename_boost: float = 1.5):
+        """
+        Args:
+            keywords: Sorgudaki anahtar kelimeler
+            total_documents: Aranan toplam dosya sayısı (IDF için N)
+            k1, b: BM25 parametreleri
+            recency_weight: Yeni dosyalara verilecek en fazla ek oran
+            recency_half_life_days: Yenilik etkisinin yarıya indiği gün sayısı
+            filename_boost: Dosya adı da eşleşiyorsa eklenecek puan
+        """
+        self.keywords = keywords
+        self.total_documents = max(1, total_documents)
+        self.k1 = k1
+        self.b = b
+        self.recency_weight = recency_weight
+        self.recency_half_life = recency_half_life_days * 86400
+        self.filename_boost = filename_boost
+        self.document_frequency: Dict[str, int] = {k: 0 for k in keywords}
+        self._length_sum = 0
+        self._document_count = 0
+        self.now = time.time()
+
+    def observe(self, hit: Dict) -> None:
+        """Eşleşen bir belgenin istatistiklerini ekler"""
+        for keyword, tf in hit.get('term_frequencies', {}).items():
+            if tf:
+                self.document_frequency[keyword] = self.document_frequency.get(keyword, 0) + 1
+        self._length_sum += hit.get('doc_length', 0)
+        self._document_count += 1
+
+    @property
+    def average_length(self) -> float:
+        if not self._document_count:
+            return 1.0
+        return max(1.0, self._length_sum / self._document_count)
+
+    def idf(self, keyword: str) -> float:
+        n = self.total_documents
+        df = min(self.document_frequency.get(keyword, 0), n)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, hit: Dict) -> float:
+        """
+        Sonucun puanını hesaplar.
+
+        Args:
+            hit: term_frequencies, doc_length, mtime ve name_match alanlarını içeren sonuç
+
+        Returns:
+            Puan (büyük olan daha ilgili)
+        """
+        length = max(1, hit.get('doc_length', 0))
+        norm = self.k1 * (1 - self.b + self.b * length / self.average_length)
+        score = 0.0
+        for keyword, tf in hit.get('term_frequencies', {}).items():
+            if tf:
+                score += self.idf(keyword) * tf * (self.k1 + 1) / (tf + norm)
+        if hit.get('name_match'):
+            score += self.filename_boost
+        mtime = hit.get('mtime')
+        if mtime and self.recency_weight:
+            age = max(0.0, self.now - mtime)
+            score *= 1 + self.recency_weight * math.pow(0.5, age / self.recency_half_life)
+        return score
+
+
+class TopKCollector:
+    """
+    Sınırlı boyutlu min-heap ile en iyi K sonucu tutar.
+
+    Tüm sonuçlar bellekte tutulup sıralanmaz; her yeni sonuç yalnızca
+    heap'teki en kötü sonuçla karşılaştırılır (O(log K)).
+    """
+
+    def __init__(self, k: int, scorer: BM25Scorer):
+        self.k = k
+        self.scorer = scorer
+        self._heap = []
+        self._counter = count()
+        self.seen = 0
+
+    def add(self, hit: Dict) -> None:
+        self.scorer.observe(hit)
+        self.seen += 1
+        entry = (self.scorer.score(hit), next(self._counter), hit)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[0] > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def results(self) -> List[Dict]:
+        """Kesin istatistiklerle yeniden puanlanmış, en iyiden kötüye sıralı sonuçlar"""
+        ranked = []
+        for _, _, hit in self._heap:
+            hit['score'] = self.scorer.score(hit)
+            ranked.append(hit)
+        ranked.sort(key=lambda h: h['score'], reverse=True)
+        return ranked
+
+
+def filename_matches(query, file_path: str) -> bool:
+    """Dosya adı (uzantısız) sorguyla eşleşiyor mu"""
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    try:
+        return query.matches(name)
+    except Exception:
+        return False
+
+
+def document_length(text: str) -> int:
+    """Belgenin kelime sayısı (BM25 uzunluk normalizasyonu için)"""
+    return len(text.split())
+
+
+def term_frequencies(query, doc, spans=None) -> Dict[str, int]:
+    """Her anahtar kelimenin belgede kaç kez geçtiği (spans verilirse yeniden aranmaz)"""
+    tf = {keyword: 0 for keyword in query.keywords}
+    for index, _, _ in (query.find_spans(doc) if spans is None else spans):
+        tf[query.keywords[index]] += 1
+    return tf
+
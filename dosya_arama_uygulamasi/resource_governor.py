@@ -0,0 +1,303 @@
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+# Doğrudan okunan türler; diğerleri (PDF, Office, arşiv) pahalı ayrıştırma sayılır
+LIGHT_EXTS = {'.txt'}
+IO_PRIORITY_IDLE = 'idle'
+IO_PRIORITY_LOW = 'low'
+
+
+class ResourceLimits:
+    """Aramanın paylaşılan makinede kullanabileceği kaynak sınırları."""
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 nice: int = 0,
+                 io_priority: Optional[str] = None,
+                 max_read_bytes_per_sec: int = 0,
+                 max_heavy_parses: int = 0,
+                 adaptive: bool = False,
+                 load_high: float = 1.0,
+                 load_low: float = 0.6,
+                 cpu_high: float = 0.85,
+                 cpu_low: float = 0.5,
+                 iowait_high: float = 20.0,
+                 iowait_low: float = 8.0,
+                 max_backoff: float = 1.0):
+        """
+        Args:
+            max_workers: En fazla işçi süreç sayısı (None ise çekirdek sayısı - 1)
+            nice: İşçilerin CPU önceliğini düşürme miktarı (0-19; Windows'ta >0 düşük, >=15 boşta önceliği)
+            io_priority: İşçilerin disk önceliği: 'idle', 'low' veya None (değiştirme)
+            max_read_bytes_per_sec: Tüm işçilerin toplam okuma hızı sınırı (0 = sınırsız)
+            max_heavy_parses: Aynı anda ayrıştırılacak en fazla PDF/Office/arşiv dosyası (0 = sınırsız)
+            adaptive: Sistem yükü veya G/Ç beklemesi arttığında dosyalar arasına bekleme ekle
+            load_high / load_low: Çekirdek başına yük ortalaması eşikleri (yavaşla / hızlan)
+            cpu_high / cpu_low: Yük ortalaması olmayan sistemlerde (Windows) CPU kullanım oranı eşikleri
+            iowait_high / iowait_low: G/Ç bekleme yüzdesi eşikleri (yavaşla / hızlan)
+            max_backoff: Dosya başına en uzun bekleme (saniye)
+        """
+        self.max_workers = max_workers if max_workers and max_workers > 0 else None
+        self.nice = max(0, min(19, nice))
+        self.io_priority = io_priority
+        self.max_read_bytes_per_sec = max(0, max_read_bytes_per_sec)
+        self.max_heavy_parses = max(0, max_heavy_parses)
+        self.adaptive = adaptive
+        self.load_high = load_high
+        self.load_low = load_low
+        self.cpu_high = cpu_high
+        self.cpu_low = cpu_low
+        self.iowait_high = iowait_high
+        self.iowait_low = iowait_low
+        self.max_backoff = max_backoff
+
+    @property
+    def throttled(self) -> bool:
+        """İşçilerde uygulanacak bir sınır var mı"""
+        return bool(self.nice or self.io_priority or self.max_read_bytes_per_sec
+                    or self.max_heavy_parses or self.adaptive)
+
+    def worker_count(self, default: Optional[int] = None) -> int:
+        """Sınır uygulanmış işçi süreç sayısı"""
+        count = default or max(1, multiprocessing.cpu_count() - 1)
+        if self.max_workers:
+            count = min(count, self.max_workers)
+        return max(1, count)
+
+
+def lower_priority(nice: int, io_priority: Optional[str]) -> None:
+    """
+    Çalışan sürecin CPU ve disk önceliğini düşürür.
+
+    POSIX'te os.nice, Windows'ta psutil öncelik sınıfları kullanılır. Disk
+    önceliği psutil ile (yoksa Linux'ta ionice komutuyla) ayarlanır.
+    Desteklenmeyen ayarlar sessizce atlanır.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if nice:
+        try:
+            if hasattr(os, 'nice'):
+                os.nice(nice)
+            elif psutil is not None:
+                psutil.Process().nice(psutil.IDLE_PRIORITY_CLASS if nice >= 15 else psutil.BELOW_NORMAL_PRIORITY_CLASS)
+        except Exception:
+            pass
+    if not io_priority:
+        return
+    idle = io_priority == IO_PRIORITY_IDLE
+    try:
+        if psutil is not None and hasattr(psutil, 'IOPRIO_CLASS_IDLE'):
+            if idle:
+                psutil.Process().ionice(psutil.IOPRIO_CLASS_IDLE)
+            else:
+                psutil.Process().ionice(psutil.IOPRIO_CLASS_BE, value=7)
+        elif psutil is not None and hasattr(psutil, 'IOPRIO_VERYLOW'):
+            psutil.Process().ionice(psutil.IOPRIO_VERYLOW if idle else psutil.IOPRIO_LOW)
+        elif sys.platform.startswith('linux'):
+            command = ['ionice', '-c', '3'] if idle else ['ionice', '-c', '2', '-n', '7']
+            subprocess.run(command + ['-p', str(os.getpid())], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=5)
+    except Exception:
+        pass
+
+
+class WorkerThrottle:
+    """
+    İşçi süreçlerin paylaştığı sınırlayıcı.
+
+    Okuma hızı sınırı süreçler arası ortak bir sanal saatle (GCRA) uygulanır:
+    her dosya boyutu kadar saati ileri iter, saat şimdiden ilerideyse işçi
+    aradaki süre kadar bekler. Pahalı ayrıştırmalar ortak bir semaforla
+    sınırlanır. Uyarlamalı modda ebeveyn süreç dosya başına beklemeyi
+    ortak bir değişkende günceller.
+
+    Nesne yalnızca havuz oluşturulurken (initializer argümanı olarak)
+    işçilere aktarılabilir.
+    """
+
+    def __init__(self, limits: ResourceLimits):
+        self.nice = limits.nice
+        self.io_priority = limits.io_priority
+        self.rate = float(limits.max_read_bytes_per_sec)
+        self._lock = multiprocessing.Lock()
+        self._next_read = multiprocessing.Value('d', 0.0, lock=False)
+        self._backoff = multiprocessing.Value('d', 0.0)
+        self._heavy = multiprocessing.BoundedSemaphore(limits.max_heavy_parses) if limits.max_heavy_parses else None
+
+    @property
+    def backoff(self) -> float:
+        return self._backoff.value
+
+    @backoff.setter
+    def backoff(self, seconds: float) -> None:
+        self._backoff.value = seconds
+
+    def start_worker(self) -> None:
+        """İşçi sürecin başında önceliği düşürür"""
+        lower_priority(self.nice, self.io_priority)
+
+    def consume(self, nbytes: int) -> None:
+        """Okunacak bayt kadar hız sınırı payı alır, gerekirse bekler"""
+        if not self.rate or nbytes <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_read.value)
+            self._next_read.value = start + nbytes / self.rate
+        if start > now:
+            time.sleep(start - now)
+
+    @contextmanager
+    def file(self, file_path: str, prefetched: bool = False):
+        """
+        Bir dosyanın aranması/indekslenmesi süresince sınırları uygular.
+
+        Args:
+            prefetched: Dosya önceden okunmuşsa okuma hızı payı okuyucuda
+                alınmıştır; yalnızca bekleme ve ayrıştırma sınırı uygulanır
+        """
+        backoff = self._backoff.value
+        if backoff > 0:
+            time.sleep(backoff)
+        if not prefetched:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
+            self.consume(size)
+        heavy = self._heavy is not None and os.path.splitext(file_path)[1].lower() not in LIGHT_EXTS
+        if heavy:
+            self._heavy.acquire()
+        try:
+            yield
+        finally:
+            if heavy:
+                self._heavy.release()
+
+
+def system_load() -> Optional[float]:
+    """Çekirdek başına yük ortalaması; yük ortalaması olmayan sistemlerde (Windows) None"""
+    try:
+        return os.getloadavg()[0] / max(1, multiprocessing.cpu_count())
+    except (AttributeError, OSError):
+        return None
+
+
+def cpu_usage() -> Optional[float]:
+    """Son çağrıdan bu yana CPU kullanım oranı (0-1, psutil ile); ölçülemezse None"""
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.cpu_percent() / 100.0
+
+
+def cpu_wait_times() -> Optional[Tuple[int, int]]:
+    """Linux'ta /proc/stat'tan (toplam CPU zamanı, G/Ç bekleme zamanı); okunamazsa None"""
+    try:
+        with open('/proc/stat') as f:
+            fields = [int(v) for v in f.readline().split()[1:]]
+        return sum(fields), fields[4]
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class AdaptiveBackoff:
+    """
+    Sistem yükünü izleyip işçilerin dosya başına beklemesini ayarlayan iş parçacığı.
+
+    Yük veya G/Ç beklemesi yüksek eşiği aşınca bekleme iki katına çıkar
+    (en fazla max_backoff), ikisi de düşük eşiğin altına inince yarıya iner.
+    Yük ortalaması olmayan sistemlerde (Windows) yük yerine CPU kullanım
+    oranı kendi eşikleriyle (cpu_high / cpu_low) karşılaştırılır.
+    """
+
+    MIN_BACKOFF = 0.01
+
+    def __init__(self, throttle: WorkerThrottle, limits: ResourceLimits, interval: float = 2.0):
+        self.throttle = throttle
+        self.limits = limits
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._cpu_times = None
+
+    def start(self) -> None:
+        self._cpu_times = cpu_wait_times()
+        if system_load() is None:
+            # psutil.cpu_percent ilk çağrıda ölçüm başlatır
+            cpu_usage()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join(self.interval)
+        self.throttle.backoff = 0.0
+
+    def _run(self) -> None:
+        limits = self.limits
+        while not self._stop.wait(self.interval):
+            load = system_load()
+            if load is not None:
+                load_high, load_low = load > limits.load_high, load < limits.load_low
+            else:
+                usage = cpu_usage()
+                load_high = usage is not None and usage > limits.cpu_high
+                load_low = usage is None or usage < limits.cpu_low
+            # G/Ç bekleme yüzdesi iki örnek arasındaki farktan hesaplanır
+            iowait = None
+            times = cpu_wait_times()
+            if times and self._cpu_times and times[0] > self._cpu_times[0]:
+                iowait = 100.0 * (times[1] - self._cpu_times[1]) / (times[0] - self._cpu_times[0])
+            self._cpu_times = times
+            high = load_high or (iowait is not None and iowait > limits.iowait_high)
+            low = load_low and (iowait is None or iowait < limits.iowait_low)
+            backoff = self.throttle.backoff
+            if high:
+                backoff = min(limits.max_backoff, max(self.MIN_BACKOFF, backoff * 2))
+            elif low:
+                backoff = backoff / 2 if backoff / 2 >= self.MIN_BACKOFF else 0.0
+            self.throttle.backoff = backoff
+
+
+class ResourceGovernor:
+    """
+    Bir aramanın kaynak sınırlarını yöneten sınıf.
+
+    Ebeveyn süreçte oluşturulur; işçilere aktarılacak sınırlayıcıyı ve
+    uyarlamalı izleyiciyi barındırır. Sınır yoksa throttle None'dır ve
+    işçilerde hiçbir ek iş yapılmaz.
+    """
+
+    def __init__(self, limits: Optional[ResourceLimits] = None):
+        self.limits = limits or ResourceLimits()
+        self.throttle = WorkerThrottle(self.limits) if self.limits.throttled else None
+        self._monitor = None
+
+    def worker_count(self, default: Optional[int] = None) -> int:
+        return self.limits.worker_count(default)
+
+    @property
+    def backoff(self) -> float:
+        """Uyarlamalı modda işçilerin dosya başına beklemesi (saniye)"""
+        return self.throttle.backoff if self.throttle is not None else 0.0
+
+    def __enter__(self):
+        if self.throttle is not None and self.limits.adaptive:
+            self._monitor = AdaptiveBackoff(self.throttle, self.limits)
+            self._monitor.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._monitor is not None:
+            self._monitor.stop()
+            self._monitor = None
@@ -0,0 +1,155 @@
+import hashlib
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from app_cache import cache_path, load_pickle, save_pickle
+from query import MATCH_FUZZY
+
+# 2: sonuçlar eşleşen satırları (lines) da içerir
+# 3: büyük/küçük harf duyarsız aramada I/ı/i/İ eşit sayılır
+# 4: satırlar özetteki eşleşme konumlarını (matches) da içerir
+RESULT_CACHE_VERSION = 4
+
+# Sonuçla birlikte saklanmayan, her aramada yeniden hesaplanan alanlar
+_TRANSIENT_FIELDS = ('duplicates', 'score')
+
+
+def query_cache_key(query, extensions: Iterable[str], root: Union[str, List[str]]) -> str:
+    """
+    Sorgu, seçenekler, dosya türleri ve kök klasör(ler)den önbellek anahtarı üretir.
+
+    Anahtar kelimeler sorgunun kendi kurallarıyla katlanıp boşlukları
+    sadeleştirildiğinden "Fatura  No" ile "fatura no" aynı kaydı kullanır
+    (büyük/küçük harf duyarsız aramada). Düzenli ifadeler olduğu gibi kullanılır.
+    """
+    if query.use_regex:
+        keywords = list(query.keywords)
+    else:
+        keywords = [' '.join(query.folder.fold_str(k).split()) for k in query.keywords]
+    parts = (
+        RESULT_CACHE_VERSION,
+        keywords,
+        query.match_type,
+        query.case_sensitive,
+        query.use_regex,
+        query.max_errors if query.match_type == MATCH_FUZZY else None,
+        query.ignore_diacritics,
+        sorted(set(extensions)),
+        os.path.abspath(root) if isinstance(root, str) else sorted(os.path.abspath(path) for path in root),
+    )
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CachedResult:
+    """
+    Bir sorgunun dosya başına sonuçları ve dosyaların arandığı andaki stat bilgileri.
+
+    Eşleşmeyen dosyalar da kaydedilir; böylece tekrar aramada yalnızca
+    yeni ve değişmiş dosyalar aranır.
+    """
+
+    __slots__ = ('files', 'hits')
+
+    def __init__(self, files: Optional[Dict[str, Tuple[float, int]]] = None,
+                 hits: Optional[Dict[str, List[dict]]] = None):
+        # dosya yolu -> (mtime, boyut)
+        self.files = files or {}
+        # dosya yolu -> o dosyadaki sonuçlar (arşivde her üye ayrı sonuçtur)
+        self.hits = hits or {}
+
+    def partition(self, entries) -> Tuple['CachedResult', List]:
+        """
+        Taranan dosyaları önbellekteki kayıtlarla karşılaştırır.
+
+        Girdilerin stat bilgisi taramada (veya kontrol noktasından devamda)
+        yeni alınmıştır; dosyalar burada yeniden stat edilmez.
+
+        Args:
+            entries: DirectoryWalker'ın (veya ScanCheckpoint.file_entries'in) FileEntry nesneleri
+
+        Returns:
+            (değişmemiş dosyaların kayıtları, yeniden aranması gereken girdiler);
+            artık bulunmayan dosyaların kayıtları atılır
+        """
+        kept = CachedResult()
+        changed = []
+        for entry in entries:
+            stamp = self.files.get(entry.path)
+            if stamp == (entry.mtime, entry.size):
+                kept.files[entry.path] = stamp
+                if entry.path in self.hits:
+                    kept.hits[entry.path] = self.hits[entry.path]
+            else:
+                changed.append(entry)
+        return kept, changed
+
+    def update(self, other: 'CachedResult') -> None:
+        """Diğer kaydın (daha yeni) dosya sonuçlarını bu kayda aktarır"""
+        for path, stamp in other.files.items():
+            self.files[path] = stamp
+            if path in other.hits:
+                self.hits[path] = other.hits[path]
+            else:
+                self.hits.pop(path, None)
+
+    def iter_hits(self) -> Iterator[dict]:
+        """Kayıtlı sonuçların kopyaları"""
+        for hits in self.hits.values():
+            for hit in hits:
+                yield dict(hit)
+
+    def record(self, entry, hits: List[dict]) -> None:
+        """Aranan dosyanın sonucunu kaydeder"""
+        self.files[entry.path] = (entry.mtime, entry.size)
+        if hits:
+            self.hits[entry.path] = [
+                {k: v for k, v in hit.items() if k not in _TRANSIENT_FIELDS} for hit in hits
+            ]
+        else:
+            self.hits.pop(entry.path, None)
+
+
+class QueryResultCache:
+    """
+    Sorgu sonuçlarının diskteki önbelleği.
+
+    Her sorgu anahtarı ayrı bir dosyada saklanır; en son kullanılan
+    MAX_ENTRIES sorgu tutulur, eskileri silinir.
+    """
+
+    MAX_ENTRIES = 64
+
+    def __init__(self, directory: Optional[str] = None):
+        self.directory = directory or cache_path('sorgu_sonuclari')
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.pkl')
+
+    def load(self, key: str) -> CachedResult:
+        """Sorgunun kayıtlı sonuçları (yoksa boş kayıt)"""
+        data = load_pickle(self._path(key), {})
+        if data.get('version') != RESULT_CACHE_VERSION:
+            return CachedResult()
+        return CachedResult(data['files'], data['hits'])
+
+    def store(self, key: str, result: CachedResult) -> None:
+        """Sonuçları kaydeder ve en eski sorguları atar"""
+        data = {'version': RESULT_CACHE_VERSION, 'files': result.files, 'hits': result.hits}
+        try:
+            save_pickle(self._path(key), data)
+        except Exception as e:
+            print(f"Sorgu sonuçları kaydedilemedi {key}: {str(e)}")
+            return
+        self._evict()
+
+    def _evict(self) -> None:
+        try:
+            names = [name for name in os.listdir(self.directory) if name.endswith('.pkl')]
+            if len(names) <= self.MAX_ENTRIES:
+                return
+            paths = sorted((os.path.join(self.directory, name) for name in names), key=os.path.getmtime)
+            for path in paths[:len(paths) - self.MAX_ENTRIES]:
+                os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,251 @@
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Dışa aktarılan her satırın alanları (bir satır = bir dosya yolu)
+EXPORT_FIELDS = ['file_path', 'file_name', 'file_type', 'keywords', 'line_numbers', 'snippets',
+                 'mtime', 'duplicate_of', 'worker']
+EXPORT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet', '.txt': 'txt'}
+# Bir dosya için kaydedilecek en fazla eşleşen satır ve satır özeti uzunluğu
+MAX_LINES_PER_FILE = 100
+SNIPPET_CHARS = 160
+
+
+def _line_window(line: str, column: int, width: int = SNIPPET_CHARS) -> Tuple[str, int, int, int]:
+    """
+    Satırın eşleşme konumu etrafındaki en fazla `width` karakterlik kısmı.
+
+    Returns:
+        (özet, kayma, görünen başlangıç, görünen bitiş); satırdaki bir konum
+        özette `konum + kayma` konumundadır, '…' işaretleri görünen aralığın dışındadır
+    """
+    if len(line) <= width:
+        snippet = line.strip()
+        return snippet, -(len(line) - len(line.lstrip())), 0, len(snippet)
+    start = max(0, min(column - width // 3, len(line) - width))
+    window = line[start:start + width]
+    snippet = window.strip()
+    shift = -start - (len(window) - len(window.lstrip()))
+    low = 0
+    if start > 0:
+        snippet = '…' + snippet
+        shift += 1
+        low = 1
+    high = len(snippet)
+    if start + width < len(line):
+        snippet += '…'
+    return snippet, shift, low, high
+
+
+def line_snippet(line: str, column: int, width: int = SNIPPET_CHARS) -> str:
+    """Satırın eşleşme konumu etrafındaki en fazla `width` karakterlik kısmı"""
+    return _line_window(line, column, width)[0]
+
+
+def match_lines(text: str, spans: Iterable[Tuple[int, int, int]], keywords: List[str],
+                max_lines: int = MAX_LINES_PER_FILE) -> List[dict]:
+    """
+    Eşleşmeleri satırlara dağıtır.
+
+    Satır numaraları konumlar sıralanıp aradaki satır sonları sayılarak
+    bulunur; metnin tamamı için satır tablosu kurulmaz. Her satırın özeti
+    ilk eşleşmenin etrafındaki pencere olup özetteki tüm eşleşmelerin
+    konumları da döndürülür; önizleme metni yeniden çıkarmadan vurgular.
+
+    Args:
+        text: Orijinal metin
+        spans: CompiledQuery.find_spans üçlüleri (orijinal metne göre konumlar)
+        keywords: Sorgunun anahtar kelimeleri
+        max_lines: Döndürülecek en fazla satır
+
+    Returns:
+        Satır sırasına göre {'line', 'keywords', 'snippet', 'matches'}
+        sözlükleri; 'matches' özetteki [başlangıç, bitiş) konum çiftleridir
+    """
+    lines: List[dict] = []
+    line_num = 1
+    pos = 0
+    # Son satırın metindeki başlangıcı, özet kayması ve görünen aralığı
+    line_start = shift = low = high = 0
+    for index, start, end in sorted(spans, key=lambda span: span[1]):
+        line_num += text.count('\n', pos, start)
+        pos = start
+        if lines and lines[-1]['line'] == line_num:
+            current = lines[-1]
+            if keywords[index] not in current['keywords']:
+                current['keywords'].append(keywords[index])
+        else:
+            if len(lines) >= max_lines:
+                break
+            line_start = text.rfind('\n', 0, start) + 1
+            line_end = text.find('\n', start)
+            if line_end == -1:
+                line_end = len(text)
+            snippet, shift, low, high = _line_window(text[line_start:line_end], start - line_start)
+            current = {'line': line_num, 'keywords': [keywords[index]], 'snippet': snippet, 'matches': []}
+            lines.append(current)
+        # Öbek eşleşmeleri satır sonunu aşabilir; özetin görünen kısmına kırpılır
+        match_start = max(start - line_start + shift, low)
+        match_end = min(end - line_start + shift, high)
+        if match_start < match_end:
+            current['matches'].append([match_start, match_end])
+    return lines
+
+
+def hit_rows(hit: dict) -> Iterator[Dict]:
+    """Sonucun dışa aktarılacak satırları; aynı içerikli kopyalar ayrı satırlardır"""
+    lines = hit.get('lines') or []
+    mtime = hit.get('mtime')
+    row = {
+        'file_path': hit['file_path'],
+        'file_name': hit.get('file_name') or os.path.basename(hit['file_path']),
+        'file_type': hit.get('file_type') or os.path.splitext(hit['file_path'])[1].lower(),
+        'keywords': list(hit.get('found_keywords', [])),
+        'line_numbers': [line['line'] for line in lines],
+        'snippets': [line['snippet'] for line in lines],
+        'mtime': datetime.fromtimestamp(mtime).isoformat(timespec='seconds') if mtime else None,
+        'duplicate_of': None,
+        'worker': hit.get('worker'),
+    }
+    yield row
+    for kopya in hit.get('duplicates') or ():
+        yield dict(row, file_path=kopya, file_name=os.path.basename(kopya), duplicate_of=hit['file_path'])
+
+
+def export_format(path: str) -> str:
+    """
+    Dosya uzantısından dışa aktarma biçimi.
+
+    Raises:
+        ValueError: Uzantı desteklenmiyorsa
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f"Desteklenmeyen dışa aktarma biçimi: {ext or path}")
+    return EXPORT_FORMATS[ext]
+
+
+def _parquet_schema():
+    import pyarrow as pa
+    return pa.schema([
+        ('file_path', pa.string()), ('file_name', pa.string()), ('file_type', pa.string()),
+        ('keywords', pa.list_(pa.string())), ('line_numbers', pa.list_(pa.int32())),
+        ('snippets', pa.list_(pa.string())), ('mtime', pa.string()),
+        ('duplicate_of', pa.string()), ('worker', pa.string()),
+    ])
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class ResultExporter:
+    """
+    Sonuçları arama sürerken diske yazan sınıf.
+
+    Sonuçlar geldikçe yazılır ve belirli aralıklarla diske boşaltılır;
+    arama yarıda kesilse bile o ana kadar bulunanlar dosyada kalır.
+    Biçim dosya uzantısından seçilir: .csv (Excel uyumlu UTF-8, RFC 4180
+    tırnaklama), .jsonl (satır başına bir JSON nesnesi), .parquet
+    (pyarrow gerekir) veya .txt (yalnızca yollar).
+    """
+
+    FLUSH_EVERY = 256
+    PARQUET_ROW_GROUP = 8192
+
+    def __init__(self, path: str, fmt: Optional[str] = None):
+        """
+        Raises:
+            ValueError: Biçim desteklenmiyorsa
+            RuntimeError: Parquet için pyarrow yüklü değilse
+            OSError: Dosya açılamazsa
+        """
+        self.path = path
+        self.format = fmt or export_format(path)
+        self.rows = 0
+        self._file = None
+        self._writer = None
+        self._buffer: List[Dict] = []
+        self._closed = False
+        if self.format == 'parquet':
+            if not parquet_available():
+                raise RuntimeError("Parquet olarak dışa aktarmak için pyarrow yüklü olmalı")
+        elif self.format == 'csv':
+            # BOM, Excel'in Türkçe karakterleri doğru okuması için yazılır
+            self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(EXPORT_FIELDS)
+        elif self.format in ('jsonl', 'txt'):
+            self._file = open(path, 'w', encoding='utf-8', newline='\n')
+        else:
+            raise ValueError(f"Desteklenmeyen dışa aktarma biçimi: {self.format}")
+
+    def write(self, hit: dict) -> None:
+        """Sonucu (ve varsa kopyalarını) yazar"""
+        for row in hit_rows(hit):
+            self.write_row(row)
+
+    def write_row(self, row: Dict) -> None:
+        if self.format == 'csv':
+            self._writer.writerow([
+                row['file_path'], row['file_name'], row['file_type'],
+                '; '.join(row['keywords']),
+                ', '.join(map(str, row['line_numbers'])),
+                '\n'.join(f"{line}: {snippet}" for line, snippet in zip(row['line_numbers'], row['snippets'])),
+                row['mtime'] or '', row['duplicate_of'] or '', row['worker'] or '',
+            ])
+        elif self.format == 'jsonl':
+            self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+        elif self.format == 'txt':
+            self._file.write(row['file_path'] + '\n')
+        else:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.PARQUET_ROW_GROUP:
+                self._write_parquet_batch()
+        self.rows += 1
+        if self.rows % self.FLUSH_EVERY == 0 and self._file is not None:
+            self._file.flush()
+
+    def flush(self) -> None:
+        """Yazılanları diske boşaltır (Parquet'te bir satır grubu yazar)"""
+        if self.format == 'parquet':
+            self._write_parquet_batch()
+        elif self._file is not None:
+            self._file.flush()
+
+    def _write_parquet_batch(self) -> None:
+        if not self._buffer:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, _parquet_schema())
+        self._writer.write_table(pa.Table.from_pylist(self._buffer, schema=self._writer.schema))
+        self._buffer = []
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self.flush()
+        if self.format == 'parquet':
+            if self._writer is None:
+                # Hiç sonuç yoksa da şemalı boş bir dosya oluşturulur
+                import pyarrow.parquet as pq
+                pq.write_table(_parquet_schema().empty_table(), self.path)
+            else:
+                self._writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
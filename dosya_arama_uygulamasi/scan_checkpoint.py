@@ -0,0 +1,141 @@
+import hashlib
+import os
+import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+from app_cache import cache_path, load_pickle, save_pickle
+from directory_walker import FileEntry
+from result_cache import CachedResult
+
+# 2: birden fazla kök ve aynı dosyaya giden diğer yollar
+CHECKPOINT_VERSION = 2
+
+
+def checkpoint_key(query_key: str, walk_options) -> str:
+    """Sorgu anahtarı ve taramayı etkileyen filtrelerden kontrol noktası anahtarı"""
+    parts = (CHECKPOINT_VERSION, query_key, sorted(walk_options.exclude_patterns),
+             sorted(walk_options.include_patterns), walk_options.same_filesystem, walk_options.follow_symlinks,
+             walk_options.max_depth, walk_options.min_size, walk_options.max_size,
+             walk_options.modified_after, walk_options.modified_before)
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+def roots_key(root: Union[str, List[str]]) -> str:
+    """Kök dizin(ler)in sıradan bağımsız kaydı"""
+    if isinstance(root, str):
+        return os.path.abspath(root)
+    return os.pathsep.join(sorted(os.path.abspath(path) for path in root))
+
+
+class ScanCheckpoint:
+    """
+    Uzun süren bir aramanın diske yazılan ilerleme kaydı.
+
+    Tarama aşamasında listelenmeyi bekleyen klasörler (sınır) ve o ana kadar
+    bulunan dosyalar, arama aşamasında aranmış dosyaların stat bilgileri ve
+    sonuçları saklanır. Kayıt en fazla `interval` saniyede bir atomik olarak
+    yazılır; uygulama kapansa veya makine uykuya geçse bile aynı sorgu aynı
+    klasörde yeniden çalıştırıldığında kaldığı yerden devam eder. Arama
+    tamamlanınca kayıt silinir.
+    """
+
+    def __init__(self, key: str, root: Union[str, List[str]], interval: float = 30.0,
+                 directory: Optional[str] = None):
+        self.key = key
+        self.root = roots_key(root)
+        self.interval = interval
+        self.path = os.path.join(directory or cache_path('kontrol_noktalari'), key + '.pkl')
+        # Tarama tamamlanmadıysa listelenecek klasörler: (yol, derinlik, st_dev, st_ino)
+        self.frontier: List[Tuple[str, int, int, int]] = []
+        self.walk_done = False
+        # Uzantı filtresine uyan dosyalar: (yol, boyut, mtime, st_dev, st_ino)
+        self.entries: List[Tuple[str, int, float, int, int]] = []
+        # Taranan tüm dosya yolları (indeks budaması için)
+        self.walked: Set[str] = set()
+        # Dosyanın ilk bulunan yolu -> aynı dosyaya giden diğer yollar
+        self.aliases: Dict[str, List[str]] = {}
+        self.results = CachedResult()
+        self.created = time.time()
+        self.resumed = False
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def load(cls, key: str, root: Union[str, List[str]], interval: float = 30.0, directory: Optional[str] = None) -> 'ScanCheckpoint':
+        """Kayıtlı ilerlemeyi yükler; yoksa veya uyumsuzsa boş kayıt döndürür"""
+        checkpoint = cls(key, root, interval, directory)
+        data = load_pickle(checkpoint.path, {})
+        if data.get('version') != CHECKPOINT_VERSION or data.get('root') != checkpoint.root:
+            return checkpoint
+        checkpoint.frontier = data['frontier']
+        checkpoint.walk_done = data['walk_done']
+        checkpoint.entries = data['entries']
+        checkpoint.walked = data['walked']
+        checkpoint.aliases = data['aliases']
+        checkpoint.results = CachedResult(data['files'], data['hits'])
+        checkpoint.created = data['created']
+        checkpoint.resumed = True
+        return checkpoint
+
+    @property
+    def walk_started(self) -> bool:
+        """Devam ettirilecek bir tarama var mı"""
+        return self.walk_done or bool(self.frontier)
+
+    def file_entries(self) -> List[FileEntry]:
+        """Kayıtlı dosyaları yeniden stat ederek döndürür; silinmiş dosyalar atılır"""
+        entries = []
+        for path, *_ in self.entries:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            entries.append(FileEntry(path, st.st_size, st.st_mtime, st.st_dev, st.st_ino))
+        return entries
+
+    def due(self) -> bool:
+        """Son yazmadan bu yana `interval` saniye geçti mi"""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def record_walk(self, frontier: Dict[str, Tuple[int, int, int]], entries: List[FileEntry],
+                    walked: Set[str], aliases: Dict[str, List[str]], done: bool = False) -> None:
+        """Taramanın o anki durumunu diske yazar"""
+        self.frontier = [(path, depth, dev, ino) for path, (depth, dev, ino) in frontier.items()]
+        self.walk_done = done
+        self.entries = [(e.path, e.size, e.mtime, e.dev, e.ino) for e in entries]
+        self.walked = set(walked)
+        self.aliases = {path: list(paths) for path, paths in aliases.items()}
+        self.save()
+
+    def record_results(self, results: CachedResult) -> None:
+        """Aranan dosyaların sonuçlarını diske yazar"""
+        self.results = results
+        self.save()
+
+    def save(self) -> bool:
+        data = {
+            'version': CHECKPOINT_VERSION,
+            'root': self.root,
+            'frontier': self.frontier,
+            'walk_done': self.walk_done,
+            'entries': self.entries,
+            'walked': self.walked,
+            'aliases': self.aliases,
+            'files': self.results.files,
+            'hits': self.results.hits,
+            'created': self.created,
+        }
+        try:
+            save_pickle(self.path, data)
+        except Exception as e:
+            print(f"Kontrol noktası kaydedilemedi {self.path}: {str(e)}")
+            return False
+        finally:
+            self._last_save = time.monotonic()
+        return True
+
+    def remove(self) -> None:
+        """Tamamlanan aramanın kaydını siler"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,386 @@
+import io
+import multiprocessing
+import os
+from contextlib import nullcontext
+from multiprocessing import Pool
+
+from directory_walker import DirectoryWalker, WalkOptions
+from extractors import archive_outer_path, extract_text, iter_archive_members, ARCHIVE_EXTS
+from io_scheduler import PrefetchReader, locality_order, prefetched_batches
+from ngram_filter import build_signature
+from positional_index import index_document
+from ranking import document_length, filename_matches, term_frequencies
+from resource_governor import ResourceGovernor
+from result_export import match_lines
+from search_trace import TraceRecorder
+
+# Dosya türü kategorileri (arayüz ve arama sunucusu ortak kullanır)
+TXT_EXTS = ['.txt']
+PDF_EXTS = ['.pdf']
+OFFICE_EXTS = ['.docx', '.docm', '.dotx', '.dotm', '.xlsx', '.xlsm', '.xltx', '.xltm', '.xlsb', '.pptx', '.pptm', '.ppsx', '.ppsm', '.potx', '.potm', '.vsdx', '.vsd']
+# Arşivler indekslenirken içlerindeki desteklenen tüm türler indekse alınır
+INDEXED_EXTS = TXT_EXTS + PDF_EXTS + OFFICE_EXTS + ARCHIVE_EXTS
+# Aramada işçilere gönderilen türler
+SEARCHED_EXTS = set(INDEXED_EXTS)
+
+# Görev gruplama: her grubun tahmini maliyeti (bayt) bu sınırlar arasında,
+# toplam iş işçi başına yaklaşık BATCHES_PER_WORKER gruba bölünecek şekilde seçilir
+MIN_BATCH_COST = 256 * 1024
+MAX_BATCH_COST = 16 * 1024 * 1024
+MAX_BATCH_FILES = 512
+BATCHES_PER_WORKER = 16
+# Dosya açma/çıkarma sabit maliyeti; ayrıştırılması pahalı türler için daha yüksek
+FILE_OVERHEAD = 4 * 1024
+PARSED_FILE_OVERHEAD = 256 * 1024
+
+# İşçi süreçte havuz başlatılırken bir kez ayarlanır
+_worker_query = None
+_worker_extensions = None
+# Kaynak sınırı varsa resource_governor.WorkerThrottle
+_worker_throttle = None
+# Aranan dosyaların n-gram imzaları da döndürülsün mü
+_worker_signatures = False
+# İz kaydı açıksa işçinin search_trace.TraceRecorder nesnesi
+_worker_trace = None
+
+def build_hit(file_path, query, doc, mtime):
+    """Eşleşen dosya için sıralamada ve dışa aktarmada kullanılacak bilgileri toplar"""
+    # Eşleşmeler bir kez bulunur; hem terim frekansları hem satır bilgileri bunlardan çıkarılır
+    spans = list(query.find_spans(doc))
+    tf = term_frequencies(query, doc, spans)
+    return {
+        'file_path': file_path,
+        'file_name': os.path.basename(file_path),
+        'file_type': os.path.splitext(file_path)[1].lower(),
+        'found_keywords': [k for k, n in tf.items() if n],
+        'term_frequencies': tf,
+        'doc_length': document_length(doc.text),
+        'mtime': mtime,
+        'name_match': filename_matches(query, file_path),
+        'lines': match_lines(doc.original, spans, query.keywords),
+    }
+
+def file_search_worker(args):
+    """Tek bir dosyada (veya arşivdeki her üyede) arama yapar, eşleşen sonuçların listesini döndürür"""
+    return search_file(*args)
+
+def search_file(file_path, query, extensions, data=None, mtime=None, signatures=None):
+    """
+    Dosyayı (arşivde her üyeyi) arar.
+
+    Args:
+        data: Dosyanın önceden okunmuş içeriği; verilirse dosya diskten okunmaz
+        mtime: Dosyanın değişiklik zamanı; verilmezse stat ile alınır
+        signatures: Verilirse çıkarılan metnin n-gram imzası bu sözlüğe
+            dosya yoluyla eklenir (arşivler imzalanmaz)
+    """
+    file_extension = os.path.splitext(file_path)[1].lower()
+    if file_extension in ARCHIVE_EXTS:
+        return archive_search_worker(file_path, query, extensions, data, mtime)
+    try:
+        if file_extension == '.txt':
+            # Düz metinde ön filtre çözümlemeden önce ham baytlara uygulanır
+            if data is None:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            if not query.prefilter_bytes(data):
+                return []
+            content = extract_text(io.BytesIO(data), file_extension)
+        else:
+            content = extract_text(io.BytesIO(data) if data is not None else file_path, file_extension)
+        if content is None:
+            return []
+        if signatures is not None:
+            signatures[file_path] = build_signature(content)
+        # Belge bir kez katlanır, tüm anahtar kelimeler katlanmış metinde aranır
+        doc = query.fold(content)
+        if query.matches(doc):
+            return [build_hit(file_path, query, doc, mtime if mtime is not None else os.path.getmtime(file_path))]
+    except Exception:
+        return []
+    return []
+
+def init_search_worker(query, extensions, throttle=None, signatures=False, trace_dir=None):
+    """
+    Havuzdaki her işçi sürecin başında bir kez çalışır.
+
+    Derlenmiş sorgu ve uzantılar her görevle yeniden gönderilmez;
+    görevler yalnızca dosya yollarını taşır.
+    """
+    global _worker_query, _worker_extensions, _worker_signatures
+    _worker_query = query
+    _worker_extensions = extensions
+    _worker_signatures = signatures
+    init_index_worker(throttle, trace_dir)
+
+def init_index_worker(throttle=None, trace_dir=None):
+    """
+    İşçi süreçte kaynak sınırlarını (öncelik, okuma hızı, ayrıştırma sınırı)
+    ve istenirse iz kaydını (cProfile ve dosya olayları) etkinleştirir.
+    """
+    global _worker_throttle, _worker_trace
+    _worker_throttle = throttle
+    if throttle is not None:
+        throttle.start_worker()
+    _worker_trace = TraceRecorder(f"İşçi {os.getpid()}", trace_dir) if trace_dir else None
+
+def _throttled(file_path, prefetched=False):
+    return _worker_throttle.file(file_path, prefetched) if _worker_throttle is not None else nullcontext()
+
+def _traced_task():
+    """İz kaydı açıksa görev süresince işçinin profilini açar"""
+    return _worker_trace.task() if _worker_trace is not None else nullcontext()
+
+def _traced_file(file_path):
+    """İz kaydı açıksa dosyanın aranmasını zaman çizelgesine ekler; olayın argümanlarını verir"""
+    return _worker_trace.file(file_path) if _worker_trace is not None else nullcontext({})
+
+def search_batch_task(file_paths):
+    """
+    Bir grup dosyayı arar; sonuçları tek seferde döndürür.
+
+    Returns:
+        (dosya yolu, sonuçlar, imza) üçlüleri; imza yalnızca havuz imzalarla
+        başlatıldıysa ve dosyanın metni çıkarıldıysa doludur, aksi halde None
+    """
+    signatures = {} if _worker_signatures else None
+    results = []
+    with _traced_task():
+        for fp in file_paths:
+            with _throttled(fp), _traced_file(fp) as event:
+                hits = search_file(fp, _worker_query, _worker_extensions, signatures=signatures)
+                event['hits'] = len(hits)
+            results.append((fp, hits, signatures.pop(fp, None) if signatures is not None else None))
+    return results
+
+def search_bytes_task(items):
+    """
+    Önceden okunmuş bir grup dosyayı arar (sıralı disk okuma modu).
+
+    Args:
+        items: (dosya yolu, mtime, içerik) üçlüleri; içerik None ise dosya diskten okunur
+
+    Returns:
+        search_batch_task ile aynı biçimde (dosya yolu, sonuçlar, imza) üçlüleri
+    """
+    signatures = {} if _worker_signatures else None
+    results = []
+    with _traced_task():
+        for fp, mtime, data in items:
+            with _throttled(fp, prefetched=data is not None), _traced_file(fp) as event:
+                hits = search_file(fp, _worker_query, _worker_extensions, data, mtime, signatures)
+                event['hits'] = len(hits)
+                event['prefetched'] = data is not None
+            results.append((fp, hits, signatures.pop(fp, None) if signatures is not None else None))
+    return results
+
+def search_pool(query, extensions, processes=None, throttle=None, signatures=False, trace_dir=None):
+    """
+    Sorguyu (ve varsa kaynak sınırlayıcıyı) işçilere başlangıçta bir kez gönderen süreç havuzu.
+
+    signatures True ise işçiler aradıkları dosyaların n-gram imzalarını da
+    döndürür. trace_dir verilirse işçiler profil ve dosya olaylarını bu
+    klasöre yazar (search_trace.SearchTrace); kalan kayıtların yazılması için
+    havuz terminate yerine close/join ile kapatılmalıdır.
+    """
+    return Pool(processes=processes or max(1, multiprocessing.cpu_count()-1),
+                initializer=init_search_worker, initargs=(query, extensions, throttle, signatures, trace_dir))
+
+def index_pool(processes, throttle=None, trace_dir=None):
+    """İndeksleme için süreç havuzu (trace_dir için bkz. search_pool)"""
+    return Pool(processes=processes, initializer=init_index_worker, initargs=(throttle, trace_dir))
+
+def index_chunksize(count, processes):
+    """İndeksleme görevlerinin imap chunksize değeri (işçi başına ~BATCHES_PER_WORKER grup, en fazla 64 dosya)"""
+    return max(1, min(64, count // (max(1, processes) * BATCHES_PER_WORKER)))
+
+def batch_target(total_cost, processes):
+    """Toplam maliyete göre bir görev grubunun hedef maliyeti"""
+    return min(MAX_BATCH_COST, max(MIN_BATCH_COST, total_cost // (max(1, processes) * BATCHES_PER_WORKER)))
+
+def prefetch_reader(entries, should_stop=None, throttle=None):
+    """
+    Dosyaları disk yerleşimine göre sıralayıp sırayla okuyan okuyucu.
+
+    Döner disklerde ve ağ paylaşımlarında işçilerin aynı anda farklı
+    dosyaları okuması diski rastgele erişime zorlar; bu modda okumayı
+    az sayıda okuyucu yapar, işçiler yalnızca bellekteki içeriği ayrıştırır.
+    """
+    return PrefetchReader(locality_order(entries), should_stop=should_stop, throttle=throttle)
+
+def sequential_batches(entries, processes, should_stop=None, throttle=None):
+    """Dosyaları disk sırasıyla okuyup search_bytes_task gruplarına ayırır"""
+    entries = list(entries)
+    target = batch_target(sum(estimated_cost(e.path, e.size) for e in entries), processes)
+    return prefetched_batches(prefetch_reader(entries, should_stop, throttle), target, MAX_BATCH_FILES)
+
+def estimated_cost(file_path, size):
+    """Dosyanın aranma maliyeti tahmini (bayt cinsinden)"""
+    if os.path.splitext(file_path)[1].lower() in TXT_EXTS:
+        return size + FILE_OVERHEAD
+    return size + PARSED_FILE_OVERHEAD
+
+def plan_batches(files, processes):
+    """
+    Dosyaları işçilere gönderilecek, maliyeti dengeli gruplara ayırır.
+
+    Grup boyutu toplam işe göre uyarlanır: az dosyada gruplar küçük kalır
+    (işçiler boş beklemez), çok sayıda küçük dosyada yüzlerce dosya tek
+    görevde gider. Dosyalar önce türe göre (düz metin önce) sıralanır;
+    bir grupta tek tür bulunur.
+
+    Args:
+        files: (dosya yolu, boyut) çiftleri
+        processes: İşçi süreç sayısı
+
+    Returns:
+        Dosya yolu listelerinden oluşan gruplar
+    """
+    costed = sorted(((category_rank(path), path, estimated_cost(path, size)) for path, size in files),
+                    key=lambda item: item[0])
+    target = batch_target(sum(cost for _, _, cost in costed), processes)
+    batches = []
+    current = []
+    current_cost = 0
+    current_rank = None
+    for rank, path, cost in costed:
+        if current and (rank != current_rank or current_cost + cost > target or len(current) >= MAX_BATCH_FILES):
+            batches.append(current)
+            current = []
+            current_cost = 0
+        current.append(path)
+        current_cost += cost
+        current_rank = rank
+    if current:
+        batches.append(current)
+    return batches
+
+def hit_for_copy(hit, source, kopya):
+    """Kaynak dosyanın sonucunu aynı içerikli kopyaya uyarlar"""
+    path = kopya + hit['file_path'][len(source):]
+    return dict(hit, file_path=path, file_name=os.path.basename(path))
+
+def archive_search_worker(file_path, query, extensions, data=None, mtime=None):
+    """Arşiv üyelerini diske açmadan aynı çıkarıcılardan geçirir"""
+    found = []
+    if mtime is None:
+        try:
+            mtime = os.path.getmtime(file_path)
+        except OSError:
+            return found
+    source = io.BytesIO(data) if data is not None else file_path
+    for virtual_path, ext, stream in iter_archive_members(source, file_path, extensions):
+        try:
+            content = extract_text(stream, ext)
+        except Exception:
+            continue
+        if not content:
+            continue
+        doc = query.fold(content)
+        if query.matches(doc):
+            found.append(build_hit(virtual_path, query, doc, mtime))
+    return found
+
+def index_worker(file_path):
+    """
+    Dosyanın (arşivde her üyenin) kelime konumlarını çıkarır.
+
+    Returns:
+        (dosya yolu, belge listesi); metin çıkarılamadıysa belge listesi None
+        olur ve dosya bir sonraki aramada yeniden denenir
+    """
+    with _traced_task(), _throttled(file_path), _traced_file(file_path):
+        return _index_file(file_path)
+
+def index_bytes_task(item):
+    """Önceden okunmuş (dosya yolu, mtime, içerik) üçlüsünü indeksler (sıralı disk okuma modu)"""
+    file_path, _, data = item
+    with _traced_task(), _throttled(file_path, prefetched=data is not None), _traced_file(file_path):
+        return _index_file(file_path, data)
+
+def _index_file(file_path, data=None):
+    file_extension = os.path.splitext(file_path)[1].lower()
+    source = io.BytesIO(data) if data is not None else file_path
+    documents = []
+    try:
+        if file_extension in ARCHIVE_EXTS:
+            for virtual_path, ext, stream in iter_archive_members(source, file_path, INDEXED_EXTS):
+                try:
+                    content = extract_text(stream, ext)
+                except Exception:
+                    continue
+                if content:
+                    documents.append((virtual_path,) + index_document(content))
+            return file_path, documents
+        content = extract_text(source, file_extension)
+    except Exception:
+        return file_path, None
+    if content is None:
+        return file_path, None
+    if content:
+        documents.append((file_path,) + index_document(content))
+    return file_path, documents
+
+def category_rank(file_path):
+    """Dosyaların aranma sırası: önce hızlı okunan düz metinler, en son arşivler"""
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in TXT_EXTS:
+        return 0
+    if ext in OFFICE_EXTS:
+        return 1
+    if ext in PDF_EXTS:
+        return 2
+    return 3
+
+def search_tree(root, query, extensions, walk_options=None, should_stop=None, processes=None, limits=None,
+                sequential_io=False):
+    """
+    Klasörü tarar ve dosyaları işçi süreçlerde arar (arayüzsüz kullanım, ör. arama sunucusu).
+
+    Args:
+        root: Aranacak klasör (veya klasör listesi)
+        query: CompiledQuery
+        extensions: Aranacak dosya uzantıları
+        walk_options: Tarama filtreleri
+        should_stop: True döndürürse arama durdurulur
+        processes: İşçi süreç sayısı (None ise çekirdek sayısı - 1)
+        limits: resource_governor.ResourceLimits (işçi sayısı, öncelik, okuma hızı sınırları)
+        sequential_io: Dosyaları disk sırasıyla az sayıda okuyucuyla oku (döner disk / ağ paylaşımı)
+
+    Yields:
+        Önce bir kez ('total', dosya sayısı), ardından her sonuç için
+        ('hit', sonuç) ve her 100 dosyada bir ('progress', aranan dosya sayısı)
+    """
+    should_stop = should_stop or (lambda: False)
+    walker = DirectoryWalker(walk_options or WalkOptions(), should_stop=should_stop)
+    entries = [entry for entry in walker.walk(root) if os.path.splitext(entry.path)[1].lower() in extensions]
+    if should_stop():
+        return
+    yield 'total', len(entries)
+    if not entries:
+        return
+    governor = ResourceGovernor(limits)
+    processes = governor.worker_count(processes)
+    done = 0
+    with governor, search_pool(query, extensions, processes, governor.throttle) as pool:
+        if sequential_io:
+            tasks = pool.imap_unordered(search_bytes_task,
+                                        sequential_batches(entries, processes, should_stop, governor.throttle))
+        else:
+            tasks = pool.imap_unordered(search_batch_task,
+                                        plan_batches([(entry.path, entry.size) for entry in entries], processes))
+        for results in tasks:
+            if should_stop():
+                pool.terminate()
+                return
+            for _, hits, _ in results:
+                for hit in hits:
+                    # Aynı dosyaya giden diğer yollar (sabit bağlantı, bind mount) sonuçta listelenir
+                    source = archive_outer_path(hit['file_path'])
+                    if source in walker.aliases:
+                        hit['duplicates'] = [path + hit['file_path'][len(source):] for path in walker.aliases[source]]
+                    yield 'hit', hit
+            # İlerleme her 100 dosyalık eşik aşıldığında bildirilir
+            if (done + len(results)) // 100 > done // 100:
+                yield 'progress', done + len(results)
+            done += len(results)
@@ -0,0 +1,273 @@
+import cProfile
+import glob
+import json
+import os
+import pstats
+import shutil
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager
+from multiprocessing.util import Finalize
+from typing import Dict, Iterator, List, Optional
+
+# İşçiler profil ve olaylarını en fazla bu aralıkla iz klasörüne yazar
+# (her dosyada yazmak pahalıdır); kalanlar süreç kapanırken yazılır
+FLUSH_INTERVAL = 1.0
+# Toplam süresi bundan kısa olan çağrı dalları alev grafiğine eklenmez (saniye)
+MIN_STACK_TIME = 1e-4
+
+
+def _now_us() -> int:
+    """Süreçler arasında karşılaştırılabilen zaman damgası (mikrosaniye)"""
+    return time.time_ns() // 1000
+
+
+class TraceRecorder:
+    """
+    Tek bir sürecin profili ve dosya olayları.
+
+    cProfile yalnızca `profiling()` bloklarında (ör. işçide görev çalışırken)
+    açıktır; böylece işçilerin görev beklerken geçen süresi profile girmez.
+    İşçilerde `directory` verilir ve kayıtlar aralıklarla bu klasöre yazılır.
+    """
+
+    def __init__(self, process_name: str, directory: Optional[str] = None):
+        """
+        Args:
+            process_name: İzde gösterilecek süreç adı
+            directory: Verilirse profil ve olaylar bu klasöre yazılır (işçi süreçler)
+        """
+        self.process_name = process_name
+        self.directory = directory
+        self.pid = os.getpid()
+        self.profile = cProfile.Profile()
+        self.events: List[dict] = []
+        self._depth = 0
+        self._last_flush = time.monotonic()
+        if directory is not None:
+            # Havuz kapanırken (close/join) kalan kayıtlar yazılır
+            Finalize(self, self.flush, exitpriority=10)
+
+    @contextmanager
+    def profiling(self) -> Iterator[None]:
+        """Blok süresince profili açar (iç içe kullanılabilir)"""
+        if self._depth == 0:
+            self.profile.enable()
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            if self._depth == 0:
+                self.profile.disable()
+
+    @contextmanager
+    def task(self) -> Iterator[None]:
+        """İşçi görevi: profil açılır, görev bitince kayıtlar gerekirse yazılır"""
+        with self.profiling():
+            yield
+        if time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    @contextmanager
+    def span(self, name: str, category: str = 'phase', **args) -> Iterator[dict]:
+        """
+        Zaman çizelgesine bir olay ekler.
+
+        Yields:
+            Olayın argümanları; blok içinde eklenenler (ör. sonuç sayısı) olaya yazılır
+        """
+        start = _now_us()
+        try:
+            yield args
+        finally:
+            self.events.append({'name': name, 'cat': category, 'ph': 'X', 'ts': start,
+                                'dur': max(1, _now_us() - start), 'pid': self.pid, 'tid': 0, 'args': args})
+
+    @contextmanager
+    def file(self, file_path: str) -> Iterator[dict]:
+        """Bir dosyanın aranması; olay adı dosya adıdır, tam yol argümanlardadır"""
+        with self.span(os.path.basename(file_path), os.path.splitext(file_path)[1].lower() or 'dosya',
+                       path=file_path) as args:
+            yield args
+
+    def stats(self) -> Optional[pstats.Stats]:
+        """Profilin istatistikleri; hiç çağrı kaydedilmediyse None"""
+        self.profile.create_stats()
+        if not self.profile.stats:
+            return None
+        return pstats.Stats(self.profile)
+
+    def flush(self) -> None:
+        """Profili ve yeni olayları iz klasörüne yazar (profil dosyası her seferinde güncellenir)"""
+        if self.directory is None:
+            return
+        self._last_flush = time.monotonic()
+        base = os.path.join(self.directory, f'isci-{self.pid}')
+        try:
+            if self._depth == 0:
+                self.profile.dump_stats(base + '.prof')
+            if self.events:
+                with open(base + '.events.jsonl', 'a', encoding='utf-8') as f:
+                    for event in self.events:
+                        f.write(json.dumps(event, ensure_ascii=False) + '\n')
+                self.events = []
+        except OSError:
+            pass
+
+
+def _frame_name(func) -> str:
+    filename, line, name = func
+    if filename == '~':
+        # Yerleşik fonksiyonlar: "<built-in method builtins.len>" gibi
+        label = name
+    else:
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+    return label.replace(';', ',')
+
+
+def collapsed_stacks(stats: pstats.Stats, root: str) -> Counter:
+    """
+    cProfile istatistiklerini alev grafiği araçlarının okuduğu yığın biçimine çevirir.
+
+    cProfile tam yığınları değil, çağıran -> çağrılan kenarlarını ve
+    sürelerini tutar. Yığınlar kök fonksiyonlardan başlanarak kurulur; bir
+    fonksiyonun süresi, çağrıldığı yollar arasında çağıranın o yoldaki
+    payıyla orantılı dağıtılır. Özyinelemeli çağrılar yolda bir kez gösterilir.
+
+    Args:
+        stats: pstats.Stats
+        root: Tüm yığınların başına eklenecek çerçeve (ör. süreç adı)
+
+    Returns:
+        "kök;çağıran;çağrılan" -> öz süre (mikrosaniye)
+    """
+    entries = stats.stats
+    callees: Dict[tuple, List[tuple]] = {}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+    stacks = Counter()
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    # (fonksiyon, yol, yoldaki çerçeveler, fonksiyonun toplam süresinin bu yola düşen payı)
+    pending = [(func, (root, _frame_name(func)), {func}, 1.0) for func in roots]
+    while pending:
+        func, path, on_path, share = pending.pop()
+        own = entries[func][2] * share
+        if own > 0:
+            stacks[';'.join(path)] += int(round(own * 1e6))
+        for callee, edge_time in callees.get(func, ()):
+            total = entries[callee][3]
+            if callee in on_path or total <= 0 or edge_time * share < MIN_STACK_TIME:
+                continue
+            pending.append((callee, path + (_frame_name(callee),), on_path | {callee},
+                            min(1.0, edge_time * share / total)))
+    return +stacks
+
+
+def write_trace(prefix: str, recorders: List[TraceRecorder], work_dir: Optional[str] = None) -> List[str]:
+    """
+    Süreçlerin kayıtlarını birleştirip iz dosyalarını yazar.
+
+    Yazılan dosyalar:
+        <prefix>.folded: Alev grafiği yığınları (flamegraph.pl, speedscope, inferno);
+            her sürecin yığınları süreç adıyla başlar
+        <prefix>.trace.json: Dosya başına olayların zaman çizelgesi (Chrome
+            trace biçimi; chrome://tracing veya Perfetto ile açılır)
+        <prefix>.prof: Tüm süreçlerin birleştirilmiş profili (pstats, snakeviz)
+
+    Args:
+        prefix: Çıktı dosyalarının ortak yolu (uzantısız)
+        recorders: Bu süreçteki kayıtlar
+        work_dir: İşçilerin yazdığı profil ve olay dosyalarının klasörü
+
+    Returns:
+        Yazılan dosyaların yolları
+    """
+    profiles = []
+    events: List[dict] = []
+    names = {}
+    for recorder in recorders:
+        stats = recorder.stats()
+        if stats is not None:
+            profiles.append((recorder.process_name, stats))
+        events.extend(recorder.events)
+        names[recorder.pid] = recorder.process_name
+    if work_dir is not None:
+        for path in sorted(glob.glob(os.path.join(work_dir, 'isci-*.prof'))):
+            try:
+                stats = pstats.Stats(path)
+            except Exception:
+                continue
+            pid = int(os.path.basename(path)[len('isci-'):-len('.prof')])
+            names[pid] = f"İşçi {pid}"
+            profiles.append((names[pid], stats))
+        for path in sorted(glob.glob(os.path.join(work_dir, 'isci-*.events.jsonl'))):
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # Süreç yazarken sonlandırıldıysa son satır yarım kalabilir
+                        continue
+                    events.append(event)
+                    names.setdefault(event['pid'], f"İşçi {event['pid']}")
+
+    folder = os.path.dirname(os.path.abspath(prefix))
+    os.makedirs(folder, exist_ok=True)
+    written = []
+    stacks = Counter()
+    for name, stats in profiles:
+        stacks.update(collapsed_stacks(stats, name))
+    with open(prefix + '.folded', 'w', encoding='utf-8') as f:
+        for stack, micros in sorted(stacks.items()):
+            f.write(f"{stack} {micros}\n")
+    written.append(prefix + '.folded')
+
+    origin = min((event['ts'] for event in events), default=0)
+    trace_events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': name}}
+                    for pid, name in names.items()]
+    for event in sorted(events, key=lambda event: event['ts']):
+        trace_events.append(dict(event, ts=event['ts'] - origin))
+    with open(prefix + '.trace.json', 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
+    written.append(prefix + '.trace.json')
+
+    if profiles:
+        merged = profiles[0][1]
+        for _, stats in profiles[1:]:
+            merged.add(stats)
+        merged.dump_stats(prefix + '.prof')
+        written.append(prefix + '.prof')
+    return written
+
+
+class SearchTrace:
+    """
+    Bir aramanın izi.
+
+    Ana süreçteki arama iş parçacığı `main` kaydına, işçi süreçler
+    `work_dir` klasörüne yazar; `write()` hepsini birleştirir.
+    """
+
+    def __init__(self, prefix: str, process_name: str = 'SearchThread'):
+        """
+        Args:
+            prefix: Çıktı dosyalarının ortak yolu (uzantısız, bkz. write_trace)
+            process_name: Ana süreç kaydının adı
+        """
+        self.prefix = prefix
+        self.main = TraceRecorder(process_name)
+        self.work_dir = tempfile.mkdtemp(prefix='arama_izi_')
+
+    def write(self) -> List[str]:
+        """İz dosyalarını yazar ve işçilerin geçici klasörünü siler"""
+        try:
+            return write_trace(self.prefix, [self.main], self.work_dir)
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """İşçilerin geçici klasörünü siler"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
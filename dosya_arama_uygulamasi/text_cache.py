@@ -0,0 +1,109 @@
+import os
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from extractors import archive_outer_path, read_file_text
+
+
+class ExtractedText:
+    """
+    Çıkarılmış metin ve satır başlangıç konumları tablosu.
+
+    Satır tablosu bir kez hesaplanır; bir eşleşme konumunun satır numarası
+    ikili aramayla O(log n) sürede bulunur.
+    """
+
+    __slots__ = ('text', 'line_starts')
+
+    def __init__(self, text: str):
+        self.text = text
+        starts = array('L', [0])
+        pos = text.find('\n')
+        while pos != -1:
+            starts.append(pos + 1)
+            pos = text.find('\n', pos + 1)
+        self.line_starts = starts
+
+    @property
+    def line_count(self) -> int:
+        return len(self.line_starts)
+
+    def line_of(self, offset: int) -> int:
+        """Metindeki konumun 1'den başlayan satır numarası"""
+        return bisect_right(self.line_starts, offset)
+
+    def line_span(self, line_num: int) -> Tuple[int, int]:
+        """Satırın metindeki [başlangıç, bitiş) aralığı (satır sonu hariç)"""
+        start = self.line_starts[line_num - 1]
+        if line_num < len(self.line_starts):
+            end = self.line_starts[line_num] - 1
+        else:
+            end = len(self.text)
+        return start, end
+
+    def line_text(self, line_num: int) -> str:
+        """Satırın metni"""
+        start, end = self.line_span(line_num)
+        return self.text[start:end]
+
+
+class TextCache:
+    """
+    Önizleme için çıkarılmış metinlerin bellekteki LRU önbelleği.
+
+    Kayıtlar dosyanın (arşiv üyelerinde arşivin) mtime ve boyutuyla
+    doğrulanır; dosya değişmişse metin yeniden çıkarılır.
+    """
+
+    def __init__(self, max_chars: int = 50_000_000):
+        self.max_chars = max_chars
+        self._entries: 'OrderedDict[str, Tuple[Tuple[int, int], ExtractedText]]' = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def get(self, file_path: str) -> Optional[ExtractedText]:
+        """
+        Dosyanın önizleme metnini döndürür; gerekirse çıkarıp önbelleğe alır.
+
+        Returns:
+            ExtractedText; dosya okunamazsa None
+        """
+        try:
+            st = os.stat(archive_outer_path(file_path))
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._entries.get(file_path)
+            if cached is not None and cached[0] == stamp:
+                self._entries.move_to_end(file_path)
+                return cached[1]
+        try:
+            text = read_file_text(file_path, preview=True)
+        except Exception:
+            return None
+        if text is None:
+            return None
+        extracted = ExtractedText(text)
+        self.put(file_path, stamp, extracted)
+        return extracted
+
+    def put(self, file_path: str, stamp: Tuple[int, int], extracted: ExtractedText) -> None:
+        """Kaydı ekler, sınır aşılırsa en eski kayıtları çıkarır"""
+        with self._lock:
+            old = self._entries.pop(file_path, None)
+            if old is not None:
+                self._chars -= len(old[1].text)
+            self._entries[file_path] = (stamp, extracted)
+            self._chars += len(extracted.text)
+            while self._chars > self.max_chars and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._chars -= len(evicted.text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0